@@ -1,4 +1,4 @@
-import asyncio, random, string
+import asyncio, random, string, time
 import nest_asyncio
 
 nest_asyncio.apply()
@@ -40,6 +40,7 @@ class AgentContext:
     _contexts: dict[str, "AgentContext"] = {}
     _counter: int = 0
     _notification_manager = None
+    _loader: Callable[[str | None], "AgentContext | None"] | None = None  # hydrates saved chats, any one for None
 
     def __init__(
         self,
@@ -69,6 +70,7 @@ class AgentContext:
         self.no = AgentContext._counter
         # set to start of unix epoch
         self.last_message = last_message or datetime.now(timezone.utc)
+        self.last_access = time.time()
 
         existing = self._contexts.get(self.id, None)
         if existing:
@@ -77,12 +79,17 @@ class AgentContext:
 
     @staticmethod
     def get(id: str):
-        return AgentContext._contexts.get(id, None)
+        context = AgentContext._contexts.get(id, None)
+        if context is None and AgentContext._loader:
+            context = AgentContext._loader(id)
+        if context:
+            context.last_access = time.time()
+        return context
 
     @staticmethod
     def first():
         if not AgentContext._contexts:
-            return None
+            return AgentContext._loader(None) if AgentContext._loader else None
         return list(AgentContext._contexts.values())[0]
 
     @staticmethod
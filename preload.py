@@ -1,7 +1,7 @@
 import asyncio
 from python.helpers import runtime, whisper, settings
 from python.helpers.print_style import PrintStyle
-from python.helpers import kokoro_tts
+from python.helpers import kokoro_tts, embedding_cache
 import models
 
 
@@ -25,6 +25,11 @@ async def preload():
                         "huggingface", set["embed_model_name"]
                     )
                     emb_txt = await emb_mod.aembed_query("test")
+                    # the warm-up call also registers dimensions for index construction
+                    embedding_cache.set_dimensions(
+                        embedding_cache.get_model_id("huggingface", set["embed_model_name"]),
+                        len(emb_txt),
+                    )
                     return emb_txt
                 except Exception as e:
                     PrintStyle().error(f"Error in preload_embedding: {e}")
@@ -1,5 +1,6 @@
 import base64
 import os
+import re
 from datetime import datetime, timedelta
 from agent import AgentContext, UserMessage, AgentContextType
 from python.helpers.api import ApiHandler, Request, Response
@@ -9,6 +10,17 @@ from werkzeug.utils import secure_filename
 from initialize import initialize_agent
 import threading
 
+BASE64_BLOCK = 4 * 1024 * 1024  # characters decoded at a time, a multiple of 4
+
+
+def write_base64_file(content: str, path: str):
+    """Decode base64 in aligned slices, the decoded file is never in memory whole"""
+    if re.search(r"\s", content):
+        content = re.sub(r"\s", "", content)  # line wrapped input would break the alignment
+    with open(path, "wb") as f:
+        for i in range(0, len(content), BASE64_BLOCK):
+            f.write(base64.b64decode(content[i : i + BASE64_BLOCK]))
+
 
 class ApiMessage(ApiHandler):
     # Track chat lifetimes for cleanup
@@ -53,13 +65,9 @@ class ApiMessage(ApiHandler):
                     if not filename:
                         continue
 
-                    # Decode base64 content
-                    file_content = base64.b64decode(attachment["base64"])
-
-                    # Save to temp file
+                    # Decode base64 content straight into the temp file
                     save_path = os.path.join(upload_folder_ext, filename)
-                    with open(save_path, "wb") as f:
-                        f.write(file_content)
+                    write_base64_file(attachment["base64"], save_path)
 
                     attachment_paths.append(os.path.join(upload_folder_int, filename))
                 except Exception as e:
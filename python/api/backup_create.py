@@ -1,4 +1,4 @@
-from python.helpers.api import ApiHandler, Request, Response, send_file
+from python.helpers.api import ApiHandler, Request, Response
 from python.helpers.backup import BackupService
 from python.helpers.persist_chat import save_tmp_chats
 
@@ -34,21 +34,23 @@ class BackupCreate(ApiHandler):
             # Save all chats to the chats folder
             save_tmp_chats()
 
-            # Create backup service and generate backup
+            # Create backup service and stream the archive while it is built
             backup_service = BackupService()
-            zip_path = await backup_service.create_backup(
+            stream = await backup_service.create_backup_stream(
                 include_patterns=include_patterns,
                 exclude_patterns=exclude_patterns,
                 include_hidden=include_hidden,
                 backup_name=backup_name
             )
 
-            # Return file for download
-            return send_file(
-                zip_path,
-                as_attachment=True,
-                download_name=f"{backup_name}.zip",
-                mimetype='application/zip'
+            return Response(
+                stream,
+                mimetype='application/zip',
+                headers={
+                    "Content-Disposition": f'attachment; filename="{backup_name}.zip"',
+                    "Cache-Control": "no-cache",
+                    "X-Accel-Buffering": "no",
+                },
             )
 
         except Exception as e:
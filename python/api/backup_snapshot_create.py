@@ -0,0 +1,38 @@
+from python.helpers.api import ApiHandler, Request, Response
+from python.helpers.backup import BackupService
+from python.helpers.persist_chat import save_tmp_chats
+
+
+class BackupSnapshotCreate(ApiHandler):
+    @classmethod
+    def requires_auth(cls) -> bool:
+        return True
+
+    @classmethod
+    def requires_loopback(cls) -> bool:
+        return False
+
+    async def process(self, input: dict, request: Request) -> dict | Response:
+        try:
+            # Save all chats to the chats folder
+            save_tmp_chats()
+
+            backup_service = BackupService()
+            snapshot = await backup_service.create_snapshot(
+                include_patterns=input.get("include_patterns", []),
+                exclude_patterns=input.get("exclude_patterns", []),
+                include_hidden=input.get("include_hidden", False),
+                backup_name=input.get("backup_name", "agent-zero-snapshot"),
+                keep=int(input.get("keep", 0))
+            )
+
+            return {
+                "success": True,
+                "snapshot": snapshot
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
@@ -0,0 +1,40 @@
+from python.helpers.api import ApiHandler, Request, Response
+from python.helpers.backup import BackupService
+
+
+class BackupSnapshotRestore(ApiHandler):
+    @classmethod
+    def requires_auth(cls) -> bool:
+        return True
+
+    @classmethod
+    def requires_loopback(cls) -> bool:
+        return False
+
+    async def process(self, input: dict, request: Request) -> dict | Response:
+        snapshot_id = input.get("snapshot_id", "")
+        if not snapshot_id:
+            return {"success": False, "error": "No snapshot provided"}
+
+        try:
+            backup_service = BackupService()
+            result = await backup_service.restore_snapshot(
+                snapshot_id=snapshot_id,
+                restore_include_patterns=input.get("include_patterns", []),
+                restore_exclude_patterns=input.get("exclude_patterns", []),
+                overwrite_policy=input.get("overwrite_policy", "overwrite")
+            )
+
+            return {
+                "success": True,
+                "restored_files": result["restored_files"],
+                "skipped_files": result["skipped_files"],
+                "errors": result["errors"],
+                "backup_metadata": result["backup_metadata"]
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
@@ -0,0 +1,74 @@
+from python.helpers.api import ApiHandler, Request, Response
+from python.helpers.task_scheduler import (
+    TaskScheduler, ScheduledTask, TaskSchedule, TaskState, serialize_task, parse_task_schedule
+)
+
+TASK_NAME = "Backup snapshots"
+JOB = "backup_snapshot"
+
+
+class BackupSnapshotSchedule(ApiHandler):
+    """Create, update or disable the scheduler task that takes incremental backup snapshots"""
+
+    @classmethod
+    def requires_auth(cls) -> bool:
+        return True
+
+    @classmethod
+    def requires_loopback(cls) -> bool:
+        return False
+
+    async def process(self, input: dict, request: Request) -> dict | Response:
+        try:
+            scheduler = TaskScheduler.get()
+            await scheduler.reload()
+            existing = next(
+                (task for task in scheduler.get_tasks() if task.job == JOB), None
+            )
+
+            schedule = input.get("schedule", "0 3 * * *")
+            if isinstance(schedule, str):
+                parts = schedule.split()
+                if len(parts) != 5:
+                    raise ValueError("Invalid schedule, expected a crontab expression")
+                task_schedule = TaskSchedule(
+                    minute=parts[0], hour=parts[1], day=parts[2], month=parts[3], weekday=parts[4]
+                )
+            else:
+                task_schedule = parse_task_schedule(schedule)
+
+            # patterns are optional, the defaults are resolved when the job runs
+            job_args = {
+                key: input[key]
+                for key in ("include_patterns", "exclude_patterns", "include_hidden", "backup_name", "keep")
+                if key in input
+            }
+            state = TaskState.IDLE if input.get("enabled", True) else TaskState.DISABLED
+
+            if existing:
+                task = await scheduler.update_task(
+                    existing.uuid, schedule=task_schedule, job_args=job_args, state=state
+                )
+            else:
+                task = ScheduledTask.create(
+                    name=TASK_NAME,
+                    system_prompt="",
+                    prompt="Create an incremental backup snapshot.",
+                    schedule=task_schedule,
+                )
+                task.job = JOB
+                task.job_args = job_args
+                task.state = state
+                await scheduler.add_task(task)
+            await scheduler.save()
+
+            return {
+                "success": True,
+                "task": serialize_task(task) if task else None
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
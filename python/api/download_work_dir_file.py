@@ -2,14 +2,55 @@ import base64
 from io import BytesIO
 import mimetypes
 import os
+import re
 
 from flask import Response
 from python.helpers.api import ApiHandler, Input, Output, Request
 from python.helpers import files, runtime
 from python.api import file_info
 
+RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+REMOTE_CHUNK_SIZE = 1024 * 1024  # bytes per RFC call when the file lives in the container
 
-def stream_file_download(file_source, download_name, chunk_size=8192):
+
+def parse_range(range_header: str, file_size: int) -> tuple[int, int] | None:
+    """
+    Inclusive (start, end) of a single "bytes=" range, None for a full response.
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE.fullmatch((range_header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None  # absent, malformed or multiple ranges, serve the whole file
+    first, last = match.groups()
+    if first == "":
+        # suffix range, the last n bytes
+        start, end = max(0, file_size - int(last)), file_size - 1
+    else:
+        start = int(first)
+        end = min(int(last), file_size - 1) if last else file_size - 1
+    if start >= file_size or start > end:
+        raise ValueError(f"Range not satisfiable: {range_header}")
+    return start, end
+
+
+def stream_remote_file(path: str, start: int, length: int):
+    """Bytes of a file in the development container, read in bounded chunks over RFC"""
+    offset, remaining = start, length
+    while remaining > 0:
+        b64 = runtime.call_development_function_sync(
+            read_chunk, path, offset, min(REMOTE_CHUNK_SIZE, remaining)
+        )
+        chunk = base64.b64decode(b64)
+        if not chunk:
+            break
+        offset += len(chunk)
+        remaining -= len(chunk)
+        yield chunk
+
+
+def stream_file_download(
+    file_source, download_name, chunk_size=8192, range_header="", remote=False, file_size=None
+):
     """
     Create a streaming response for file downloads that shows progress in browser.
 
@@ -17,12 +58,18 @@ def stream_file_download(file_source, download_name, chunk_size=8192):
         file_source: Either a file path (str) or BytesIO object
         download_name: Name for the downloaded file
         chunk_size: Size of chunks to stream (default 8192 bytes)
+        range_header: Value of the request Range header, answered with 206 Partial Content
+        remote: file_source is a path in the development container, read it chunk by chunk over RFC
+        file_size: Size of a remote file
 
     Returns:
         Flask Response object with streaming content
     """
     # Calculate file size for Content-Length header
-    if isinstance(file_source, str):
+    if remote:
+        if file_size is None:
+            raise ValueError("Remote downloads need the file size")
+    elif isinstance(file_source, str):
         # File path - get size from filesystem
         file_size = os.path.getsize(file_source)
     elif isinstance(file_source, BytesIO):
@@ -34,41 +81,58 @@ def stream_file_download(file_source, download_name, chunk_size=8192):
     else:
         raise ValueError(f"Unsupported file source type: {type(file_source)}")
 
+    try:
+        byte_range = parse_range(range_header, file_size)
+    except ValueError:
+        return Response(status=416, headers={"Content-Range": f"bytes */{file_size}"})
+    start, end = byte_range or (0, file_size - 1)
+    length = end - start + 1 if file_size else 0
+
     def generate():
+        remaining = length
+        if remote:
+            yield from stream_remote_file(file_source, start, length)
+            return
         if isinstance(file_source, str):
             # File path - open and stream from disk
-            with open(file_source, 'rb') as f:
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    yield chunk
-        elif isinstance(file_source, BytesIO):
+            f = open(file_source, 'rb')
+        else:
             # BytesIO object - stream from memory
-            file_source.seek(0)  # Ensure we're at the beginning
-            while True:
-                chunk = file_source.read(chunk_size)
+            f = file_source
+        try:
+            f.seek(start)
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
                 if not chunk:
                     break
+                remaining -= len(chunk)
                 yield chunk
+        finally:
+            if isinstance(file_source, str):
+                f.close()
 
     # Detect content type based on file extension
     content_type, _ = mimetypes.guess_type(download_name)
     if not content_type:
         content_type = 'application/octet-stream'
 
+    headers = {
+        'Content-Disposition': f'attachment; filename="{download_name}"',
+        'Content-Length': str(length),  # Critical for browser progress bars
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # Disable nginx buffering
+        'Accept-Ranges': 'bytes'  # Allow browser to resume downloads
+    }
+    if byte_range:
+        headers['Content-Range'] = f'bytes {start}-{end}/{file_size}'
+
     # Create streaming response with proper headers for immediate streaming
     response = Response(
         generate(),
+        status=206 if byte_range else 200,
         content_type=content_type,
         direct_passthrough=True,  # Prevent Flask from buffering the response
-        headers={
-            'Content-Disposition': f'attachment; filename="{download_name}"',
-            'Content-Length': str(file_size),  # Critical for browser progress bars
-            'Cache-Control': 'no-cache',
-            'X-Accel-Buffering': 'no',  # Disable nginx buffering
-            'Accept-Ranges': 'bytes'  # Allow browser to resume downloads
-        }
+        headers=headers,
     )
 
     return response
@@ -86,6 +150,7 @@ class DownloadFile(ApiHandler):
             raise ValueError("No file path provided")
         if not file_path.startswith("/"):
             file_path = f"/{file_path}"
+        range_header = request.headers.get("Range", "")
 
         file = await runtime.call_development_function(
             file_info.get_file_info, file_path
@@ -97,34 +162,42 @@ class DownloadFile(ApiHandler):
         if file["is_dir"]:
             zip_file = await runtime.call_development_function(files.zip_dir, file["abs_path"])
             if runtime.is_development():
-                b64 = await runtime.call_development_function(fetch_file, zip_file)
-                file_data = BytesIO(base64.b64decode(b64))
                 return stream_file_download(
-                    file_data,
-                    download_name=os.path.basename(zip_file)
+                    zip_file,
+                    download_name=os.path.basename(zip_file),
+                    range_header=range_header,
+                    remote=True,
+                    file_size=await runtime.call_development_function(get_file_size, zip_file),
                 )
             else:
                 return stream_file_download(
                     zip_file,
-                    download_name=f"{os.path.basename(file_path)}.zip"
+                    download_name=f"{os.path.basename(file_path)}.zip",
+                    range_header=range_header,
                 )
         elif file["is_file"]:
             if runtime.is_development():
-                b64 = await runtime.call_development_function(fetch_file, file["abs_path"])
-                file_data = BytesIO(base64.b64decode(b64))
                 return stream_file_download(
-                    file_data,
-                    download_name=os.path.basename(file_path)
+                    file["abs_path"],
+                    download_name=os.path.basename(file_path),
+                    range_header=range_header,
+                    remote=True,
+                    file_size=file["size"],
                 )
             else:
                 return stream_file_download(
                     file["abs_path"],
-                    download_name=os.path.basename(file["file_name"])
+                    download_name=os.path.basename(file["file_name"]),
+                    range_header=range_header,
                 )
         raise Exception(f"File {file_path} not found")
 
 
-async def fetch_file(path):
+async def get_file_size(path):
+    return os.path.getsize(path)
+
+
+async def read_chunk(path, offset, length):
     with open(path, "rb") as file:
-        file_content = file.read()
-        return base64.b64encode(file_content).decode("utf-8")
+        file.seek(offset)
+        return base64.b64encode(file.read(length)).decode("utf-8")
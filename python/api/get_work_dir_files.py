@@ -1,3 +1,5 @@
+import asyncio
+
 from python.helpers.api import ApiHandler, Request, Response
 from python.helpers.file_browser import FileBrowser
 from python.helpers import runtime
@@ -8,6 +10,10 @@ class GetWorkDirFiles(ApiHandler):
     def get_methods(cls):
         return ["GET"]
 
+    @classmethod
+    def runs_on_event_loop(cls) -> bool:
+        return True
+
     async def process(self, input: dict, request: Request) -> dict | Response:
         current_path = request.args.get("path", "")
         if current_path == "$WORK_DIR":
@@ -19,11 +25,20 @@ class GetWorkDirFiles(ApiHandler):
 
         # browser = FileBrowser()
         # result = browser.get_files(current_path)
-        result = await runtime.call_development_function(get_files, current_path)
+        result = await runtime.call_development_function(
+            get_files,
+            current_path,
+            cursor=request.args.get("cursor", ""),
+            limit=int(request.args.get("limit", 0)),
+            sort_by=request.args.get("sort_by", "name"),
+            sort_dir=request.args.get("sort_dir", "asc"),
+            filter=request.args.get("filter", ""),
+        )
 
         return {"data": result}
 
 
-async def get_files(path):
+async def get_files(path, cursor="", limit=0, sort_by="name", sort_dir="asc", filter=""):
     browser = FileBrowser()
-    return browser.get_files(path)
+    # scandir of large directories
+    return await asyncio.to_thread(browser.get_files, path, cursor, limit, sort_by, sort_dir, filter)
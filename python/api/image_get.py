@@ -1,8 +1,7 @@
-import base64
 import os
 from python.helpers.api import ApiHandler, Request, Response, send_file
 from python.helpers import files, runtime
-import io
+from python.api.download_work_dir_file import stream_remote_file
 from mimetypes import guess_type
 
 
@@ -49,18 +48,18 @@ class ImageGet(ApiHandler):
                 if files.exists(path):
                     response = send_file(path)
                 elif await runtime.call_development_function(files.exists, path):
-                    b64_content = await runtime.call_development_function(
-                        files.read_file_base64, path
+                    abs_path, size = await runtime.call_development_function(
+                        get_file_stat, path
                     )
-                    file_content = base64.b64decode(b64_content)
                     mime_type, _ = guess_type(filename)
                     if not mime_type:
                         mime_type = "application/octet-stream"
-                    response = send_file(
-                        io.BytesIO(file_content),
+                    # streamed in chunks from the container, not one base64 blob
+                    response = Response(
+                        stream_remote_file(abs_path, 0, size),
                         mimetype=mime_type,
-                        as_attachment=False,
-                        download_name=filename,
+                        direct_passthrough=True,
+                        headers={"Content-Length": str(size)},
                     )
                 else:
                     response = _send_fallback_icon("image")
@@ -154,3 +153,8 @@ def _send_fallback_icon(icon_name):
         raise ValueError(f"Fallback icon not found: {icon_path}")
 
     return send_file(icon_path, mimetype="image/svg+xml")
+
+
+async def get_file_stat(path):
+    abs_path = files.get_abs_path(path)
+    return abs_path, os.path.getsize(abs_path)
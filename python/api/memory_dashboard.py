@@ -175,17 +175,15 @@ class MemoryDashboard(ApiHandler):
                     query=search_query,
                     limit=limit,
                     threshold=threshold,
-                    filter=f"area == '{area_filter}'" if area_filter else "",
+                    filter=f"area == {area_filter!r}" if area_filter else "",
                 )
                 memories = docs
             else:
                 # If no search query, get all memories from specified area(s)
-                all_docs = memory.db.get_all_docs()
-                for doc_id, doc in all_docs.items():
-                    # Apply area filter if specified
-                    if area_filter and doc.metadata.get("area", "") != area_filter:
-                        continue
-                    memories.append(doc)
+                if area_filter:
+                    memories = memory.db.select_by_filter(f"area == {area_filter!r}")
+                else:
+                    memories = list(memory.db.get_all_docs().values())
 
                 # sort by timestamp
                 def get_sort_key(m):
@@ -1,3 +1,5 @@
+import asyncio
+
 from agent import AgentContext, UserMessage
 from python.helpers.api import ApiHandler, Request, Response
 from flask import session
@@ -11,6 +13,10 @@ from python.helpers.print_style import PrintStyle
 
 
 class Message(ApiHandler):
+    @classmethod
+    def runs_on_event_loop(cls) -> bool:
+        return True
+
     async def process(self, input: dict, request: Request) -> dict | Response:
         task, context = await self.communicate(input=input, request=request)
         return await self.respond(task, context)
@@ -25,10 +31,12 @@ class Message(ApiHandler):
     async def communicate(self, input: dict, request: Request):
         # Handle both JSON and multipart/form-data
         if request.content_type.startswith("multipart/form-data"):
-            text = request.form.get("text", "")
-            ctxid = request.form.get("context", "")
-            message_id = request.form.get("message_id", None)
-            attachments = request.files.getlist("attachments")
+            # parsing writes large attachments to temp files
+            form, uploads = await asyncio.to_thread(lambda: (request.form, request.files))
+            text = form.get("text", "")
+            ctxid = form.get("context", "")
+            message_id = form.get("message_id", None)
+            attachments = uploads.getlist("attachments")
             attachment_paths = []
 
             upload_folder_int = "/a0/tmp/uploads"
@@ -41,7 +49,7 @@ class Message(ApiHandler):
                         continue
                     filename = secure_filename(attachment.filename)
                     save_path = files.get_abs_path(upload_folder_ext, filename)
-                    attachment.save(save_path)
+                    await asyncio.to_thread(attachment.save, save_path)
                     attachment_paths.append(os.path.join(upload_folder_int, filename))
         else:
             # Handle JSON request as before
@@ -54,8 +62,8 @@ class Message(ApiHandler):
         # Now process the message
         message = text
 
-        # Obtain agent context
-        context = self.get_context(ctxid)
+        # Obtain agent context, loading a saved chat or creating one reads from disk
+        context = await asyncio.to_thread(self.get_context, ctxid)
         # Set owner on newly created contexts (no ctxid provided)
         if not ctxid:
             try:
@@ -1,3 +1,5 @@
+import asyncio
+
 from python.helpers.api import ApiHandler, Request, Response
 
 from agent import AgentContext, AgentContextType
@@ -6,11 +8,15 @@ from python.helpers.task_scheduler import TaskScheduler
 from python.helpers.localization import Localization
 from python.helpers.dotenv import get_dotenv_value
 from flask import session
-from python.helpers import user_management
+from python.helpers import user_management, persist_chat
 
 
 class Poll(ApiHandler):
 
+    @classmethod
+    def runs_on_event_loop(cls) -> bool:
+        return True
+
     async def process(self, input: dict, request: Request) -> dict | Response:
         ctxid = input.get("context", "")
         from_no = input.get("log_from", 0)
@@ -18,12 +24,27 @@ class Poll(ApiHandler):
 
         # Get timezone from input (default to dotenv default or UTC if not provided)
         timezone = input.get("timezone", get_dotenv_value("DEFAULT_USER_TIMEZONE", "UTC"))
-        Localization.get().set_timezone(timezone)
 
         # auth context
         username = session.get('username')
         role = session.get('role')
 
+        # chat loading, the chat index and scheduler locks block, keep them off the event loop
+        return await asyncio.to_thread(
+            self.poll, ctxid, from_no, notifications_from, timezone, username, role
+        )
+
+    def poll(
+        self,
+        ctxid: str,
+        from_no: int,
+        notifications_from: int,
+        timezone: str,
+        username: str | None,
+        role: str | None,
+    ) -> dict:
+        Localization.get().set_timezone(timezone)
+
         def can_access_ctx(ctx: AgentContext) -> bool:
             if role == user_management.ROLE_ADMIN:
                 return True
@@ -49,7 +70,8 @@ class Poll(ApiHandler):
         tasks = []
         processed_contexts = set()  # Track processed context IDs
 
-        all_ctxs = list(AgentContext._contexts.values())
+        # saved chats not accessed yet are listed from the chat index without loading them
+        all_ctxs = list(AgentContext._contexts.values()) + persist_chat.unloaded_chats()
         # First, identify all tasks
         for ctx in all_ctxs:
             # Skip if already processed
@@ -121,11 +143,8 @@ class Poll(ApiHandler):
             # pick first accessible context if available
             if ctxs:
                 first_id = ctxs[0]["id"]
-                # get existing instance
-                for c in all_ctxs:
-                    if c.id == first_id:
-                        selected_context = c
-                        break
+                # get existing instance, loads it if only listed
+                selected_context = AgentContext.get(first_id)
             else:
                 selected_context = None
 
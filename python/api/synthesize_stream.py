@@ -0,0 +1,47 @@
+# api/synthesize_stream.py
+
+import json
+import time
+
+from python.helpers.api import ApiHandler, Request, Response
+
+from python.helpers import kokoro_tts
+
+
+class SynthesizeStream(ApiHandler):
+    """
+    Streams Kokoro TTS audio as newline delimited JSON, one WAV per sentence,
+    so playback can start as soon as the first sentence is synthesized.
+    """
+
+    async def process(self, input: dict, request: Request) -> dict | Response:
+        text = input.get("text", "")
+        sentences = kokoro_tts.split_sentences(text)
+
+        try:
+            await kokoro_tts.preload()
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+        def generate():
+            start = time.perf_counter()
+            try:
+                for index, audio in kokoro_tts.stream_sentences(sentences):
+                    yield json.dumps(
+                        {
+                            "index": index,
+                            "total": len(sentences),
+                            "audio": audio,
+                            # time to this part, the first one is time-to-first-audio
+                            "elapsed_ms": round((time.perf_counter() - start) * 1000),
+                        }
+                    ) + "\n"
+                yield json.dumps({"done": True, "success": True}) + "\n"
+            except Exception as e:
+                yield json.dumps({"error": str(e), "success": False}) + "\n"
+
+        return Response(
+            generate(),
+            mimetype="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
@@ -0,0 +1,35 @@
+# api/transcribe_stream.py
+
+import json
+
+from python.helpers.api import ApiHandler, Request, Response
+
+from python.helpers import settings, whisper
+
+
+class TranscribeStream(ApiHandler):
+    """
+    Streams Whisper transcription as newline delimited JSON, one partial text
+    per 30 second window of long recordings, followed by the full result.
+    """
+
+    async def process(self, input: dict, request: Request) -> dict | Response:
+        audio = input.get("audio", "")
+
+        try:
+            await whisper.preload(settings.get_settings()["stt_model_size"])
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+        def generate():
+            try:
+                for part in whisper.stream_transcription(audio):
+                    yield json.dumps(part) + "\n"
+            except Exception as e:
+                yield json.dumps({"error": str(e), "success": False}) + "\n"
+
+        return Response(
+            generate(),
+            mimetype="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
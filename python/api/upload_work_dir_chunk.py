@@ -0,0 +1,98 @@
+import asyncio
+import base64
+import io
+import json
+import re
+
+from python.helpers.api import ApiHandler, Request, Response
+from python.helpers.file_browser import FileBrowser
+from python.helpers import runtime
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class UploadWorkDirChunk(ApiHandler):
+    """
+    Resumable upload of one file in chunks.
+    GET ?path=&filename=&size=&upload_id= returns the bytes already received.
+    POST ?path=&filename=&upload_id= with the raw chunk as body and headers
+    Content-Range: bytes <start>-<end>/<total>, optional X-Chunk-Sha256 and,
+    on the last chunk, optional X-File-Sha256. upload_id is any client key stable across
+    retries of the same file, a part file left by another upload is not resumed.
+    """
+
+    @classmethod
+    def get_methods(cls):
+        return ["GET", "POST"]
+
+    @classmethod
+    def runs_on_event_loop(cls) -> bool:
+        return True
+
+    async def process(self, input: dict, request: Request) -> dict | Response:
+        current_path = request.args.get("path", "")
+        if current_path == "$WORK_DIR":
+            current_path = "root"
+        filename = request.args.get("filename", "")
+        if not filename:
+            raise ValueError("No filename provided")
+        upload_id = request.args.get("upload_id", "")
+
+        if request.method == "GET":
+            total = int(request.args.get("size", 0))
+            return await runtime.call_development_function(
+                upload_status, current_path, filename, total, upload_id
+            )
+
+        match = CONTENT_RANGE.fullmatch(request.headers.get("Content-Range", ""))
+        if not match:
+            raise ValueError("Missing or invalid Content-Range header")
+        start, end, total = (int(g) for g in match.groups())
+        if end < start or end >= total or end - start + 1 > MAX_CHUNK_SIZE:
+            raise ValueError("Invalid chunk range")
+        if request.content_length != end - start + 1:
+            raise ValueError("Content-Length does not match Content-Range")
+        chunk_sha256 = request.headers.get("X-Chunk-Sha256", "")
+        file_sha256 = request.headers.get("X-File-Sha256", "")
+
+        if runtime.is_development():
+            # one bounded chunk per RFC call instead of the whole file as base64
+            data = await asyncio.to_thread(request.stream.read, end - start + 1)
+            result = await runtime.call_development_function(
+                upload_chunk, current_path, filename, start, total,
+                base64.b64encode(data).decode("utf-8"), chunk_sha256, file_sha256, upload_id,
+            )
+        else:
+            # body goes from the socket to the part file without being buffered
+            result = await asyncio.to_thread(
+                FileBrowser().save_file_chunk,
+                current_path, filename, start, total, request.stream,
+                chunk_sha256, file_sha256, upload_id,
+            )
+
+        if "error" in result:
+            # out of order chunk or another upload's part file, the client resumes from "received"
+            return Response(json.dumps(result), status=409, mimetype="application/json")
+        return result
+
+
+async def upload_status(current_path: str, filename: str, total: int, upload_id: str = ""):
+    return await asyncio.to_thread(FileBrowser().get_upload_status, current_path, filename, total, upload_id)
+
+
+async def upload_chunk(
+    current_path: str,
+    filename: str,
+    start: int,
+    total: int,
+    base64_content: str,
+    chunk_sha256: str = "",
+    file_sha256: str = "",
+    upload_id: str = "",
+):
+    return await asyncio.to_thread(
+        FileBrowser().save_file_chunk,
+        current_path, filename, start, total,
+        io.BytesIO(base64.b64decode(base64_content)), chunk_sha256, file_sha256, upload_id,
+    )
@@ -1,9 +1,11 @@
 import base64
+import hashlib
 from werkzeug.datastructures import FileStorage
 from python.helpers.api import ApiHandler, Request, Response
-from python.helpers.file_browser import FileBrowser
+from python.helpers.file_browser import FileBrowser, UPLOAD_CHUNK_SIZE
+from python.helpers.print_style import PrintStyle
 from python.helpers import files, runtime
-from python.api import get_work_dir_files
+from python.api import upload_work_dir_chunk
 import os
 
 
@@ -23,16 +25,13 @@ class UploadWorkDirFiles(ApiHandler):
         if not successful and failed:
             raise Exception("All uploads failed")
 
-        # result = browser.get_files(current_path)
-        result = await runtime.call_development_function(get_work_dir_files.get_files, current_path)
-
+        # the client reloads its listing page with its own sort and filter
         return {
             "message": (
                 "Files uploaded successfully"
                 if not failed
                 else "Some files failed to upload"
             ),
-            "data": result,
             "successful": successful,
             "failed": failed,
         }
@@ -43,11 +42,7 @@ async def upload_files(uploaded_files: list[FileStorage], current_path: str):
         successful = []
         failed = []
         for file in uploaded_files:
-            file_content = file.stream.read()
-            base64_content = base64.b64encode(file_content).decode("utf-8")
-            if await runtime.call_development_function(
-                upload_file, current_path, file.filename, base64_content
-            ):
+            if await forward_file(file, current_path):
                 successful.append(file.filename)
             else:
                 failed.append(file.filename)
@@ -58,6 +53,35 @@ async def upload_files(uploaded_files: list[FileStorage], current_path: str):
     return successful, failed
 
 
+async def forward_file(file: FileStorage, current_path: str) -> bool:
+    # chunk by chunk into the container, the file is never held in memory whole
+    try:
+        file.stream.seek(0, os.SEEK_END)
+        total = file.stream.tell()
+        file.stream.seek(0)
+        if not total:
+            return await runtime.call_development_function(
+                upload_file, current_path, file.filename, ""
+            )
+        start = 0
+        while start < total:
+            chunk = file.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                raise Exception("Upload ended early")
+            result = await runtime.call_development_function(
+                upload_work_dir_chunk.upload_chunk, current_path, file.filename,
+                start, total, base64.b64encode(chunk).decode("utf-8"),
+                hashlib.sha256(chunk).hexdigest(),
+            )
+            if "error" in result:
+                raise Exception(result["error"])
+            start = result["received"]
+        return True
+    except Exception as e:
+        PrintStyle.error(f"Error uploading file {file.filename}: {e}")
+        return False
+
+
 async def upload_file(current_path: str, filename: str, base64_content: str):
     browser = FileBrowser()
     return browser.save_file_b64(current_path, filename, base64_content)
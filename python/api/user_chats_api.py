@@ -23,30 +23,23 @@ class UserChatsApi(ApiHandler):
             if not user:
                 return {"success": False, "error": "Utilisateur introuvable"}
 
-            # Load chats for this user (also migrates/initializes as needed)
-            ctxids = persist_chat.load_tmp_chats(username)
-
+            # Saved chats of this user from the chat index, without loading them;
+            # contexts in memory may be newer than their last save
             chats = []
-            for ctxid in ctxids:
-                ctx = AgentContext.get(ctxid)
-                if not ctx:
-                    continue
-                # Extract fields safely
-                created_at = ctx.created_at.isoformat() if getattr(ctx, "created_at", None) else None
-                last_message = ctx.last_message.isoformat() if getattr(ctx, "last_message", None) else None
-                ctype = ctx.type.value if getattr(ctx, "type", None) else AgentContextType.USER.value
-                owner = None
-                if hasattr(ctx, "metadata") and isinstance(ctx.metadata, dict):
-                    owner = ctx.metadata.get("owner")
-
+            for entry in persist_chat.list_chats(username):
+                ctx = AgentContext._contexts.get(entry["id"])
+                if ctx:
+                    entry["name"] = ctx.name
+                    entry["last_message"] = ctx.last_message.isoformat() if ctx.last_message else None
                 chats.append(
                     {
-                        "id": ctx.id,
-                        "name": ctx.name,
-                        "type": ctype,
-                        "created_at": created_at,
-                        "last_message": last_message,
-                        "owner": owner,
+                        "id": entry["id"],
+                        "name": entry.get("name"),
+                        "type": entry.get("type") or AgentContextType.USER.value,
+                        "created_at": entry.get("created_at"),
+                        "last_message": entry.get("last_message"),
+                        "owner": entry.get("owner"),
+                        "size": entry.get("size", 0),
                     }
                 )
 
@@ -22,7 +22,7 @@ class UserTestCredentials(ApiHandler):
                     mimetype="text/plain",
                 )
 
-            user = user_management.authenticate_user(username, password)
+            user = await user_management.authenticate_user_async(username, password)
             if user:
                 return {
                     "success": True,
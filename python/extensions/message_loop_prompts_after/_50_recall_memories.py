@@ -1,4 +1,5 @@
 import asyncio
+import re
 from python.helpers.extension import Extension
 from python.helpers.memory import Memory
 from agent import LoopData
@@ -8,6 +9,10 @@ from python.helpers import dirty_json, errors, settings, log
 
 DATA_NAME_TASK = "_recall_memories_task"
 DATA_NAME_ITER = "_recall_memories_iter"
+DATA_NAME_QUERY = "_recall_memories_query"  # last generated query and the words of its source
+
+# reuse the previous query when the conversation tail barely changed (overlap of its words)
+QUERY_REUSE_OVERLAP = 0.9
 
 
 class RecallMemories(Extension):
@@ -47,6 +52,17 @@ class RecallMemories(Extension):
         self.agent.set_data(DATA_NAME_TASK, task)
         self.agent.set_data(DATA_NAME_ITER, loop_data.iteration)
 
+    def reuse_query(self, message: str) -> tuple[str, frozenset[str]]:
+        """Previous query if the query source has nearly the same words as the previous one, and the words."""
+        words = frozenset(re.findall(r"\w+", message.lower()))
+        previous = self.agent.get_data(DATA_NAME_QUERY)
+        if not previous or not words:
+            return "", words
+        overlap = len(words & previous["words"]) / len(words | previous["words"])
+        if overlap >= QUERY_REUSE_OVERLAP:
+            return previous["query"], words
+        return "", words
+
     async def search_memories(self, log_item: log.LogItem, loop_data: LoopData, **kwargs):
 
         # cleanup
@@ -71,35 +87,44 @@ class RecallMemories(Extension):
         user_instruction = (
             loop_data.user_message.output_text() if loop_data.user_message else "None"
         )
-        history = self.agent.history.output_text()[-set["memory_recall_history_len"]:]
+        history = self.agent.history.output_text_tail(set["memory_recall_history_len"])
         message = self.agent.read_prompt(
             "memory.memories_query.msg.md", history=history, message=user_instruction
         )
 
+        # get memory database
+        db = await Memory.get(self.agent)
+
         # if query preparation by AI is enabled
         if set["memory_recall_query_prep"]:
-            try:
-                # call util llm to generate search query from the conversation
-                query = await self.agent.call_utility_model(
-                    system=system,
-                    message=message,
-                    callback=log_callback,
-                )
-                query = query.strip()
-            except Exception as e:
-                err = errors.format_error(e)
-                self.agent.context.log.log(
-                    type="error", heading="Recall memories extension error:", content=err
-                )
-                query = ""
+            # conversation tail close to the previous recall, reuse its query
+            query, words = self.reuse_query(message)
+            if query:
+                log_item.update(query=query, query_reused=True)
+            else:
+                try:
+                    # call util llm to generate search query from the conversation
+                    query = await self.agent.call_utility_model(
+                        system=system,
+                        message=message,
+                        callback=log_callback,
+                    )
+                    query = query.strip()
+                except Exception as e:
+                    err = errors.format_error(e)
+                    self.agent.context.log.log(
+                        type="error", heading="Recall memories extension error:", content=err
+                    )
+                    query = ""
+
+                # no query, no search
+                if not query:
+                    log_item.update(
+                        heading="Failed to generate memory query",
+                    )
+                    return
+                self.agent.set_data(DATA_NAME_QUERY, {"words": words, "query": query})
 
-            # no query, no search
-            if not query:
-                log_item.update(
-                    heading="Failed to generate memory query",
-                )
-                return
-        
         # otherwise use the message and history as query
         else:
             query = user_instruction + "\n\n" + history
@@ -111,24 +136,19 @@ class RecallMemories(Extension):
             )
             return
 
-        # get memory database
-        db = await Memory.get(self.agent)
-
-        # search for general memories and fragments
-        memories = await db.search_similarity_threshold(
-            query=query,
-            limit=set["memory_recall_memories_max_search"],
-            threshold=set["memory_recall_similarity_threshold"],
-            filter=f"area == '{Memory.Area.MAIN.value}' or area == '{Memory.Area.FRAGMENTS.value}'",  # exclude solutions
-        )
-
-        # search for solutions
-        solutions = await db.search_similarity_threshold(
+        # search general memories and fragments, and solutions, in one query with k per area
+        memories_filter = f"area == '{Memory.Area.MAIN.value}' or area == '{Memory.Area.FRAGMENTS.value}'"
+        solutions_filter = f"area == '{Memory.Area.SOLUTIONS.value}'"
+        found = await db.search_similarity_threshold_by_filters(
             query=query,
-            limit=set["memory_recall_solutions_max_search"],
+            limits={
+                memories_filter: set["memory_recall_memories_max_search"],
+                solutions_filter: set["memory_recall_solutions_max_search"],
+            },
             threshold=set["memory_recall_similarity_threshold"],
-            filter=f"area == '{Memory.Area.SOLUTIONS.value}'",  # exclude solutions
         )
+        memories = found[memories_filter]
+        solutions = found[solutions_filter]
 
         if not memories and not solutions:
             log_item.update(
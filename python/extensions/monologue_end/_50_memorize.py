@@ -0,0 +1,169 @@
+import asyncio
+from langchain_core.documents import Document
+from python.helpers import settings, tokens
+from python.helpers.extension import Extension
+from python.helpers.memory import Memory
+from python.helpers.dirty_json import DirtyJson
+from agent import LoopData
+from python.helpers.log import LogItem
+from python.tools.memory_load import DEFAULT_THRESHOLD as DEFAULT_MEMORY_THRESHOLD
+
+HISTORY_TOKENS = 6000  # upper bound of history sent to the utility model
+CONSOLIDATION_CONCURRENCY = 4  # utility model calls in flight during consolidation
+
+
+class Memorize(Extension):
+    """Extracts fragments and solutions from the last monologue and memorizes them in one pass."""
+
+    async def execute(self, loop_data: LoopData = LoopData(), **kwargs):
+        set = settings.get_settings()
+
+        if not set["memory_memorize_enabled"]:
+            return
+
+        # show full util message
+        log_item = self.agent.context.log.log(
+            type="util",
+            heading="Memorizing new information and solutions...",
+        )
+
+        # memorize in background
+        task = asyncio.create_task(self.memorize(loop_data, log_item))
+        return task
+
+    async def memorize(self, loop_data: LoopData, log_item: LogItem, **kwargs):
+        set = settings.get_settings()
+
+        # get system message and the tail of chat history for util llm
+        system = self.agent.read_prompt("memory.memorize.sys.md")
+        msgs_text = self.get_history_text()
+
+        # log query streamed by LLM
+        async def log_callback(content):
+            log_item.stream(content=content)
+
+        # one util llm call for both fragments and solutions
+        response = await self.agent.call_utility_model(
+            system=system,
+            message=msgs_text,
+            callback=log_callback,
+            background=True,
+        )
+
+        if not response or not isinstance(response, str) or not response.strip():
+            log_item.update(heading="No response from utility model.")
+            return
+
+        try:
+            parsed = DirtyJson.parse_string(response.strip())
+        except Exception as e:
+            log_item.update(heading=f"Failed to parse memories response: {str(e)}")
+            return
+
+        items = self.parse_items(parsed)
+        if not items:
+            log_item.update(heading="No useful information to memorize.")
+            return
+
+        memories_txt = "\n\n".join(item["content"] for item in items)
+        log_item.update(
+            heading=f"{len(items)} entries to memorize.", memories=memories_txt
+        )
+
+        if set["memory_memorize_consolidation"]:
+            from python.helpers.memory_consolidation import create_memory_consolidator
+
+            consolidator = create_memory_consolidator(
+                self.agent,
+                similarity_threshold=DEFAULT_MEMORY_THRESHOLD,  # More permissive for discovery
+                max_similar_memories=8,
+                max_llm_context_memories=4,
+            )
+            results = await consolidator.process_new_memories(
+                items, concurrency=CONSOLIDATION_CONCURRENCY, log_item=log_item
+            )
+            total_consolidated = sum(1 for r in results if r.get("success"))
+            log_item.update(
+                heading=f"Memorization completed: {len(items)} memories processed, {total_consolidated} intelligently consolidated",
+                memories=memories_txt,
+                result=f"{len(items)} memories processed, {total_consolidated} intelligently consolidated",
+                memories_processed=len(items),
+                memories_consolidated=total_consolidated,
+                update_progress="none",
+            )
+            return
+
+        db = await Memory.get(self.agent)
+
+        # remove previous memories too similar to the new ones, one search per area
+        rem_ids: list[str] = []
+        if set["memory_memorize_replace_threshold"] > 0:
+            for area in {item["area"] for item in items}:
+                found = await db.search_similarity_threshold_many(
+                    queries=[item["content"] for item in items if item["area"] == area],
+                    limit=100,
+                    threshold=set["memory_memorize_replace_threshold"],
+                    filter=f"area=='{area}'",
+                )
+                rem_ids += [doc.metadata["id"] for docs in found for doc in docs]
+
+        # delete and insert in one write
+        docs = [
+            Document(item["content"], metadata=dict(item["metadata"])) for item in items
+        ]
+        rem = await db.apply_changes(list(dict.fromkeys(rem_ids)), docs)
+        if rem:
+            log_item.update(replaced="\n\n".join(Memory.format_docs_plain(rem)))
+
+        log_item.update(
+            result=f"{len(items)} entries memorized.",
+            heading=f"{len(items)} entries memorized.",
+        )
+        if rem:
+            log_item.stream(result=f"\nReplaced {len(rem)} previous memories.")
+
+    def get_history_text(self) -> str:
+        # the current topic holds the last user message and the monologue that followed,
+        # earlier topics were memorized at the end of their own monologues
+        history = self.agent.history
+        text = history.current.output_text(human_label="user", ai_label="assistant")
+        if not text:
+            text = self.agent.concat_messages(history)
+        ctx_length = min(
+            int(self.agent.config.utility_model.ctx_length * 0.7), HISTORY_TOKENS
+        )
+        return tokens.trim_to_tokens(text, ctx_length, "end")
+
+    def parse_items(self, parsed) -> list[dict]:
+        # accept the {"fragments": [...], "solutions": [...]} object or a bare list of fragments
+        if isinstance(parsed, dict):
+            fragments = parsed.get("fragments") or []
+            solutions = parsed.get("solutions") or []
+        elif isinstance(parsed, list):
+            fragments, solutions = parsed, []
+        elif isinstance(parsed, str):
+            fragments, solutions = [parsed], []
+        else:
+            return []
+        if not isinstance(fragments, list):
+            fragments = [fragments]
+        if not isinstance(solutions, list):
+            solutions = [solutions]
+
+        items = []
+        for fragment in fragments:
+            txt = f"{fragment}".strip()
+            if txt:
+                items.append(self._item(txt, Memory.Area.FRAGMENTS.value))
+        for solution in solutions:
+            if isinstance(solution, dict):
+                problem = solution.get("problem", "Unknown problem")
+                solution_text = solution.get("solution", "Unknown solution")
+                txt = f"# Problem\n {problem}\n# Solution\n {solution_text}"
+            else:
+                txt = f"# Solution\n {str(solution)}"
+            items.append(self._item(txt, Memory.Area.SOLUTIONS.value))
+        return items
+
+    def _item(self, content: str, area: str) -> dict:
+        return {"content": content, "area": area, "metadata": {"area": area}}
@@ -2,21 +2,66 @@ from python.helpers import persist_chat, tokens
 from python.helpers.extension import Extension
 from agent import LoopData
 import asyncio
+import re
+import time
+
+DATA_NAME_RENAME = "rename_chat"  # persisted with the chat, naming state
+RENAME_COOLDOWN = 600  # seconds between renames of one chat
+TAIL_TOKENS = 2000  # history tail passed to the utility model
 
 
 class RenameChat(Extension):
 
     async def execute(self, loop_data: LoopData = LoopData(), **kwargs):
+        # only the main agent names the chat, subordinates have their own histories
+        if self.agent.number != 0:
+            return
+        state = self.agent.get_data(DATA_NAME_RENAME) or {}
+        if not self.should_rename(state):
+            return
+        # mark before the call so parallel monologues do not start another one
+        state = {"topics": self.topic_count(), "time": time.time()}
+        self.agent.set_data(DATA_NAME_RENAME, state)
         asyncio.create_task(self.change_name())
 
+    def should_rename(self, state: dict) -> bool:
+        # name once, as soon as there is something to name
+        if not self.agent.context.name or not state:
+            return True
+        # rename only after a topic was closed and it drifted away from the name
+        count = self.topic_count()
+        if count < state.get("topics", 0):
+            # compression merged topics into bulks, count from here
+            state["topics"] = count
+            self.agent.set_data(DATA_NAME_RENAME, state)
+        if count <= state.get("topics", 0):
+            return False
+        if time.time() - state.get("time", 0) < RENAME_COOLDOWN:
+            return False
+        return self.topic_drifted()
+
+    def topic_count(self) -> int:
+        history = self.agent.history
+        return len(history.bulks) + len(history.topics)
+
+    def topic_drifted(self) -> bool:
+        # cheap check without the model: does the last closed topic still mention the name?
+        history = self.agent.history
+        if not history.topics:
+            return False
+        last = history.topics[-1]
+        text = last.summary or tokens.trim_to_tokens(last.output_text(), TAIL_TOKENS, "end")
+        words = _words(self.agent.context.name or "")
+        return not words or not words & _words(text)
+
     async def change_name(self):
         try:
-            # prepare history
-            history_text = self.agent.history.output_text()
+            # prepare history, only the end of the conversation matters for the name
+            history_text = self.get_tail_text()
             ctx_length = min(
-                int(self.agent.config.utility_model.ctx_length * 0.7), 5000
+                int(self.agent.config.utility_model.ctx_length * 0.7), TAIL_TOKENS
             )
-            history_text = tokens.trim_to_tokens(history_text, ctx_length, "start")
+            history_text = tokens.trim_to_tokens(history_text, ctx_length, "end")
             # prepare system and user prompt
             system = self.agent.read_prompt("fw.rename_chat.sys.md")
             current_name = self.agent.context.name
@@ -32,8 +77,24 @@ class RenameChat(Extension):
                 # trim name to max length if needed
                 if len(new_name) > 40:
                     new_name = new_name[:40] + "..."
-                # apply to context and save
+                if new_name == current_name:
+                    return
+                # apply to context and save just the name
                 self.agent.context.name = new_name
-                persist_chat.save_tmp_chat(self.agent.context)
+                persist_chat.save_tmp_chat_name(self.agent.context)
         except Exception as e:
             pass  # non-critical
+
+    def get_tail_text(self) -> str:
+        # last closed topic (summary if compressed) and the current one, not the whole history
+        history = self.agent.history
+        parts = []
+        if history.topics:
+            last = history.topics[-1]
+            parts.append(last.summary or last.output_text())
+        parts.append(history.current.output_text())
+        return "\n".join(p for p in parts if p)
+
+
+def _words(text: str) -> set[str]:
+    return {w for w in re.findall(r"\w+", text.lower()) if len(w) > 2}
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any
+
+from python.helpers import files
+
+DB_PATH = "tmp/a2a_tasks.db"
+FINISHED_STATES = ("completed", "canceled", "failed", "rejected")
+UNFINISHED_STATES = ("submitted", "working")
+RETENTION = 7 * 24 * 60 * 60  # seconds finished tasks are kept
+
+
+class A2ATaskStore:
+    """
+    FastA2A storage (load_task, submit_task, update_task, load_context, update_context)
+    in a local sqlite database, so submitted tasks and results survive a restart.
+    Also keeps the push notification config of each task and lists unfinished tasks
+    for recovery, and lets requests wait for a task to finish (wait_finished).
+    Tasks are stored in the same dict format as fasta2a's InMemoryStorage.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = files.get_abs_path(path or DB_PATH)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._waiters: dict[str, list[asyncio.Future]] = {}  # task id -> futures of waiting requests
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                context_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                task TEXT NOT NULL,
+                push TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, created);
+            CREATE TABLE IF NOT EXISTS contexts (
+                id TEXT PRIMARY KEY,
+                context TEXT NOT NULL
+            );
+            """
+        )
+        self.purge()
+
+    # fasta2a Storage interface
+
+    async def load_task(self, task_id: str, history_length: int | None = None) -> dict | None:
+        task = self._get(task_id)
+        if task and history_length and "history" in task:
+            task["history"] = task["history"][-history_length:]
+        return task
+
+    async def submit_task(self, context_id: str, message: dict) -> dict:
+        task_id = str(uuid.uuid4())
+        message["task_id"] = task_id
+        message["context_id"] = context_id
+        task = {
+            "id": task_id,
+            "context_id": context_id,
+            "kind": "task",
+            "status": {"state": "submitted", "timestamp": datetime.now().isoformat()},
+            "history": [message],
+        }
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tasks (id, context_id, state, task, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (task_id, context_id, "submitted", json.dumps(task), now, now),
+            )
+        return task
+
+    async def update_task(
+        self,
+        task_id: str,
+        state: str,
+        new_artifacts: list[dict] | None = None,
+        new_messages: list[dict] | None = None,
+    ) -> dict:
+        with self._lock:
+            row = self._conn.execute("SELECT task FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if not row:
+                raise KeyError(task_id)
+            task = json.loads(row[0])
+            task["status"] = {"state": state, "timestamp": datetime.now().isoformat()}
+            if new_artifacts:
+                task.setdefault("artifacts", []).extend(new_artifacts)
+            if new_messages:
+                for message in new_messages:
+                    message["task_id"] = task_id
+                    message["context_id"] = task["context_id"]
+                    task.setdefault("history", []).append(message)
+            self._conn.execute(
+                "UPDATE tasks SET state = ?, task = ?, updated = ? WHERE id = ?",
+                (state, json.dumps(task), time.time(), task_id),
+            )
+            waiters = self._waiters.pop(task_id, []) if state in FINISHED_STATES else []
+        for future in waiters:
+            future.get_loop().call_soon_threadsafe(_resolve, future, task)
+        return task
+
+    async def load_context(self, context_id: str) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT context FROM contexts WHERE id = ?", (context_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def update_context(self, context_id: str, context: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO contexts (id, context) VALUES (?, ?)",
+                (context_id, json.dumps(context)),
+            )
+
+    async def wait_finished(self, task_id: str, timeout: float | None = None) -> dict | None:
+        """The task once it is in a final state, None if it is not by the timeout"""
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._waiters.setdefault(task_id, []).append(future)
+        try:
+            task = self._get(task_id)
+            if task is None:
+                raise KeyError(task_id)
+            if task["status"]["state"] in FINISHED_STATES:
+                return task
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                return None
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(task_id)
+                if waiters and future in waiters:
+                    waiters.remove(future)
+                    if not waiters:
+                        del self._waiters[task_id]
+
+    # push notifications, recovery and metrics
+
+    def set_push_config(self, task_id: str, config: dict):
+        with self._lock:
+            self._conn.execute("UPDATE tasks SET push = ? WHERE id = ?", (json.dumps(config), task_id))
+
+    def get_push_config(self, task_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT push FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def unfinished_tasks(self) -> list[dict]:
+        """Submitted and working tasks, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT task FROM tasks WHERE state IN ({','.join('?' * len(UNFINISHED_STATES))}) ORDER BY created",
+                UNFINISHED_STATES,
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def purge(self, retention: float = RETENTION):
+        """Delete finished tasks older than retention seconds"""
+        with self._lock:
+            self._conn.execute(
+                f"DELETE FROM tasks WHERE state IN ({','.join('?' * len(FINISHED_STATES))}) AND updated < ?",
+                (*FINISHED_STATES, time.time() - retention),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, task_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT task FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+def _resolve(future: asyncio.Future, task: dict):
+    if not future.done():
+        future.set_result(task)
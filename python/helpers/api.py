@@ -13,6 +13,9 @@ from werkzeug.serving import make_server
 Input = dict
 Output = Union[Dict[str, Any], Response, TypedDict]  # type: ignore
 
+# bodies not loaded into memory up front, handlers stream them
+STREAMED_MIMETYPES = {"multipart/form-data", "application/octet-stream"}
+
 
 class ApiHandler:
     def __init__(self, app: Flask, thread_lock: threading.Lock):
@@ -39,6 +42,11 @@ class ApiHandler:
     def get_methods(cls) -> list[str]:
         return ["POST"]
 
+    @classmethod
+    def runs_on_event_loop(cls) -> bool:
+        # only for handlers that never block, in ASGI mode the others run in a worker thread
+        return False
+
     @classmethod
     def requires_csrf(cls) -> bool:
         return cls.requires_auth()
@@ -60,6 +68,9 @@ class ApiHandler:
                     # Just log the error and continue with empty input
                     PrintStyle().print(f"Error parsing JSON: {str(e)}")
                     input_data = {}
+            elif request.mimetype in STREAMED_MIMETYPES:
+                # uploads are read by the handler from request.files or request.stream
+                input_data = {}
             else:
                 input_data = {"data": request.get_data(as_text=True)}
 
@@ -0,0 +1,202 @@
+import asyncio
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+from flask import Flask
+
+from python.helpers.print_style import PrintStyle
+
+SPOOL_SIZE = 1024 * 1024  # request bodies above this size are buffered on disk
+WSGI_WORKERS = 16  # threads serving pages and static files through the flask app
+API_WORKERS = 64  # threads running API handlers not audited for the event loop, some wait on agents
+GRACEFUL_TIMEOUT = 30  # seconds in-flight requests get to finish on shutdown
+
+View = Callable[[], Awaitable[Any]]
+
+
+class AsgiApp:
+    """
+    ASGI entry point for the web UI. API handlers audited to never block are awaited
+    directly on the server event loop inside a flask request context, so flask's request
+    and session work as before without an event loop per request. The other handlers
+    still make blocking calls (sqlite, chat loading, file I/O, RFC joins) and run in a
+    thread pool with an event loop each, as under WSGI. MCP and A2A apps are called
+    natively, everything else (pages, login, static files) goes to the flask app in a
+    thread pool.
+    """
+
+    def __init__(
+        self,
+        webapp: Flask,
+        api_views: dict[str, tuple[View, list[str], bool]],
+        mounts: dict[str, Callable],
+    ):
+        from a2wsgi import WSGIMiddleware
+
+        self.webapp = webapp
+        self.api_views = api_views
+        self.mounts = mounts
+        self.wsgi = WSGIMiddleware(webapp, workers=WSGI_WORKERS)  # type: ignore
+        self.api_executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="api")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return  # lifespan is not used, mounted apps start lazily as under WSGI
+        path = scope["path"]
+        for prefix, app in self.mounts.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                # same scope a2wsgi built for the mounts under the dispatcher middleware
+                await app({**scope, "root_path": scope.get("root_path", "") + prefix}, receive, send)
+                return
+        if scope["type"] == "http":
+            api = self.api_views.get(path)
+            if api and scope["method"] in api[1]:
+                await self._handle_api(api[0], api[2], scope, receive, send)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def _handle_api(self, view: View, on_loop: bool, scope, receive, send):
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        try:
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                body.write(message.get("body", b""))
+                more_body = message.get("more_body", False)
+            length = body.tell()
+            body.seek(0)
+
+            environ = _environ(scope, body, length)
+            if on_loop:
+                with self.webapp.request_context(environ):
+                    try:
+                        rv = await view()
+                    except Exception as e:
+                        rv = self.webapp.handle_exception(e)
+                    response = self._make_response(rv)
+            else:
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self.api_executor, self._run_in_thread, view, environ
+                )
+
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (key.lower().encode("latin-1"), value.encode("latin-1"))
+                    for key, value in response.headers.items()
+                ],
+            })
+            if scope["method"] == "HEAD":
+                response.close()
+                await send({"type": "http.response.body", "body": b""})
+            elif not response.is_streamed:
+                await send({"type": "http.response.body", "body": response.get_data()})
+            else:
+                await _send_streamed(response, receive, send)
+        finally:
+            body.close()
+
+    def _run_in_thread(self, view: View, environ: dict):
+        with self.webapp.request_context(environ):
+            try:
+                rv = self.webapp.ensure_sync(view)()
+            except Exception as e:
+                rv = self.webapp.handle_exception(e)
+            return self._make_response(rv)
+
+    def _make_response(self, rv):
+        # after request hooks and the session cookie
+        return self.webapp.process_response(self.webapp.make_response(rv))
+
+
+async def _send_streamed(response, receive, send):
+    # generators may block (file reads, RFC calls), each chunk is pulled in a thread
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        disconnected.set()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    chunks = response.iter_encoded()
+    try:
+        while not disconnected.is_set():
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        watcher.cancel()
+        await asyncio.to_thread(response.close)
+
+
+def _environ(scope, body, length: int) -> dict:
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+        "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(length),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_key, raw_value in scope["headers"]:
+        key = raw_key.decode("latin1").upper().replace("-", "_")
+        value = raw_value.decode("latin1")
+        if key == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if key == "CONTENT_LENGTH":
+            continue  # the body was read, its real length is set above
+        key = f"HTTP_{key}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class AsgiServer:
+    """uvicorn server with the shutdown() process.stop_server expects"""
+
+    def __init__(self, app: AsgiApp, host: str, port: int):
+        import uvicorn
+
+        self.config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            lifespan="off",
+            access_log=False,
+            log_level="warning",
+            timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        )
+        self.server = uvicorn.Server(self.config)
+
+    def log_startup(self):
+        PrintStyle().debug(f"ASGI server ready at http://{self.config.host}:{self.config.port}")
+
+    def serve_forever(self):
+        # stops on SIGINT/SIGTERM or shutdown(), open requests are drained before exit
+        self.server.run()
+
+    def shutdown(self):
+        self.server.should_exit = True
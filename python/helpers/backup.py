@@ -1,15 +1,17 @@
+import asyncio
 import zipfile
 import json
 import os
 import tempfile
 import datetime
 import platform
-from typing import List, Dict, Any, Optional
+import itertools
+from typing import Iterator, List, Dict, Any, Optional
 
 from pathspec import PathSpec
 from pathspec.patterns.gitwildmatch import GitWildMatchPattern
 
-from python.helpers import files, runtime, git
+from python.helpers import files, runtime, git, zip_stream, backup_snapshots
 from python.helpers.print_style import PrintStyle
 
 
@@ -256,6 +258,10 @@ class BackupService:
 
     async def test_patterns(self, metadata: Dict[str, Any], max_files: int = 1000) -> List[Dict[str, Any]]:
         """Test backup patterns and return list of matched files"""
+        return list(itertools.islice(self._iter_matched_files(metadata), max_files))
+
+    def _iter_matched_files(self, metadata: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Walk the base directories and yield files matched by the backup patterns"""
         include_patterns = metadata.get("include_patterns", [])
         exclude_patterns = metadata.get("exclude_patterns", [])
         include_hidden = metadata.get("include_hidden", False)
@@ -267,77 +273,61 @@ class BackupService:
         pattern_lines = [line.strip() for line in patterns_string.split('\n') if line.strip() and not line.strip().startswith('#')]
 
         if not pattern_lines:
-            return []
+            return
 
         # Get explicit patterns for hidden file handling
         explicit_patterns = self._get_explicit_patterns(include_patterns)
 
-        matched_files = []
-        processed_count = 0
-
         try:
             spec = PathSpec.from_lines(GitWildMatchPattern, pattern_lines)
+        except Exception as e:
+            raise Exception(f"Error processing patterns: {str(e)}")
 
-            # Walk through base directories
-            for base_pattern_path, base_real_path in self.base_paths.items():
-                if not os.path.exists(base_real_path):
-                    continue
-
-                for root, dirs, files_list in os.walk(base_real_path):
-                    # Filter hidden directories if not included, BUT allow explicit ones
-                    if not include_hidden:
-                        dirs_to_keep = []
-                        for d in dirs:
-                            if not d.startswith('.'):
-                                dirs_to_keep.append(d)
-                            else:
-                                # Check if this hidden directory is explicitly included
-                                dir_path = os.path.join(root, d)
-                                pattern_path = self._unresolve_path(dir_path)
-                                if self._is_explicitly_included(pattern_path, explicit_patterns):
-                                    dirs_to_keep.append(d)
-                        dirs[:] = dirs_to_keep
-
-                    for file in files_list:
-                        if processed_count >= max_files:
-                            break
-
-                        file_path = os.path.join(root, file)
-                        pattern_path = self._unresolve_path(file_path)
-
-                        # Skip hidden files if not included, BUT allow explicit ones
-                        if not include_hidden and file.startswith('.'):
-                            if not self._is_explicitly_included(pattern_path, explicit_patterns):
-                                continue
+        # Walk through base directories
+        for base_pattern_path, base_real_path in self.base_paths.items():
+            if not os.path.exists(base_real_path):
+                continue
 
-                        # Remove leading slash for pathspec matching
-                        relative_path = pattern_path.lstrip('/')
-
-                        if spec.match_file(relative_path):
-                            try:
-                                stat = os.stat(file_path)
-                                matched_files.append({
-                                    "path": pattern_path,
-                                    "real_path": file_path,
-                                    "size": stat.st_size,
-                                    "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                                    "type": "file"
-                                })
-                                processed_count += 1
-                            except (OSError, IOError):
-                                # Skip files we can't access
-                                continue
+            for root, dirs, files_list in os.walk(base_real_path):
+                # Filter hidden directories if not included, BUT allow explicit ones
+                if not include_hidden:
+                    dirs_to_keep = []
+                    for d in dirs:
+                        if not d.startswith('.'):
+                            dirs_to_keep.append(d)
+                        else:
+                            # Check if this hidden directory is explicitly included
+                            dir_path = os.path.join(root, d)
+                            pattern_path = self._unresolve_path(dir_path)
+                            if self._is_explicitly_included(pattern_path, explicit_patterns):
+                                dirs_to_keep.append(d)
+                    dirs[:] = dirs_to_keep
 
-                    if processed_count >= max_files:
-                        break
+                for file in files_list:
+                    file_path = os.path.join(root, file)
+                    pattern_path = self._unresolve_path(file_path)
 
-                if processed_count >= max_files:
-                    break
+                    # Skip hidden files if not included, BUT allow explicit ones
+                    if not include_hidden and file.startswith('.'):
+                        if not self._is_explicitly_included(pattern_path, explicit_patterns):
+                            continue
 
-        except Exception as e:
-            raise Exception(f"Error processing patterns: {str(e)}")
+                    # Remove leading slash for pathspec matching
+                    relative_path = pattern_path.lstrip('/')
 
-        return matched_files
+                    if spec.match_file(relative_path):
+                        try:
+                            stat = os.stat(file_path)
+                        except (OSError, IOError):
+                            # Skip files we can't access
+                            continue
+                        yield {
+                            "path": pattern_path,
+                            "real_path": file_path,
+                            "size": stat.st_size,
+                            "modified": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                            "type": "file"
+                        }
 
     async def create_backup(
         self,
@@ -348,6 +338,35 @@ class BackupService:
     ) -> str:
         """Create backup archive and return path to created file"""
 
+        stream = await self.create_backup_stream(
+            include_patterns, exclude_patterns, include_hidden, backup_name
+        )
+
+        # Create temporary zip file
+        temp_dir = tempfile.mkdtemp()
+        zip_path = os.path.join(temp_dir, f"{backup_name}.zip")
+
+        try:
+            with open(zip_path, 'wb') as zip_file:
+                for chunk in stream:
+                    zip_file.write(chunk)
+            return zip_path
+
+        except Exception as e:
+            # Cleanup on error
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
+            raise Exception(f"Error creating backup: {str(e)}")
+
+    async def create_backup_stream(
+        self,
+        include_patterns: List[str],
+        exclude_patterns: List[str],
+        include_hidden: bool = False,
+        backup_name: str = "agent-zero-backup"
+    ) -> Iterator[bytes]:
+        """Create backup archive as a stream of zip bytes, produced while files are compressed"""
+
         # Create metadata for test_patterns
         metadata = {
             "include_patterns": include_patterns,
@@ -355,83 +374,168 @@ class BackupService:
             "include_hidden": include_hidden
         }
 
-        # Get matched files
-        matched_files = await self.test_patterns(metadata, max_files=50000)
+        # Get matched files, all of them, test_patterns caps the count for previews
+        matched_files = await asyncio.to_thread(list, self._iter_matched_files(metadata))
 
         if not matched_files:
             raise Exception("No files matched the backup patterns")
 
-        # Create temporary zip file
-        temp_dir = tempfile.mkdtemp()
-        zip_path = os.path.join(temp_dir, f"{backup_name}.zip")
+        # Add comprehensive metadata
+        metadata = {
+            # Basic backup information
+            "agent_zero_version": self.agent_zero_version,
+            "timestamp": datetime.datetime.now().isoformat(),
+            "backup_name": backup_name,
+            "include_hidden": include_hidden,
 
-        try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add comprehensive metadata
-                metadata = {
-                    # Basic backup information
-                    "agent_zero_version": self.agent_zero_version,
-                    "timestamp": datetime.datetime.now().isoformat(),
-                    "backup_name": backup_name,
-                    "include_hidden": include_hidden,
-
-                    # Pattern arrays for granular control during restore
-                    "include_patterns": include_patterns,
-                    "exclude_patterns": exclude_patterns,
-
-                    # System and environment information
-                    "system_info": await self._get_system_info(),
-                    "environment_info": await self._get_environment_info(),
-                    "backup_author": await self._get_backup_author(),
-
-                    # Backup configuration
-                    "backup_config": {
-                        "include_patterns": include_patterns,
-                        "exclude_patterns": exclude_patterns,
-                        "include_hidden": include_hidden,
-                        "compression_level": 6,
-                        "integrity_check": True
-                    },
-
-                    # File information
-                    "files": [
-                        {
-                            "path": f["path"],
-                            "size": f["size"],
-                            "modified": f["modified"],
-                            "type": "file"
-                        }
-                        for f in matched_files
-                    ],
+            # Pattern arrays for granular control during restore
+            "include_patterns": include_patterns,
+            "exclude_patterns": exclude_patterns,
 
-                    # Statistics
-                    "total_files": len(matched_files),
-                    "backup_size": sum(f["size"] for f in matched_files),
-                    "directory_count": self._count_directories(matched_files),
-                }
+            # System and environment information
+            "system_info": await self._get_system_info(),
+            "environment_info": await self._get_environment_info(),
+            "backup_author": await self._get_backup_author(),
 
-                zipf.writestr("metadata.json", json.dumps(metadata, indent=2))
+            # Backup configuration
+            "backup_config": {
+                "include_patterns": include_patterns,
+                "exclude_patterns": exclude_patterns,
+                "include_hidden": include_hidden,
+                "compression_level": 6,
+                "integrity_check": True
+            },
+
+            # File information
+            "files": [
+                {
+                    "path": f["path"],
+                    "size": f["size"],
+                    "modified": f["modified"],
+                    "type": "file"
+                }
+                for f in matched_files
+            ],
 
-                # Add files
-                for file_info in matched_files:
-                    real_path = file_info["real_path"]
-                    archive_path = file_info["path"].lstrip('/')
+            # Statistics
+            "total_files": len(matched_files),
+            "backup_size": sum(f["size"] for f in matched_files),
+            "directory_count": self._count_directories(matched_files),
+        }
 
-                    try:
-                        if os.path.exists(real_path) and os.path.isfile(real_path):
-                            zipf.write(real_path, archive_path)
-                    except (OSError, IOError) as e:
-                        # Log error but continue with other files
-                        PrintStyle().warning(f"Warning: Could not backup file {real_path}: {e}")
-                        continue
+        # metadata first, then the files, unreadable files are skipped with a warning
+        members: List[tuple[str, str | bytes]] = [
+            ("metadata.json", json.dumps(metadata, indent=2).encode("utf-8"))
+        ]
+        members += [(f["path"].lstrip('/'), f["real_path"]) for f in matched_files]
+        return zip_stream.stream_zip(members, level=metadata["backup_config"]["compression_level"])
 
-            return zip_path
+    async def create_snapshot(
+        self,
+        include_patterns: List[str],
+        exclude_patterns: List[str],
+        include_hidden: bool = False,
+        backup_name: str = "agent-zero-backup",
+        keep: int = 0
+    ) -> Dict[str, Any]:
+        """Create an incremental snapshot, only files changed since the last one are read and stored"""
+        metadata = {
+            "include_patterns": include_patterns,
+            "exclude_patterns": exclude_patterns,
+            "include_hidden": include_hidden
+        }
+        info = {
+            "agent_zero_version": self.agent_zero_version,
+            "backup_name": backup_name,
+            "include_hidden": include_hidden,
+            "include_patterns": include_patterns,
+            "exclude_patterns": exclude_patterns,
+            "environment_info": await self._get_environment_info(),
+            "backup_author": await self._get_backup_author(),
+        }
 
-        except Exception as e:
-            # Cleanup on error
-            if os.path.exists(zip_path):
-                os.remove(zip_path)
-            raise Exception(f"Error creating backup: {str(e)}")
+        def create() -> Dict[str, Any]:
+            # no file cap, unchanged files cost a stat only
+            matched_files = self._iter_matched_files(metadata)
+            first = next(matched_files, None)
+            if first is None:
+                raise Exception("No files matched the backup patterns")
+            manifest = repository.create_snapshot(itertools.chain([first], matched_files), info)
+            if keep > 0:
+                repository.prune(keep)
+            return manifest
+
+        repository = backup_snapshots.SnapshotRepository()
+        manifest = await asyncio.to_thread(create)
+        manifest.pop("files")
+        return manifest
+
+    async def list_snapshots(self) -> List[Dict[str, Any]]:
+        """Summaries of stored snapshots, oldest first"""
+        return await asyncio.to_thread(backup_snapshots.SnapshotRepository().list_manifests)
+
+    async def preview_snapshot_restore(
+        self,
+        snapshot_id: str,
+        restore_include_patterns: Optional[List[str]] = None,
+        restore_exclude_patterns: Optional[List[str]] = None,
+        overwrite_policy: str = "overwrite"
+    ) -> Dict[str, Any]:
+        """Preview which files would be restored, computed from the manifest without reading any archive"""
+        repository = backup_snapshots.SnapshotRepository()
+        manifest = await asyncio.to_thread(repository.load_manifest, snapshot_id)
+        return await asyncio.to_thread(
+            self._plan_snapshot_restore, repository, manifest,
+            restore_include_patterns, restore_exclude_patterns, overwrite_policy
+        )
+
+    async def restore_snapshot(
+        self,
+        snapshot_id: str,
+        restore_include_patterns: Optional[List[str]] = None,
+        restore_exclude_patterns: Optional[List[str]] = None,
+        overwrite_policy: str = "overwrite"
+    ) -> Dict[str, Any]:
+        """Restore changed and missing files of a snapshot"""
+        repository = backup_snapshots.SnapshotRepository()
+
+        def restore() -> Dict[str, Any]:
+            manifest = repository.load_manifest(snapshot_id)
+            plan = self._plan_snapshot_restore(
+                repository, manifest,
+                restore_include_patterns, restore_exclude_patterns, overwrite_policy
+            )
+            result = repository.restore(manifest, plan, overwrite_policy)
+            manifest.pop("files")
+            return {**result, "backup_metadata": manifest}
+
+        return await asyncio.to_thread(restore)
+
+    def _plan_snapshot_restore(
+        self,
+        repository: "backup_snapshots.SnapshotRepository",
+        manifest: Dict[str, Any],
+        restore_include_patterns: Optional[List[str]],
+        restore_exclude_patterns: Optional[List[str]],
+        overwrite_policy: str
+    ) -> Dict[str, Any]:
+        # same pattern translation as archive restores
+        pattern_lines = [
+            pattern.lstrip('/')
+            for pattern in self._translate_patterns(restore_include_patterns or [], manifest)
+        ] + [
+            f"!{pattern.lstrip('/')}"
+            for pattern in self._translate_patterns(restore_exclude_patterns or [], manifest)
+        ]
+        restore_spec = PathSpec.from_lines(GitWildMatchPattern, pattern_lines) if pattern_lines else None
+        plan = repository.preview_restore(
+            manifest,
+            lambda path: self._translate_restore_path(path, manifest),
+            restore_spec.match_file if restore_spec else None,
+            overwrite_policy,
+        )
+        plan["backup_metadata"] = {k: v for k, v in manifest.items() if k != "files"}
+        return plan
 
     async def inspect_backup(self, backup_file) -> Dict[str, Any]:
         """Inspect backup archive and return metadata"""
@@ -854,3 +958,36 @@ class BackupService:
         except Exception:
             # If pattern testing fails, return empty list to avoid breaking restore
             return []
+
+
+async def run_scheduled_snapshot(
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+    include_hidden: bool = False,
+    backup_name: str = "agent-zero-snapshot",
+    keep: int = 0
+) -> str:
+    """Scheduler job, see task_scheduler.TASK_JOBS"""
+    from python.helpers.persist_chat import save_tmp_chats
+
+    backup_service = BackupService()
+    if include_patterns is None:
+        include_patterns, default_excludes = backup_service._parse_patterns(
+            backup_service._get_default_patterns()
+        )
+        exclude_patterns = default_excludes if exclude_patterns is None else exclude_patterns
+
+    # Save all chats to the chats folder
+    save_tmp_chats()
+
+    manifest = await backup_service.create_snapshot(
+        include_patterns=include_patterns,
+        exclude_patterns=exclude_patterns or [],
+        include_hidden=include_hidden,
+        backup_name=backup_name,
+        keep=keep
+    )
+    return (
+        f"Snapshot {manifest['id']}: {manifest['total_files']} files, "
+        f"{manifest['changed_files']} changed, {manifest['new_bytes']} new bytes stored"
+    )
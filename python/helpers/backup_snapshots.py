@@ -0,0 +1,315 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from python.helpers import files
+from python.helpers.print_style import PrintStyle
+
+SNAPSHOTS_DIR = "tmp/backups"
+CHUNK_SIZE = 1024 * 1024  # fixed size chunks, unchanged regions of a rewritten file dedupe
+WORKERS = min(8, os.cpu_count() or 1)
+
+# one lock per repository directory, shared by all SnapshotRepository instances
+_locks: Dict[str, threading.RLock] = {}
+_locks_lock = threading.Lock()
+
+
+def _repository_lock(root: str) -> threading.RLock:
+    with _locks_lock:
+        return _locks.setdefault(os.path.realpath(root), threading.RLock())
+
+
+class SnapshotRepository:
+    """
+    Content addressed store of incremental backups. Each snapshot is a manifest of
+    (path, size, mtime, content hash, chunk hashes), file contents live in a shared pool
+    of compressed chunks named by their sha256, so unchanged data is stored only once.
+    Files with the same size and mtime as in the previous snapshot are not read again.
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = root or files.get_abs_path(SNAPSHOTS_DIR)
+        self.chunks_dir = os.path.join(self.root, "chunks")
+        self.manifests_dir = os.path.join(self.root, "manifests")
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        # snapshots and garbage collection of the same directory never overlap
+        self._lock = _repository_lock(self.root)
+
+    # chunks
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def put_chunk(self, digest: str, data: bytes) -> bool:
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # unique temp name, two files may share a chunk and store it at the same time
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(zlib.compress(data, 6))
+        os.replace(temp_path, path)
+        return True
+
+    def get_chunk(self, digest: str) -> bytes:
+        with open(self._chunk_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise Exception(f"Corrupted backup chunk {digest}")
+        return data
+
+    # manifests
+
+    def _manifest_path(self, snapshot_id: str) -> str:
+        if not snapshot_id or os.path.basename(snapshot_id) != snapshot_id:
+            raise ValueError(f"Invalid snapshot id: {snapshot_id}")
+        return os.path.join(self.manifests_dir, f"{snapshot_id}.json")
+
+    def load_manifest(self, snapshot_id: str) -> Dict[str, Any]:
+        path = self._manifest_path(snapshot_id)
+        if not os.path.exists(path):
+            raise Exception(f"Snapshot not found: {snapshot_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest: Dict[str, Any]):
+        path = self._manifest_path(manifest["id"])
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, path)
+
+    def snapshot_ids(self) -> List[str]:
+        """Ids oldest first, they start with the creation time in microseconds"""
+        return sorted(
+            name[: -len(".json")]
+            for name in os.listdir(self.manifests_dir)
+            if name.endswith(".json")
+        )
+
+    def list_manifests(self) -> List[Dict[str, Any]]:
+        """Snapshot summaries without the file lists, oldest first"""
+        summaries = []
+        for snapshot_id in self.snapshot_ids():
+            try:
+                manifest = self.load_manifest(snapshot_id)
+            except Exception as e:
+                PrintStyle().warning(f"Warning: Could not read backup manifest {snapshot_id}: {e}")
+                continue
+            manifest.pop("files", None)
+            summaries.append(manifest)
+        return summaries
+
+    def latest_manifest(self) -> Optional[Dict[str, Any]]:
+        ids = self.snapshot_ids()
+        return self.load_manifest(ids[-1]) if ids else None
+
+    # snapshots
+
+    def create_snapshot(
+        self, matched_files: Iterable[Dict[str, Any]], info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Store changed files and write a manifest covering all matched files"""
+        with self._lock:
+            previous = self.latest_manifest()
+            known = {f["path"]: f for f in previous["files"]} if previous else {}
+
+            entries: List[Dict[str, Any]] = []
+            stats = {"changed_files": 0, "new_chunks": 0, "new_bytes": 0}
+            with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+                futures = []
+                for file_info in matched_files:
+                    try:
+                        stat = os.stat(file_info["real_path"])
+                    except OSError:
+                        continue
+                    old = known.get(file_info["path"])
+                    if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                        entries.append(old)  # unchanged, not even read
+                        continue
+                    futures.append(executor.submit(self._store_file, file_info))
+                for future in futures:
+                    entry, new_chunks, new_bytes = future.result()
+                    if entry:
+                        entries.append(entry)
+                        stats["changed_files"] += 1
+                    stats["new_chunks"] += new_chunks
+                    stats["new_bytes"] += new_bytes
+
+            timestamp = datetime.datetime.now()
+            if previous:
+                # ids sort by time, keep them increasing if the clock went back
+                previous_time = datetime.datetime.fromisoformat(previous["timestamp"])
+                if timestamp <= previous_time:
+                    timestamp = previous_time + datetime.timedelta(microseconds=1)
+            manifest = {
+                **info,
+                "id": f"{timestamp.strftime('%Y%m%d-%H%M%S-%f')}-{uuid.uuid4().hex[:6]}",
+                "timestamp": timestamp.isoformat(),
+                "parent": previous["id"] if previous else None,
+                "total_files": len(entries),
+                "backup_size": sum(e["size"] for e in entries),
+                **stats,
+                "files": sorted(entries, key=lambda e: e["path"]),
+            }
+            self.save_manifest(manifest)
+            return manifest
+
+    def _store_file(self, file_info: Dict[str, Any]) -> tuple[Optional[Dict[str, Any]], int, int]:
+        real_path = file_info["real_path"]
+        new_chunks = new_bytes = 0
+        try:
+            stat = os.stat(real_path)
+            file_hash = hashlib.sha256()
+            chunks = []
+            with open(real_path, "rb") as f:
+                for data in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    file_hash.update(data)
+                    digest = hashlib.sha256(data).hexdigest()
+                    chunks.append(digest)
+                    if self.put_chunk(digest, data):
+                        new_chunks += 1
+                        new_bytes += len(data)
+        except OSError as e:
+            PrintStyle().warning(f"Warning: Could not backup file {real_path}: {e}")
+            return None, new_chunks, new_bytes
+        entry = {
+            "path": file_info["path"],
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash.hexdigest(),
+            "chunks": chunks,
+        }
+        return entry, new_chunks, new_bytes
+
+    def preview_restore(
+        self,
+        manifest: Dict[str, Any],
+        translate_path: Callable[[str], str],
+        match: Optional[Callable[[str], bool]] = None,
+        overwrite_policy: str = "overwrite",
+    ) -> Dict[str, Any]:
+        """Restore plan from the manifest and a stat of each target, no archive is read"""
+        files_to_restore = []
+        skipped_files = []
+        for entry in manifest["files"]:
+            target_path = translate_path(entry["path"])
+            skip = {"archive_path": entry["path"], "original_path": entry["path"]}
+            if match and not match(target_path.lstrip('/')):
+                skipped_files.append({**skip, "reason": "not_matched_by_pattern"})
+                continue
+            try:
+                stat = os.stat(target_path)
+            except OSError:
+                stat = None
+            if stat and stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                skipped_files.append({**skip, "reason": "unchanged"})
+                continue
+            if stat and overwrite_policy == "skip":
+                skipped_files.append({**skip, "reason": "file_exists_skip_policy"})
+                continue
+            files_to_restore.append({
+                "archive_path": entry["path"],
+                "original_path": entry["path"],
+                "target_path": target_path,
+                "size": entry["size"],
+                "action": "restore",
+            })
+        return {
+            "files": files_to_restore,
+            "files_to_restore": files_to_restore,
+            "skipped_files": skipped_files,
+            "total_count": len(files_to_restore),
+            "restore_count": len(files_to_restore),
+            "skipped_count": len(skipped_files),
+            "overwrite_policy": overwrite_policy,
+        }
+
+    def restore(
+        self, manifest: Dict[str, Any], plan: Dict[str, Any], overwrite_policy: str = "overwrite"
+    ) -> Dict[str, Any]:
+        """Write the planned files from chunks, verified against the content hash"""
+        entries = {e["path"]: e for e in manifest["files"]}
+
+        def restore_file(item: Dict[str, Any]) -> Dict[str, Any]:
+            entry = entries[item["archive_path"]]
+            target_path = item["target_path"]
+            try:
+                if os.path.exists(target_path) and overwrite_policy == "backup":
+                    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+                    shutil.move(target_path, f"{target_path}.backup.{timestamp}")
+                target_dir = os.path.dirname(target_path)
+                if target_dir:
+                    os.makedirs(target_dir, exist_ok=True)
+                temp_path = f"{target_path}.restore.tmp"
+                file_hash = hashlib.sha256()
+                with open(temp_path, "wb") as f:
+                    for digest in entry["chunks"]:
+                        data = self.get_chunk(digest)
+                        file_hash.update(data)
+                        f.write(data)
+                if file_hash.hexdigest() != entry["hash"]:
+                    os.remove(temp_path)
+                    raise Exception("content hash mismatch")
+                os.replace(temp_path, target_path)
+                # keep the manifest mtime so the next preview sees the file as unchanged
+                os.utime(target_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+                return {**item, "status": "restored"}
+            except Exception as e:
+                return {"path": item["archive_path"], "original_path": item["original_path"], "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            results = list(executor.map(restore_file, plan["files_to_restore"]))
+        return {
+            "restored_files": [r for r in results if "error" not in r],
+            "skipped_files": plan["skipped_files"],
+            "errors": [r for r in results if "error" in r],
+        }
+
+    def prune(self, keep: int) -> List[str]:
+        """Delete all but the newest snapshots and the chunks only they referenced"""
+        with self._lock:
+            ids = self.snapshot_ids()
+            removed = ids[:-keep] if keep > 0 else []
+            for snapshot_id in removed:
+                os.remove(self._manifest_path(snapshot_id))
+            if removed:
+                self.collect_garbage()
+            return removed
+
+    def collect_garbage(self) -> int:
+        """
+        Delete chunks no manifest references. Chunks written since the collection started
+        and temp files of chunks being written belong to a snapshot in progress, e.g. from
+        another process, and are kept.
+        """
+        with self._lock:
+            started = datetime.datetime.now().timestamp()
+            referenced = set()
+            for snapshot_id in self.snapshot_ids():
+                for entry in self.load_manifest(snapshot_id)["files"]:
+                    referenced.update(entry["chunks"])
+            removed = 0
+            for prefix in os.listdir(self.chunks_dir):
+                folder = os.path.join(self.chunks_dir, prefix)
+                for name in os.listdir(folder):
+                    if name in referenced or name.endswith(".tmp"):
+                        continue
+                    path = os.path.join(folder, name)
+                    try:
+                        if os.stat(path).st_mtime >= started:
+                            continue
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    removed += 1
+            return removed
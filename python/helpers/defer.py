@@ -100,19 +100,16 @@ class DeferredTask:
         if not self._future:
             raise RuntimeError("Task hasn't been started")
 
-        loop = asyncio.get_running_loop()
-
-        def _get_result():
-            try:
-                result = self._future.result(timeout)  # type: ignore
-                # self.kill()
-                return result
-            except TimeoutError:
-                raise TimeoutError(
-                    "The task did not complete within the specified timeout."
-                )
-
-        return await loop.run_in_executor(None, _get_result)
+        # awaited without holding an executor thread, shielded so a timeout or a
+        # cancelled caller does not cancel the task itself
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(self._future)), timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                "The task did not complete within the specified timeout."
+            )
 
     def kill(self, terminate_thread: bool = False) -> None:
         """Kill the task and optionally terminate its thread."""
@@ -0,0 +1,143 @@
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+FILE_NAME = "docstore.db"
+
+
+class SqliteDocstore(Docstore, AddableMixin):
+    """
+    Docstore kept in a sqlite file next to the faiss index.
+    Documents are read on demand, so only the vectors and the id map stay in RAM.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        # InMemoryDocstore compatible view, code reads docstore._dict directly
+        self._dict = _DocsView(self)
+
+    def search(self, search: str) -> str | Document:
+        doc = self.get(search)
+        if doc is None:
+            return f"ID {search} not found."
+        return doc
+
+    def get(self, id: str) -> Document | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, metadata FROM docs WHERE id = ?", (id,)
+            ).fetchone()
+        return _to_doc(row) if row else None
+
+    def get_metadata(self, id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata FROM docs WHERE id = ?", (id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_metadata(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, metadata FROM docs").fetchall()
+        for id, metadata in rows:
+            yield id, json.loads(metadata)
+
+    def add(self, texts: dict[str, Document]) -> None:
+        rows = [
+            (id, doc.page_content, json.dumps(doc.metadata, default=str))
+            for id, doc in texts.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO docs (id, text, metadata) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def delete(self, ids: list) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM docs WHERE id = ?", [(id,) for id in ids]
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM docs")
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def contains(self, id: str) -> bool:
+        with self._lock:
+            return (
+                self._conn.execute("SELECT 1 FROM docs WHERE id = ?", (id,)).fetchone()
+                is not None
+            )
+
+    def ids(self) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT id FROM docs").fetchall()]
+
+    def items(self) -> list[tuple[str, Document]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, text, metadata FROM docs").fetchall()
+        return [(id, _to_doc((text, metadata))) for id, text, metadata in rows]
+
+    def __getstate__(self):
+        raise TypeError("SqliteDocstore is persisted in its own file and can not be pickled")
+
+
+class _DocsView(Mapping):
+    def __init__(self, store: SqliteDocstore):
+        self._store = store
+
+    def __getitem__(self, key: str) -> Document:
+        doc = self._store.get(key)
+        if doc is None:
+            raise KeyError(key)
+        return doc
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._store.contains(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.ids())
+
+    def __len__(self) -> int:
+        return self._store.count()
+
+    # single query instead of one lookup per key
+    def items(self):  # type: ignore
+        return self._store.items()
+
+    def values(self):  # type: ignore
+        return [doc for _, doc in self._store.items()]
+
+
+def _to_doc(row) -> Document:
+    text, metadata = row
+    return Document(page_content=text, metadata=json.loads(metadata))
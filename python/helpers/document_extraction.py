@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Sequence
+
+from python.helpers import files
+from python.helpers.print_style import PrintStyle
+
+# bump when page extraction changes, cached pages of older versions are ignored
+EXTRACTOR_VERSION = "1"
+
+CACHE_DIR = "tmp/document_cache"
+CACHE_FILE = "pages.db"
+MAX_PAGES = 200_000  # LRU cap of cached pages
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+OCR_DPI = 300
+OCR_MIN_TEXT = 20  # pages with less extracted text are treated as scanned and OCRed
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class PageCache:
+    """
+    Extracted page texts in a sqlite file, keyed by (file hash, page, extractor version),
+    so the same document is never extracted twice.
+    """
+
+    _instance: "PageCache | None" = None
+    _instance_lock = threading.Lock()
+
+    @staticmethod
+    def get() -> "PageCache":
+        with PageCache._instance_lock:
+            if PageCache._instance is None:
+                PageCache._instance = PageCache(files.get_abs_path(CACHE_DIR, CACHE_FILE))
+            return PageCache._instance
+
+    def __init__(self, path: str, max_pages: int = MAX_PAGES):
+        self.path = path
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                version TEXT NOT NULL,
+                text TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (hash, page, version)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pages_last_used ON pages(last_used)"
+        )
+        self._conn.commit()
+
+    def get_pages(self, file_hash: str, version: str = EXTRACTOR_VERSION) -> dict[int, str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page, text FROM pages WHERE hash = ? AND version = ?",
+                (file_hash, version),
+            ).fetchall()
+            if rows:
+                self._conn.execute(
+                    "UPDATE pages SET last_used = ? WHERE hash = ? AND version = ?",
+                    (time.time(), file_hash, version),
+                )
+                self._conn.commit()
+        return {page: text for page, text in rows}
+
+    def put_page(self, file_hash: str, page: int, text: str, version: str = EXTRACTOR_VERSION):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (hash, page, version, text, last_used) VALUES (?, ?, ?, ?, ?)",
+                (file_hash, page, version, text, time.time()),
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            excess = total - self.max_pages
+            if excess > 0:
+                self._conn.execute(
+                    """
+                    DELETE FROM pages WHERE (hash, page, version) IN (
+                        SELECT hash, page, version FROM pages ORDER BY last_used ASC LIMIT ?
+                    )
+                    """,
+                    (excess,),
+                )
+                self._conn.commit()
+            return max(0, excess)
+
+
+def file_checksum(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn, forking the threaded web server process is not safe
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def pdf_page_count(path: str) -> int:
+    import fitz  # PyMuPDF
+
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def extract_pdf_page(path: str, page_no: int) -> str:
+    """Text of one PDF page with tables as markdown, OCR when the page is scanned. Runs in a worker."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(path) as doc:
+        page = doc.load_page(page_no)
+        text = page.get_text("text").strip()
+        try:
+            tables = [t.to_markdown() for t in page.find_tables().tables]
+        except Exception:
+            tables = []  # table detection is best effort
+        if len(text) < OCR_MIN_TEXT:
+            text = _ocr_page(page)
+        return "\n\n".join([text, *tables]).strip()
+
+
+def _ocr_page(page) -> str:
+    import io
+    import pytesseract
+    from PIL import Image
+
+    # render only this page, no need to rasterize the whole document
+    pixmap = page.get_pixmap(dpi=OCR_DPI)
+    image = Image.open(io.BytesIO(pixmap.tobytes("png")))
+    return pytesseract.image_to_string(image).strip()
+
+
+async def extract_pdf_pages(
+    path: str, pages: Sequence[int] | None = None
+) -> AsyncIterator[tuple[int, str]]:
+    """
+    Yield (page number, text) as pages become ready, cached pages first,
+    the rest extracted in parallel in worker processes.
+    """
+    file_hash = await asyncio.to_thread(file_checksum, path)
+    if pages is None:
+        pages = range(await asyncio.to_thread(pdf_page_count, path))
+
+    cache = PageCache.get()
+    cached = await asyncio.to_thread(cache.get_pages, file_hash)
+    for page in pages:
+        if page in cached:
+            yield page, cached[page]
+
+    missing = [page for page in pages if page not in cached]
+    if not missing:
+        return
+
+    executor = _get_executor()
+
+    async def extract(page: int) -> tuple[int, str | None]:
+        try:
+            return page, await asyncio.wrap_future(executor.submit(extract_pdf_page, path, page))
+        except Exception as e:
+            PrintStyle.error(f"Error extracting page {page + 1} of {path}: {e}")
+            return page, None
+
+    tasks = [asyncio.ensure_future(extract(page)) for page in missing]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            page, text = await next_done
+            if text is None:
+                continue  # failed pages are not cached, next run tries again
+            await asyncio.to_thread(cache.put_page, file_hash, page, text)
+            yield page, text
+        await asyncio.to_thread(cache.evict)
+    finally:
+        for task in tasks:
+            task.cancel()  # consumer stopped early, drop queued pages
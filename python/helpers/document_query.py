@@ -10,26 +10,28 @@ os.environ["USER_AGENT"] = "@mixedbread-ai/unstructured"  # noqa E402
 from langchain_unstructured import UnstructuredLoader  # noqa E402
 
 from urllib.parse import urlparse
-from typing import Callable, Sequence, List, Optional, Tuple
+from typing import AsyncIterator, Callable, Sequence, List, Optional, Tuple
 from datetime import datetime
 
 from langchain_community.document_loaders import AsyncHtmlLoader
 from langchain_community.document_loaders.text import TextLoader
-from langchain_community.document_loaders.pdf import PyMuPDFLoader
 from langchain_community.document_transformers import MarkdownifyTransformer
-from langchain_community.document_loaders.parsers.images import TesseractBlobParser
 
 from langchain_core.documents import Document
 from langchain.schema import SystemMessage, HumanMessage
 
 from python.helpers.print_style import PrintStyle
-from python.helpers import files, errors
+from python.helpers import files, errors, document_extraction, tokens
+from python.helpers.dirty_json import DirtyJson
 from agent import Agent
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 
 DEFAULT_SEARCH_THRESHOLD = 0.5
+QA_CONTEXT_RATIO = 0.5  # share of the chat model context used for document chunks
+QA_CONTEXT_TOKENS = 30000  # chunk budget when the context length is not configured
+QA_PARTIAL_INTERVAL = 30  # seconds of indexing between progress updates (or preliminary answers, if asked for)
 
 
 class DocumentQueryStore:
@@ -62,6 +64,8 @@ class DocumentQueryStore:
         """Initialize a DocumentQueryStore instance."""
         self.agent = agent
         self.vector_db: VectorDB | None = None
+        # documents indexed completely, chunks of others may be a partial extraction
+        self.complete: set[str] = set()
 
     @staticmethod
     def normalize_uri(uri: str) -> str:
@@ -146,6 +150,7 @@ class DocumentQueryStore:
                 self.vector_db = self.init_vector_db()
 
             ids = await self.vector_db.insert_documents(docs)
+            self.complete.add(document_uri)
             PrintStyle.standard(
                 f"Added document '{document_uri}' with {len(docs)} chunks"
             )
@@ -155,6 +160,62 @@ class DocumentQueryStore:
             PrintStyle.error(f"Error adding document '{document_uri}': {err_text}")
             return False, []
 
+    async def add_document_pages(
+        self,
+        pages: AsyncIterator[tuple[int, str]],
+        document_uri: str,
+        metadata: dict | None = None,
+    ) -> tuple[bool, list[str]]:
+        """
+        Add a document page by page, each page is chunked and embedded as soon as it arrives,
+        so the document can be searched before all pages are extracted.
+
+        Args:
+            pages: (page number, text) in any order
+            document_uri: The URI that uniquely identifies this document
+            metadata: Optional metadata for the document
+
+        Returns:
+            True if successful, False otherwise, and the inserted ids
+        """
+        document_uri = self.normalize_uri(document_uri)
+        await self.delete_document(document_uri)
+
+        doc_metadata = metadata or {}
+        doc_metadata["document_uri"] = document_uri
+        doc_metadata["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.DEFAULT_CHUNK_SIZE, chunk_overlap=self.DEFAULT_CHUNK_OVERLAP
+        )
+        if not self.vector_db:
+            self.vector_db = self.init_vector_db()
+
+        ids: list[str] = []
+        try:
+            async for page, text in pages:
+                docs = [
+                    Document(
+                        page_content=chunk,
+                        metadata={**doc_metadata, "page": page, "chunk_index": i},
+                    )
+                    for i, chunk in enumerate(text_splitter.split_text(text))
+                ]
+                if docs:
+                    ids += await self.vector_db.insert_documents(docs)
+        except Exception as e:
+            err_text = errors.format_error(e)
+            PrintStyle.error(f"Error adding document '{document_uri}': {err_text}")
+            await self.delete_document(document_uri)  # no truncated document left behind
+            return False, []
+
+        if not ids:
+            PrintStyle.error(f"No chunks created for document: {document_uri}")
+            return False, []
+        self.complete.add(document_uri)
+        PrintStyle.standard(f"Added document '{document_uri}' with {len(ids)} chunks")
+        return True, ids
+
     async def get_document(self, document_uri: str) -> Optional[Document]:
         """
         Retrieve a document by its URI.
@@ -180,13 +241,16 @@ class DocumentQueryStore:
             return None
 
         # Combine chunks into a single document
-        chunks = sorted(docs, key=lambda x: x.metadata.get("chunk_index", 0))
+        chunks = sorted(
+            docs, key=lambda x: (x.metadata.get("page", 0), x.metadata.get("chunk_index", 0))
+        )
         full_content = "\n".join(chunk.page_content for chunk in chunks)
 
         # Use metadata from first chunk
         metadata = chunks[0].metadata.copy()
         metadata.pop("chunk_index", None)
         metadata.pop("total_chunks", None)
+        metadata.pop("page", None)
 
         return Document(page_content=full_content, metadata=metadata)
 
@@ -211,7 +275,7 @@ class DocumentQueryStore:
         # get docs from vector db
 
         chunks = await self.vector_db.search_by_metadata(
-            filter=f"document_uri == '{document_uri}'",
+            filter=f"document_uri == {document_uri!r}",
         )
 
         PrintStyle.standard(f"Found {len(chunks)} chunks for document: {document_uri}")
@@ -219,7 +283,7 @@ class DocumentQueryStore:
 
     async def document_exists(self, document_uri: str) -> bool:
         """
-        Check if a document exists in the store.
+        Check if a document exists in the store, completely indexed.
 
         Args:
             document_uri: The URI of the document to check
@@ -234,9 +298,13 @@ class DocumentQueryStore:
 
         # Normalize the URI
         document_uri = self.normalize_uri(document_uri)
+        return document_uri in self.complete
 
-        chunks = await self._get_document_chunks(document_uri)
-        return len(chunks) > 0
+    def chunk_count(self) -> int:
+        """Number of chunks in the store, grows while documents are indexed."""
+        if not self.vector_db:
+            return 0
+        return len(self.vector_db.db.get_all_docs())
 
     async def delete_document(self, document_uri: str) -> bool:
         """
@@ -255,9 +323,10 @@ class DocumentQueryStore:
 
         # Normalize the URI
         document_uri = self.normalize_uri(document_uri)
+        self.complete.discard(document_uri)
 
         chunks = await self.vector_db.search_by_metadata(
-            filter=f"document_uri == '{document_uri}'",
+            filter=f"document_uri == {document_uri!r}",
         )
         if not chunks:
             return False
@@ -326,9 +395,45 @@ class DocumentQueryStore:
             List of matching document chunks
         """
         return await self.search_documents(
-            query, limit, threshold, f"document_uri == '{document_uri}'"
+            query, limit, threshold, f"document_uri == {document_uri!r}"
         )
 
+    async def search_documents_many(
+        self,
+        queries: Sequence[str],
+        document_uris: Sequence[str],
+        limit: int = 10,
+        threshold: float = 0.5,
+    ) -> List[List[Document]]:
+        """
+        Search several documents for several queries at once,
+        the queries are embedded in one batch and searched in one call.
+
+        Args:
+            queries: The search query strings
+            document_uris: The URIs of the documents to search within
+            limit: Maximum number of results per query
+            threshold: Minimum similarity score threshold (0-1)
+
+        Returns:
+            List of matching document chunks per query
+        """
+        if not self.vector_db or not queries or not document_uris:
+            return [[] for _ in queries]
+
+        filter = " or ".join(f"document_uri == {uri!r}" for uri in document_uris)
+        try:
+            results = await self.vector_db.search_by_similarity_threshold_many(
+                queries=list(queries), limit=limit, threshold=threshold, filter=filter
+            )
+            PrintStyle.standard(
+                f"Search of {len(queries)} queries returned {sum(len(r) for r in results)} results"
+            )
+            return results
+        except Exception as e:
+            PrintStyle.error(f"Error searching documents: {str(e)}")
+            return [[] for _ in queries]
+
     async def list_documents(self) -> List[str]:
         """
         Get a list of all document URIs in the store.
@@ -361,44 +466,67 @@ class DocumentQueryHelper:
         self.progress_callback = progress_callback or (lambda x: None)
 
     async def document_qa(
-        self, document_uri: str, questions: Sequence[str]
+        self,
+        document_uri: str | Sequence[str],
+        questions: Sequence[str],
+        preliminary: bool = False,
     ) -> Tuple[bool, str]:
+        """
+        Answer questions from documents. With preliminary=True, long documents also get
+        answers from the chunks indexed so far while indexing goes on, each one is a full
+        chat model call, otherwise only indexing progress is reported.
+        """
         self.progress_callback(f"Starting Q&A process")
+        document_uris = [document_uri] if isinstance(document_uri, str) else list(document_uri)
 
-        # index document
-        _ = await self.document_get_content(document_uri, True)
-        selected_chunks = {}
-        for question in questions:
-            self.progress_callback(f"Optimizing query: {question}")
-            human_content = f'Search Query: "{question}"'
-            system_content = self.agent.parse_prompt(
-                "fw.document_query.optmimize_query.md"
-            )
-
-            optimized_query = (
-                await self.agent.call_utility_model(
-                    system=system_content, message=human_content
-                )
-            ).strip()
-
-            self.progress_callback(f"Searching document with query: {optimized_query}")
-
-            normalized_uri = self.store.normalize_uri(document_uri)
-            chunks = await self.store.search_document(
-                document_uri=normalized_uri,
-                query=optimized_query,
-                limit=100,
-                threshold=DEFAULT_SEARCH_THRESHOLD,
+        # index documents and optimize queries at the same time
+        indexing = asyncio.ensure_future(
+            asyncio.gather(
+                *[self.document_get_content(uri, True) for uri in document_uris]
             )
+        )
+        try:
+            queries = await self.optimize_queries(questions)
+
+            # long documents: progress, or preliminary answers from the pages indexed so far
+            answered = 0
+            while not indexing.done():
+                await asyncio.wait({indexing}, timeout=QA_PARTIAL_INTERVAL)
+                chunks = self.store.chunk_count()
+                if not indexing.done() and chunks > answered:
+                    answered = chunks
+                    if not preliminary:
+                        self.progress_callback(f"Indexing documents, {chunks} chunks indexed so far")
+                        continue
+                    found, answer = await self.answer(document_uris, questions, queries)
+                    if found:
+                        self.progress_callback(
+                            f"Preliminary answer from {chunks} chunks indexed so far:\n{answer}"
+                        )
+            await indexing
+        finally:
+            indexing.cancel()
 
-            self.progress_callback(f"Found {len(chunks)} chunks")
+        found, answer = await self.answer(document_uris, questions, queries)
+        if found:
+            self.progress_callback(f"Q&A process completed")
+        return found, answer
 
-            for chunk in chunks:
-                selected_chunks[chunk.metadata["id"]] = chunk
+    async def answer(
+        self, document_uris: Sequence[str], questions: Sequence[str], queries: Sequence[str]
+    ) -> Tuple[bool, str]:
+        self.progress_callback(f"Searching documents with queries: {json.dumps(queries)}")
+        results = await self.store.search_documents_many(
+            queries=list(queries),
+            document_uris=[self.store.normalize_uri(uri) for uri in document_uris],
+            limit=100,
+            threshold=DEFAULT_SEARCH_THRESHOLD,
+        )
+        selected_chunks = self.select_chunks(results, self.get_context_budget())
 
         if not selected_chunks:
             self.progress_callback(f"No relevant content found in the document")
-            content = f"!!! No content found for document: {document_uri} matching queries: {json.dumps(questions)}"
+            content = f"!!! No content found for document: {', '.join(document_uris)} matching queries: {json.dumps(questions)}"
             return False, content
 
         self.progress_callback(
@@ -406,9 +534,7 @@ class DocumentQueryHelper:
         )
 
         questions_str = "\n".join([f" *  {question}" for question in questions])
-        content = "\n\n----\n\n".join(
-            [chunk.page_content for chunk in selected_chunks.values()]
-        )
+        content = "\n\n----\n\n".join([chunk.page_content for chunk in selected_chunks])
 
         qa_system_message = self.agent.parse_prompt(
             "fw.document_query.system_prompt.md"
@@ -421,10 +547,75 @@ class DocumentQueryHelper:
                 HumanMessage(content=qa_user_message),
             ]
         )
+        return True, str(ai_response)
 
-        self.progress_callback(f"Q&A process completed")
+    async def optimize_queries(self, questions: Sequence[str]) -> list[str]:
+        if len(questions) == 1:
+            return [await self.optimize_query(questions[0])]
 
-        return True, str(ai_response)
+        # one utility call for all questions
+        self.progress_callback(f"Optimizing {len(questions)} queries")
+        system_content = self.agent.parse_prompt("fw.document_query.optimize_queries.md")
+        response = await self.agent.call_utility_model(
+            system=system_content, message=json.dumps(list(questions))
+        )
+        try:
+            queries = DirtyJson.parse_string(response.strip())
+        except Exception:
+            queries = None
+        if (
+            isinstance(queries, list)
+            and len(queries) == len(questions)
+            and all(isinstance(q, str) and q.strip() for q in queries)
+        ):
+            return [q.strip() for q in queries]
+
+        # malformed answer, optimize each question on its own, concurrently
+        return list(await asyncio.gather(*[self.optimize_query(q) for q in questions]))
+
+    async def optimize_query(self, question: str) -> str:
+        self.progress_callback(f"Optimizing query: {question}")
+        human_content = f'Search Query: "{question}"'
+        system_content = self.agent.parse_prompt("fw.document_query.optmimize_query.md")
+        return (
+            await self.agent.call_utility_model(
+                system=system_content, message=human_content
+            )
+        ).strip()
+
+    def get_context_budget(self) -> int:
+        ctx_length = self.agent.config.chat_model.ctx_length
+        if ctx_length > 0:
+            return int(ctx_length * QA_CONTEXT_RATIO)
+        return QA_CONTEXT_TOKENS
+
+    def select_chunks(
+        self, results: Sequence[Sequence[Document]], budget: int
+    ) -> list[Document]:
+        # take the best remaining chunk of each query in turn, so every question gets context,
+        # skip duplicates and stop when the token budget is used up
+        selected: dict[str, Document] = {}
+        used = 0
+        for rank in range(max((len(r) for r in results), default=0)):
+            for chunks in results:
+                if rank >= len(chunks) or chunks[rank].metadata["id"] in selected:
+                    continue
+                chunk = chunks[rank]
+                size = tokens.approximate_tokens(chunk.page_content)
+                if used + size > budget:
+                    continue
+                selected[chunk.metadata["id"]] = chunk
+                used += size
+        self.progress_callback(f"Found {len(selected)} chunks, {used} tokens")
+        # document order reads better than relevance order
+        return sorted(
+            selected.values(),
+            key=lambda c: (
+                c.metadata.get("document_uri", ""),
+                c.metadata.get("page", 0),
+                c.metadata.get("chunk_index", 0),
+            ),
+        )
 
     async def document_get_content(
         self, document_uri: str, add_to_db: bool = False
@@ -494,15 +685,18 @@ class DocumentQueryHelper:
 
         exists = await self.store.document_exists(document_uri_norm)
         document_content = ""
-        if not exists:
+        if not exists and mimetype == "application/pdf":
+            # pages are extracted in parallel and indexed as soon as they are ready
+            document_content = await self.handle_pdf_document(
+                document_uri, scheme, document_uri_norm if add_to_db else ""
+            )
+        elif not exists:
             if mimetype.startswith("image/"):
                 document_content = self.handle_image_document(document_uri, scheme)
             elif mimetype == "text/html":
                 document_content = self.handle_html_document(document_uri, scheme)
             elif mimetype.startswith("text/") or mimetype == "application/json":
                 document_content = self.handle_text_document(document_uri, scheme)
-            elif mimetype == "application/pdf":
-                document_content = self.handle_pdf_document(document_uri, scheme)
             else:
                 document_content = self.handle_unstructured_document(
                     document_uri, scheme
@@ -568,73 +762,59 @@ class DocumentQueryHelper:
 
         return "\n".join([element.page_content for element in elements])
 
-    def handle_pdf_document(self, document: str, scheme: str) -> str:
+    async def handle_pdf_document(
+        self, document: str, scheme: str, index_uri: str = ""
+    ) -> str:
         temp_file_path = ""
         if scheme == "file":
-            # Use RFC file operations to read the PDF file as binary
-            file_content_bytes = files.read_file_bin(document)
-            # Create a temporary file for PyMuPDFLoader since it needs a file path
-            import tempfile
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                temp_file.write(file_content_bytes)
-                temp_file_path = temp_file.name
+            # extraction workers read the file directly, no temporary copy
+            file_path = files.get_abs_path(document)
         elif scheme in ["http", "https"]:
             # download the file from the web url to a temporary file using python libraries for downloading
             import requests
             import tempfile
 
             with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                response = requests.get(document, timeout=10.0)
+                response = await asyncio.to_thread(requests.get, document, timeout=10.0)
                 if response.status_code != 200:
                     raise ValueError(
                         f"DocumentQueryHelper::handle_pdf_document: Failed to download PDF from {document}: {response.status_code}"
                     )
                 temp_file.write(response.content)
-                temp_file_path = temp_file.name
+                temp_file_path = file_path = temp_file.name
         else:
             raise ValueError(f"Unsupported scheme: {scheme}")
 
-        if not os.path.exists(temp_file_path):
+        if not os.path.exists(file_path):
             raise ValueError(
-                f"DocumentQueryHelper::handle_pdf_document: Temporary file not found: {temp_file_path}"
+                f"DocumentQueryHelper::handle_pdf_document: File not found: {file_path}"
             )
 
-        try:
-            try:
-                loader = PyMuPDFLoader(
-                    temp_file_path,
-                    mode="single",
-                    extract_tables="markdown",
-                    extract_images=True,
-                    images_inner_format="text",
-                    images_parser=TesseractBlobParser(),
-                    pages_delimiter="\n",
-                )
-                elements: list[Document] = loader.load()
-                contents = "\n".join([element.page_content for element in elements])
-            except Exception as e:
-                PrintStyle.error(
-                    f"DocumentQueryHelper::handle_pdf_document: Error loading with PyMuPDF: {e}"
-                )
-                contents = ""
-
-            if not contents:
-                import pdf2image
-                import pytesseract
-
-                PrintStyle.debug(
-                    f"DocumentQueryHelper::handle_pdf_document: FALLBACK Converting PDF to images: {temp_file_path}"
-                )
+        contents: dict[int, str] = {}
 
-                # Convert PDF to images
-                pages = pdf2image.convert_from_path(temp_file_path)  # type: ignore
-                for page in pages:
-                    contents += pytesseract.image_to_string(page) + "\n\n"
+        async def pages():
+            async for page, text in document_extraction.extract_pdf_pages(file_path):
+                contents[page] = text
+                self.progress_callback(f"Extracted {len(contents)} pages")
+                yield page, text
 
-            return contents
+        try:
+            if index_uri:
+                self.progress_callback(f"Indexing document")
+                success, ids = await self.store.add_document_pages(pages(), index_uri)
+                if not success:
+                    self.progress_callback(f"Failed to index document")
+                    raise ValueError(
+                        f"DocumentQueryHelper::document_get_content: Failed to index document: {index_uri}"
+                    )
+                self.progress_callback(f"Indexed {len(ids)} chunks")
+            else:
+                async for _ in pages():
+                    pass
+            return "\n".join(contents[page] for page in sorted(contents))
         finally:
-            os.unlink(temp_file_path)
+            if temp_file_path:
+                os.unlink(temp_file_path)
 
     def handle_unstructured_document(self, document: str, scheme: str) -> str:
         elements: list[Document] = []
@@ -0,0 +1,266 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from python.helpers import files
+from python.helpers.print_style import PrintStyle
+
+# shared by memory, knowledge import, document query and consolidation
+CACHE_DIR = "memory/embeddings"
+CACHE_FILE = "cache.db"
+REGISTRY_FILE = "models.json"  # embedder metadata, e.g. dimensions per model id
+MAX_ENTRIES = 500_000  # LRU cap, oldest entries are evicted above this
+QUERY_NAMESPACE = "#query"  # suffix of the model id query vectors are cached under
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache in a single sqlite file.
+    Vectors are keyed by (model id, content hash) and stored as float32 blobs.
+    """
+
+    _instance: "EmbeddingCache | None" = None
+    _instance_lock = threading.Lock()
+
+    @staticmethod
+    def get() -> "EmbeddingCache":
+        with EmbeddingCache._instance_lock:
+            if EmbeddingCache._instance is None:
+                EmbeddingCache._instance = EmbeddingCache(
+                    files.get_abs_path(CACHE_DIR, CACHE_FILE)
+                )
+            return EmbeddingCache._instance
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, hash)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+        # upper bound of stored entries, recounted only when the cap is reached
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> dict[str, np.ndarray]:
+        if not hashes:
+            return {}
+        unique = list(dict.fromkeys(hashes))
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            # sqlite limits bound parameters, query in slices
+            for i in range(0, len(unique), 500):
+                part = unique[i : i + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({marks})",
+                    (model, *part),
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND hash = ?",
+                    [(now, model, h) for h in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, model: str, hashes: Sequence[str], vectors: Sequence[Sequence[float]]):
+        if not hashes:
+            return
+        now = time.time()
+        rows = [
+            (model, h, np.asarray(v, dtype=np.float32).tobytes(), now)
+            for h, v in zip(hashes, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._size += len(rows)
+            if self._size > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def compact(self, max_entries: int | None = None) -> int:
+        """Evict least recently used entries above the cap and reclaim file space."""
+        with self._lock:
+            removed = self._evict(max_entries)
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return removed
+
+    def _evict(self, max_entries: int | None = None) -> int:
+        cap = self.max_entries if max_entries is None else max_entries
+        total = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = total - cap
+        self._size = total
+        if excess <= 0:
+            return 0
+        self._conn.execute(
+            """
+            DELETE FROM embeddings WHERE (model, hash) IN (
+                SELECT model, hash FROM embeddings ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (excess,),
+        )
+        self._size = cap
+        return excess
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves vectors from the shared EmbeddingCache
+    and sends only the missing texts to the underlying model in one batch.
+    Queries go through the model's own embed_query, asymmetric models embed them
+    differently from documents, and are cached under a separate model id.
+    """
+
+    def __init__(self, model: Embeddings, model_id: str, cache: EmbeddingCache | None = None):
+        self.model = model
+        self.model_id = model_id
+        self.query_model_id = model_id + QUERY_NAMESPACE
+        self.cache = cache or EmbeddingCache.get()
+        # expose model name for callers that namespace by it
+        self.model_name = getattr(model, "model_name", model_id)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [content_hash(t) for t in texts]
+        found = self.cache.get_many(self.model_id, hashes)
+
+        missing: dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in found and h not in missing:
+                missing[h] = t
+
+        if missing:
+            vectors = self.model.embed_documents(list(missing.values()))
+            self.cache.put_many(self.model_id, list(missing.keys()), vectors)
+            for h, v in zip(missing.keys(), vectors):
+                found[h] = np.asarray(v, dtype=np.float32)
+
+        return [found[h].tolist() for h in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        h = content_hash(text)
+        found = self.cache.get_many(self.query_model_id, [h])
+        if h in found:
+            return found[h].tolist()
+        vector = self.model.embed_query(text)
+        self.cache.put_many(self.query_model_id, [h], [vector])
+        return np.asarray(vector, dtype=np.float32).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_queries([text]))[0]
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Several queries at once, the missing ones embedded concurrently"""
+        hashes = [content_hash(t) for t in texts]
+        found = self.cache.get_many(self.query_model_id, hashes)
+
+        missing: dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in found and h not in missing:
+                missing[h] = t
+
+        if missing:
+            vectors = await asyncio.gather(*(self.model.aembed_query(t) for t in missing.values()))
+            self.cache.put_many(self.query_model_id, list(missing.keys()), vectors)
+            for h, v in zip(missing.keys(), vectors):
+                found[h] = np.asarray(v, dtype=np.float32)
+
+        return [found[h].tolist() for h in hashes]
+
+
+def get_model_id(provider: str, name: str) -> str:
+    return files.safe_file_name(provider + "_" + name)
+
+
+_registry: dict[str, dict] | None = None
+_registry_lock = threading.Lock()
+
+
+def _load_registry() -> dict[str, dict]:
+    global _registry
+    if _registry is None:
+        path = files.get_abs_path(CACHE_DIR, REGISTRY_FILE)
+        try:
+            with open(path, "r") as f:
+                _registry = json.load(f)
+        except (OSError, ValueError):
+            _registry = {}
+    return _registry  # type: ignore
+
+
+def set_dimensions(model_id: str, dimensions: int):
+    with _registry_lock:
+        registry = _load_registry()
+        if registry.get(model_id, {}).get("dimensions") == dimensions:
+            return
+        registry.setdefault(model_id, {})["dimensions"] = dimensions
+        files.write_file(
+            files.get_abs_path(CACHE_DIR, REGISTRY_FILE), json.dumps(registry)
+        )
+
+
+def get_dimensions(model_id: str, embeddings: Embeddings) -> int:
+    """Embedding dimensions of a model, probed only once per model id and then persisted."""
+    with _registry_lock:
+        dims = _load_registry().get(model_id, {}).get("dimensions")
+    if dims:
+        return int(dims)
+    dims = len(embeddings.embed_query("example"))
+    set_dimensions(model_id, dims)
+    return dims
+
+
+def compact(max_entries: int | None = None) -> int:
+    cache = EmbeddingCache.get()
+    removed = cache.compact(max_entries)
+    PrintStyle.standard(
+        f"Embedding cache compacted, removed {removed} entries, {cache.count()} remaining."
+    )
+    return removed
+
+
+if __name__ == "__main__":
+    # usage: python -m python.helpers.embedding_cache [max_entries]
+    import sys
+
+    compact(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -1,9 +1,14 @@
+import asyncio
+import atexit
+import contextlib
+import json
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from python.helpers.print_style import PrintStyle
 
 try:
     from fasta2a.client import A2AClient  # type: ignore
+    from fasta2a.schema import stream_message_request_ta  # type: ignore
     import httpx  # type: ignore
     FASTA2A_CLIENT_AVAILABLE = True
 except ImportError:
@@ -12,16 +17,26 @@ except ImportError:
 
 _PRINTER = PrintStyle(italic=True, font_color="cyan", padding=False)
 
+FINISHED_STATES = ("completed", "failed", "canceled", "rejected")
+STREAM_READ_TIMEOUT = 60  # seconds without an event (servers send keepalives) before a stream is dropped
+POLL_MIN_INTERVAL = 0.25  # first pause when polling, doubled up to poll_interval
+CLOSE_TIMEOUT = 5  # seconds to close the pooled clients of another event loop on shutdown
+
+# shared http clients per (event loop, agent url, token), keep-alive connections are reused across calls
+_pool: dict[tuple[int, str, str], tuple[asyncio.AbstractEventLoop, Any]] = {}
+_agent_cards: dict[str, Dict[str, Any]] = {}
+
 
 class AgentConnection:
     """Helper class for connecting to and communicating with other Agent Zero instances via FastA2A."""
 
-    def __init__(self, agent_url: str, timeout: int = 30, token: Optional[str] = None):
+    def __init__(self, agent_url: str, timeout: int = 30, token: Optional[str] = None, http_client: Any = None):
         """Initialize connection to an agent.
 
         Args:
             agent_url: The base URL of the agent (e.g., "https://agent.example.com")
             timeout: Request timeout in seconds
+            http_client: Shared httpx.AsyncClient, left open on close (see get_connection)
         """
         if not FASTA2A_CLIENT_AVAILABLE:
             raise RuntimeError("FastA2A client not available")
@@ -40,9 +55,10 @@ class AgentConnection:
         if token:
             headers["Authorization"] = f"Bearer {token}"
             headers["X-API-KEY"] = token
-        self._http_client = httpx.AsyncClient(timeout=timeout, headers=headers)  # type: ignore
+        self._owns_client = http_client is None
+        self._http_client = http_client or httpx.AsyncClient(timeout=timeout, headers=headers)  # type: ignore
         self._a2a_client = A2AClient(base_url=self.agent_url, http_client=self._http_client)  # type: ignore
-        self._agent_card: Optional[Dict[str, Any]] = None
+        self._agent_card: Optional[Dict[str, Any]] = _agent_cards.get(self.agent_url) if http_client else None
         # Track conversation context automatically
         self._context_id: Optional[str] = None
 
@@ -52,7 +68,7 @@ class AgentConnection:
             try:
                 response = await self._http_client.get(f"{self.agent_url}/.well-known/agent.json")
                 response.raise_for_status()
-                self._agent_card = response.json()
+                self._agent_card = _agent_cards[self.agent_url] = response.json()
                 _PRINTER.print(f"Retrieved agent card from {self.agent_url}")
                 _PRINTER.print(f"Agent: {self._agent_card.get('name', 'Unknown')}") # type: ignore
                 _PRINTER.print(f"Description: {self._agent_card.get('description', 'No description')}") # type: ignore
@@ -83,28 +99,7 @@ class AgentConnection:
         if not self._agent_card:
             await self.get_agent_card()
 
-        # Re-use context automatically if caller did not supply one
-        if context_id is None:
-            context_id = self._context_id
-
-        # Build message parts
-        parts = [{'kind': 'text', 'text': message}]
-
-        if attachments:
-            for attachment in attachments:
-                file_part = {'kind': 'file', 'file': {'uri': attachment}}
-                parts.append(file_part)  # type: ignore
-
-        # Construct A2A message
-        a2a_message = {
-            'role': 'user',
-            'parts': parts,
-            'kind': 'message',
-            'message_id': str(uuid.uuid4())
-        }
-
-        if context_id is not None:
-            a2a_message['context_id'] = context_id
+        a2a_message = self._build_message(message, attachments, context_id)
 
         # Send using the message/send method (not send_task)
         try:
@@ -142,42 +137,167 @@ class AgentConnection:
             _PRINTER.print(f"Failed to get task {task_id}: {e}")
             raise RuntimeError(f"Failed to get task: {e}")
 
-    async def wait_for_completion(self, task_id: str, poll_interval: int = 2, max_wait: int = 300) -> Dict[str, Any]:
+    async def send_and_wait(
+        self,
+        message: str,
+        attachments: Optional[List[str]] = None,
+        context_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        max_wait: int = 300,
+    ) -> Dict[str, Any]:
+        """Send a message and wait for the task to finish, return the final task (as get_task).
+
+        Uses message/stream when the agent card announces streaming, so the result arrives
+        as soon as the task finishes; otherwise sends the message and waits for completion.
+        max_wait bounds the whole call, a fallback to waiting only gets the time left.
+        """
+        deadline = asyncio.get_running_loop().time() + max_wait
+
+        def remaining() -> float:
+            return max(0.0, deadline - asyncio.get_running_loop().time())
+
+        if not await self._supports_streaming():
+            response = await self.send_message(message, attachments=attachments, context_id=context_id, metadata=metadata)
+            return await self.wait_for_completion(response["result"]["id"], max_wait=remaining())  # type: ignore[index]
+
+        params: Dict[str, Any] = {"message": self._build_message(message, attachments, context_id)}
+        if metadata is not None:
+            params["metadata"] = metadata
+        payload: Any = {"jsonrpc": "2.0", "id": str(uuid.uuid4()), "method": "message/stream", "params": params}
+        content = stream_message_request_ta.dump_json(payload, by_alias=True)  # type: ignore
+        task_id = None
+
+        async def stream() -> Dict[str, Any]:
+            nonlocal task_id
+            async for result in self._stream_events(content):
+                if result.get("kind") == "task":
+                    task_id = result["id"]
+                    if isinstance(result.get("contextId"), str):
+                        self._context_id = result["contextId"]
+                if task_id and _is_final(result):
+                    return await self.get_task(task_id)
+            raise RuntimeError("event stream ended before the task finished")
+
+        try:
+            return await asyncio.wait_for(stream(), remaining())
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Task {task_id} did not complete within {max_wait} seconds")
+        except Exception as e:
+            if task_id is None:
+                raise
+            _PRINTER.print(f"[A2A] Event stream for task {task_id} interrupted: {e}")
+            try:
+                return await self.wait_for_completion(task_id, max_wait=remaining())
+            except TimeoutError:
+                raise TimeoutError(f"Task {task_id} did not complete within {max_wait} seconds")
+
+    async def wait_for_completion(self, task_id: str, poll_interval: int = 2, max_wait: float = 300) -> Dict[str, Any]:
         """Wait for a task to complete and return the final result.
 
+        Subscribes to the task (tasks/resubscribe) when the agent supports streaming, and
+        falls back to polling with a pause doubling from POLL_MIN_INTERVAL to poll_interval.
+
         Args:
             task_id: The ID of the task to wait for
-            poll_interval: How often to check task status (seconds)
+            poll_interval: Longest pause between status checks when polling (seconds)
             max_wait: Maximum time to wait (seconds)
 
         Returns:
             Dictionary containing the completed task information
         """
-        import asyncio
 
-        waited = 0
-        while waited < max_wait:
-            task_info = await self.get_task(task_id)
+        async def wait() -> Dict[str, Any]:
+            if await self._supports_streaming():
+                payload = {"jsonrpc": "2.0", "id": str(uuid.uuid4()), "method": "tasks/resubscribe", "params": {"id": task_id}}
+                try:
+                    async for result in self._stream_events(json.dumps(payload).encode()):
+                        if _is_final(result):
+                            return await self.get_task(task_id)
+                except Exception as e:
+                    _PRINTER.print(f"[A2A] Event stream for task {task_id} unavailable, polling: {e}")
+            return await self._poll(task_id, poll_interval)
 
-            if 'result' in task_info:
-                task = task_info['result']
-                status = task.get('status', {})
-                state = status.get('state', 'unknown')
+        try:
+            return await asyncio.wait_for(wait(), max_wait)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Task {task_id} did not complete within {max_wait} seconds")
 
-                if state in ['completed', 'failed', 'canceled']:
+    async def wait_for_tasks(self, task_ids: List[str], max_wait: int = 300) -> List[Dict[str, Any]]:
+        """Wait for several tasks of this agent at once, results in the order of task_ids."""
+        return await asyncio.gather(*(self.wait_for_completion(task_id, max_wait=max_wait) for task_id in task_ids))
+
+    async def _poll(self, task_id: str, poll_interval: float) -> Dict[str, Any]:
+        delay = POLL_MIN_INTERVAL
+        while True:
+            task_info = await self.get_task(task_id)
+            if 'result' in task_info:
+                state = task_info['result'].get('status', {}).get('state', 'unknown')  # type: ignore[union-attr]
+                if state in FINISHED_STATES:
                     _PRINTER.print(f"Task {task_id} finished with state: {state}")
-                    return task_info
-                else:
-                    _PRINTER.print(f"Task {task_id} status: {state}")
+                    return task_info  # type: ignore
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max(poll_interval, POLL_MIN_INTERVAL))
+
+    async def _stream_events(self, content: bytes) -> AsyncIterator[Dict[str, Any]]:
+        """POST a streaming JSON-RPC request and yield the result of each server-sent event."""
+        async with self._http_client.stream(
+            "POST",
+            "/",
+            content=content,
+            headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
+            timeout=httpx.Timeout(self.timeout, read=STREAM_READ_TIMEOUT),  # type: ignore
+        ) as response:
+            if response.status_code >= 400:
+                raise RuntimeError(f"HTTP {response.status_code}")
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                body = json.loads(await response.aread())
+                raise RuntimeError(body.get("error", {}).get("message", "no event stream"))
+            data: List[str] = []
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif not line and data:
+                    event = json.loads("\n".join(data))
+                    data = []
+                    if "error" in event:
+                        raise RuntimeError(event["error"].get("message", "error event"))
+                    yield event.get("result", {})
+
+    async def _supports_streaming(self) -> bool:
+        card = await self.get_agent_card()
+        return bool(card.get("capabilities", {}).get("streaming"))
+
+    def _build_message(
+        self, message: str, attachments: Optional[List[str]], context_id: Optional[str]
+    ) -> Dict[str, Any]:
+        # Re-use context automatically if caller did not supply one
+        if context_id is None:
+            context_id = self._context_id
+
+        # Build message parts
+        parts = [{'kind': 'text', 'text': message}]
 
-            await asyncio.sleep(poll_interval)
-            waited += poll_interval
+        if attachments:
+            for attachment in attachments:
+                file_part = {'kind': 'file', 'file': {'uri': attachment}}
+                parts.append(file_part)  # type: ignore
+
+        # Construct A2A message
+        a2a_message = {
+            'role': 'user',
+            'parts': parts,
+            'kind': 'message',
+            'message_id': str(uuid.uuid4())
+        }
 
-        raise TimeoutError(f"Task {task_id} did not complete within {max_wait} seconds")
+        if context_id is not None:
+            a2a_message['context_id'] = context_id
+        return a2a_message
 
     async def close(self):
-        """Close the HTTP client connection."""
-        await self._http_client.aclose()
+        """Close the HTTP client connection, shared pooled clients stay open."""
+        if self._owns_client:
+            await self._http_client.aclose()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -204,6 +324,65 @@ async def connect_to_agent(agent_url: str, timeout: int = 30) -> AgentConnection
     return connection
 
 
+async def get_connection(agent_url: str, timeout: int = 30, token: Optional[str] = None) -> AgentConnection:
+    """Connection to a remote agent over the pooled http client of this event loop.
+
+    Calls to the same agent reuse keep-alive connections and the cached agent card,
+    tasks are not tied to a connection, so many can be awaited at once.
+    """
+    if not FASTA2A_CLIENT_AVAILABLE:
+        raise RuntimeError("FastA2A client not available")
+    if token is None:
+        import os
+        token = os.getenv("A2A_TOKEN")
+    url = agent_url if agent_url.startswith(('http://', 'https://')) else 'http://' + agent_url
+    loop = asyncio.get_running_loop()
+    key = (id(loop), url.rstrip('/'), token or "")
+    for stale in [k for k, (l, _) in _pool.items() if l.is_closed()]:
+        await _aclose(_pool.pop(stale)[1])
+    entry = _pool.get(key)
+    if entry is None or entry[0] is not loop:
+        headers = {"Authorization": f"Bearer {token}", "X-API-KEY": token} if token else {}
+        entry = _pool[key] = (loop, httpx.AsyncClient(timeout=timeout, headers=headers))  # type: ignore
+    connection = AgentConnection(agent_url, timeout, token, http_client=entry[1])
+    await connection.get_agent_card()
+    return connection
+
+
+async def close_connections():
+    """Close all pooled http clients, each on its own event loop while that loop still runs."""
+    loop = asyncio.get_running_loop()
+    for key, (l, client) in list(_pool.items()):
+        _pool.pop(key, None)
+        if l is not loop and l.is_running():
+            future = asyncio.run_coroutine_threadsafe(_aclose(client), l)
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(asyncio.wrap_future(future), CLOSE_TIMEOUT)
+        else:
+            await _aclose(client)
+
+
+async def _aclose(client: Any):
+    # connections of a closed loop cannot be shut down cleanly, the client is released anyway
+    with contextlib.suppress(Exception):
+        await client.aclose()
+
+
+def _close_at_exit():
+    if not _pool:
+        return
+    with contextlib.suppress(Exception):
+        asyncio.run(close_connections())
+
+
+atexit.register(_close_at_exit)
+
+
+def _is_final(result: Dict[str, Any]) -> bool:
+    # status-update event with final set, or a task that already finished
+    return bool(result.get("final")) or result.get("status", {}).get("state") in FINISHED_STATES
+
+
 def is_client_available() -> bool:
     """Check if FastA2A client is available."""
     return FASTA2A_CLIENT_AVAILABLE
@@ -1,5 +1,6 @@
 # noqa: D401 (docstrings) – internal helper
 import asyncio
+import json
 import uuid
 import atexit
 from typing import Any, List
@@ -14,13 +15,26 @@ from python.helpers.print_style import PrintStyle
 from agent import AgentContext, UserMessage, AgentContextType
 from initialize import initialize_agent
 from python.helpers.persist_chat import remove_chat
+from python.helpers.a2a_task_store import A2ATaskStore
+
+A2A_WORKERS = 4  # tasks processed at once, each in its own warm context
+A2A_QUEUE_LIMIT = 64  # tasks waiting for a worker, further tasks are rejected
+PUSH_RETRIES = 3  # attempts to deliver a push notification
+PUSH_TIMEOUT = 10  # seconds per push notification attempt
+STREAM_KEEPALIVE = 15  # seconds between keepalive comments on an idle event stream
 
 # Import FastA2A
 try:
     from fasta2a import Worker, FastA2A  # type: ignore
     from fasta2a.broker import InMemoryBroker  # type: ignore
-    from fasta2a.storage import InMemoryStorage  # type: ignore
-    from fasta2a.schema import Message, Artifact, AgentProvider, Skill  # type: ignore
+    from fasta2a.task_manager import TaskManager  # type: ignore
+    from fasta2a.schema import Message, Artifact, AgentProvider, Skill, Task, SendMessageResponse  # type: ignore
+    from fasta2a.schema import TaskStatusUpdateEvent, a2a_request_ta  # type: ignore
+    from starlette.responses import JSONResponse, StreamingResponse
+    import httpx  # type: ignore
+    import pydantic  # type: ignore
+    _task_ta = pydantic.TypeAdapter(Task)
+    _status_event_ta = pydantic.TypeAdapter(TaskStatusUpdateEvent)
     FASTA2A_AVAILABLE = True
 except ImportError:  # pragma: no cover – library not installed
     FASTA2A_AVAILABLE = False
@@ -52,38 +66,127 @@ except ImportError:  # pragma: no cover – library not installed
     class InMemoryBroker:  # type: ignore
         pass
 
-    class InMemoryStorage:  # type: ignore
-        async def update_task(self, **kwargs):
+    class TaskManager:  # type: ignore
+        def __init__(self, **kwargs):
             pass
 
-    Message = Artifact = AgentProvider = Skill = Any  # type: ignore
+    Message = Artifact = AgentProvider = Skill = Task = SendMessageResponse = Any  # type: ignore
 
 _PRINTER = PrintStyle(italic=True, font_color="purple", padding=False)
 
 
 class AgentZeroWorker(Worker):  # type: ignore[misc]
-    """Agent Zero implementation of FastA2A Worker."""
+    """
+    Agent Zero implementation of FastA2A Worker. Tasks are taken off the broker into a
+    local queue and run by a fixed number of workers, each keeping one BACKGROUND context
+    that is reset between tasks instead of created and initialized for every task.
+    """
 
-    def __init__(self, broker, storage):
+    def __init__(self, broker, storage, workers: int = A2A_WORKERS, queue_limit: int = A2A_QUEUE_LIMIT):
         super().__init__(broker=broker, storage=storage)
         self.storage = storage
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._queue: asyncio.Queue | None = None
+        self._running: dict[str, AgentContext] = {}  # task id -> context running it
+        self._canceled: set[str] = set()
+        self._contexts: list[AgentContext] = []
+        self._notifications: set[asyncio.Task] = set()  # the loop keeps only weak references
+        self.stats = {"completed": 0, "failed": 0, "canceled": 0, "rejected": 0}
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def is_full(self) -> bool:
+        return self.queue_depth() >= self.queue_limit
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": self.queue_depth(),
+            "queue_limit": self.queue_limit,
+            **self.stats,
+            "stored": self.storage.counts(),
+        }
+
+    @contextlib.asynccontextmanager
+    async def run(self):
+        self._queue = asyncio.Queue()
+        loops = [asyncio.create_task(self._loop())]
+        loops += [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        try:
+            yield
+        finally:
+            for loop in loops:
+                loop.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+            # interrupted tasks stay 'working' in the store and are failed by recover()
+            for context in self._contexts:
+                context.reset()
+                AgentContext.remove(context.id)
+            self._contexts = []
+            self._running = {}
+
+    async def _loop(self) -> None:
+        # operations are taken off the broker at once, runs wait in the local queue
+        async for task_operation in self.broker.receive_task_operations():
+            if task_operation["operation"] == "run":
+                self._queue.put_nowait(task_operation["params"])  # type: ignore[union-attr]
+            elif task_operation["operation"] == "cancel":
+                await self.cancel_task(task_operation["params"])
+
+    async def _work(self) -> None:
+        context: AgentContext | None = None
+        while True:
+            params = await self._queue.get()  # type: ignore[union-attr]
+            if context is None:
+                context = AgentContext(initialize_agent(), type=AgentContextType.BACKGROUND)
+                self._contexts.append(context)
+            try:
+                await self.run_task(params, context)
+            except Exception as e:
+                _PRINTER.print(f"[A2A] Error processing task {params.get('id', 'unknown')}: {e}")
+
+    async def recover(self) -> None:
+        """Queue tasks submitted before a restart, fail those that were interrupted while running"""
+        for task in self.storage.unfinished_tasks():
+            if task["status"]["state"] == "submitted" and task.get("history"):
+                self._queue.put_nowait(  # type: ignore[union-attr]
+                    {"id": task["id"], "context_id": task["context_id"], "message": task["history"][0]}
+                )
+            else:
+                task = await self.storage.update_task(
+                    task_id=task["id"],
+                    state="failed",
+                    new_messages=[self._agent_message("Task interrupted by a server restart.")],
+                )
+                self.stats["failed"] += 1
+                self.notify(task)
+        if self.queue_depth():
+            _PRINTER.print(f"[A2A] Recovered {self.queue_depth()} queued tasks")
 
-    async def run_task(self, params: Any) -> None:  # params: TaskSendParams
+    async def run_task(self, params: Any, context: AgentContext | None = None) -> None:  # params: TaskSendParams
         """Execute a task by processing the message through Agent Zero."""
-        context = None
+        task_id = params['id']
+        stored = await self.storage.load_task(task_id)
+        if stored and stored["status"]["state"] != "submitted":
+            return  # canceled while queued
+
+        temporary = context is None
+        if context is None:
+            context = AgentContext(initialize_agent(), type=AgentContextType.BACKGROUND)
+
+        self._running[task_id] = context
+        task = None
         try:
-            task_id = params['id']
             message = params['message']
-
-            _PRINTER.print(f"[A2A] Processing task {task_id} with new temporary context")
+            _PRINTER.print(f"[A2A] Processing task {task_id} in context {context.id}")
+            await self.storage.update_task(task_id=task_id, state='working')
 
             # Convert A2A message to Agent Zero format
             agent_message = self._convert_message(message)
 
-            # Always create new temporary context for this A2A conversation
-            cfg = initialize_agent()
-            context = AgentContext(cfg, type=AgentContextType.BACKGROUND)
-
             # Log user message so it appears instantly in UI chat window
             context.log.log(
                 type="user",  # type: ignore[arg-type]
@@ -94,51 +197,68 @@ class AgentZeroWorker(Worker):  # type: ignore[misc]
             )
 
             # Process message through Agent Zero (includes response)
-            task = context.communicate(agent_message)
-            result_text = await task.result()
-
-            # Build A2A message from result
-            response_message: Message = {  # type: ignore
-                'role': 'agent',
-                'parts': [{'kind': 'text', 'text': str(result_text)}],
-                'kind': 'message',
-                'message_id': str(uuid.uuid4())
-            }
+            result_text = await context.communicate(agent_message).result()
 
-            await self.storage.update_task(  # type: ignore[attr-defined]
+            task = await self.storage.update_task(  # type: ignore[attr-defined]
                 task_id=task_id,
                 state='completed',
-                new_messages=[response_message]
+                new_messages=[self._agent_message(str(result_text))]
             )
-
-            # Clean up context like non-persistent MCP chats
+            self.stats["completed"] += 1
+            _PRINTER.print(f"[A2A] Completed task {task_id}")
+
+        except (Exception, asyncio.CancelledError) as e:
+            if task_id in self._canceled:
+                pass  # killed by cancel_task, already marked canceled
+            elif isinstance(e, asyncio.CancelledError):
+                raise  # worker shutdown
+            else:
+                _PRINTER.print(f"[A2A] Error processing task {task_id}: {e}")
+                task = await self.storage.update_task(task_id=task_id, state='failed')
+                self.stats["failed"] += 1
+
+        finally:
+            self._running.pop(task_id, None)
+            self._canceled.discard(task_id)
+            # Clean up the context like non-persistent MCP chats, kept warm for the next task
             context.reset()
-            AgentContext.remove(context.id)
             remove_chat(context.id)
-
-            _PRINTER.print(f"[A2A] Completed task {task_id} and cleaned up context")
-
-        except Exception as e:
-            _PRINTER.print(f"[A2A] Error processing task {params.get('id', 'unknown')}: {e}")
-            await self.storage.update_task(
-                task_id=params.get('id', 'unknown'),
-                state='failed'
-            )
-
-            # Clean up context even on failure to prevent resource leaks
-            if context:
-                context.reset()
+            if temporary:
                 AgentContext.remove(context.id)
-                remove_chat(context.id)
-                _PRINTER.print(f"[A2A] Cleaned up failed context {context.id}")
+
+        if task:
+            self.notify(task)
 
     async def cancel_task(self, params: Any) -> None:  # params: TaskIdParams
-        """Cancel a running task."""
+        """Cancel a queued or running task."""
         task_id = params['id']
         _PRINTER.print(f"[A2A] Cancelling task {task_id}")
-        await self.storage.update_task(task_id=task_id, state='canceled')  # type: ignore[attr-defined]
-
-        # Note: No context cleanup needed since contexts are always temporary and cleaned up in run_task
+        stored = await self.storage.load_task(task_id)
+        if not stored or stored["status"]["state"] not in ("submitted", "working"):
+            return
+        task = await self.storage.update_task(task_id=task_id, state='canceled')  # type: ignore[attr-defined]
+        self.stats["canceled"] += 1
+        context = self._running.get(task_id)
+        if context:
+            self._canceled.add(task_id)
+            context.kill_process()
+        self.notify(task)
+
+    def notify(self, task: dict) -> None:
+        """Send the final task to the push notification url of the client, if it gave one"""
+        config = self.storage.get_push_config(task["id"])
+        if config and config.get("url"):
+            notification = asyncio.create_task(_send_push_notification(config, task))
+            self._notifications.add(notification)
+            notification.add_done_callback(self._notifications.discard)
+
+    def _agent_message(self, text: str) -> Message:  # type: ignore
+        return {  # type: ignore
+            'role': 'agent',
+            'parts': [{'kind': 'text', 'text': text}],
+            'kind': 'message',
+            'message_id': str(uuid.uuid4())
+        }
 
     def build_message_history(self, history: List[Any]) -> List[Message]:  # type: ignore
         # Not used in this simplified implementation
@@ -168,6 +288,116 @@ class AgentZeroWorker(Worker):  # type: ignore[misc]
         )
 
 
+async def _send_push_notification(config: dict, task: dict) -> None:
+    headers = {"Content-Type": "application/json"}
+    if config.get("token"):
+        headers["X-A2A-Notification-Token"] = config["token"]
+    body = _task_ta.dump_json(task, by_alias=True)  # type: ignore
+    async with httpx.AsyncClient(timeout=PUSH_TIMEOUT) as client:  # type: ignore
+        for attempt in range(PUSH_RETRIES):
+            try:
+                response = await client.post(config["url"], content=body, headers=headers)
+                if response.status_code < 500:
+                    return
+            except Exception as e:
+                if attempt == PUSH_RETRIES - 1:
+                    _PRINTER.print(f"[A2A] Push notification for task {task['id']} failed: {e}")
+            await asyncio.sleep(2 ** attempt)
+
+
+class AgentZeroTaskManager(TaskManager):  # type: ignore[misc]
+    """TaskManager with admission control and push notification configs kept per task."""
+
+    worker: AgentZeroWorker | None = None
+
+    async def send_message(self, request: Any) -> Any:
+        message = request['params']['message']
+        context_id = message.get('context_id', str(uuid.uuid4()))
+        config = request['params'].get('configuration', {})
+        task = await self.storage.submit_task(context_id, message)  # type: ignore[attr-defined]
+
+        if self.worker and self.worker.is_full():
+            # admission control: answer at once instead of queueing without bound
+            task = await self.storage.update_task(  # type: ignore[attr-defined]
+                task_id=task['id'],
+                state='rejected',
+                new_messages=[self.worker._agent_message("Server busy, too many queued tasks. Retry later.")],
+            )
+            self.worker.stats["rejected"] += 1
+            return SendMessageResponse(jsonrpc='2.0', id=request['id'], result=task)  # type: ignore
+
+        push = config.get('push_notification_config')
+        if push:
+            self.storage.set_push_config(task['id'], push)  # type: ignore[attr-defined]
+        broker_params: Any = {'id': task['id'], 'context_id': context_id, 'message': message}
+        if config.get('history_length') is not None:
+            broker_params['history_length'] = config['history_length']
+        await self.broker.run_task(broker_params)  # type: ignore[attr-defined]
+        return SendMessageResponse(jsonrpc='2.0', id=request['id'], result=task)  # type: ignore
+
+
+class AgentZeroA2A(FastA2A):  # type: ignore[misc]
+    """
+    FastA2A app announcing push notification support in the agent card, and serving
+    message/stream and tasks/resubscribe as server-sent events: the task, then one final
+    status-update event once it is completed, failed, canceled or rejected.
+    """
+
+    async def _agent_card_endpoint(self, request: Any) -> Any:
+        response = await super()._agent_card_endpoint(request)  # type: ignore[misc]
+        card = json.loads(response.body)
+        capabilities = card.setdefault("capabilities", {})
+        capabilities["pushNotifications"] = True
+        capabilities["streaming"] = True
+        response.body = json.dumps(card).encode()
+        response.headers["content-length"] = str(len(response.body))
+        return response
+
+    async def _agent_run_endpoint(self, request: Request) -> Any:
+        a2a_request = a2a_request_ta.validate_json(await request.body())
+        method = a2a_request['method']
+        if method == 'message/stream':
+            response = await self.task_manager.send_message(  # type: ignore[attr-defined]
+                {**a2a_request, 'method': 'message/send'}
+            )
+            task = response['result']
+        elif method == 'tasks/resubscribe':
+            task = await self.task_manager.storage.load_task(a2a_request['params']['id'])  # type: ignore[attr-defined]
+            if task is None:
+                return JSONResponse({
+                    'jsonrpc': '2.0',
+                    'id': a2a_request['id'],
+                    'error': {'code': -32001, 'message': 'Task not found'},
+                })
+        else:
+            return await super()._agent_run_endpoint(request)  # type: ignore[misc]
+        return StreamingResponse(
+            self._task_events(a2a_request['id'], task),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
+
+    async def _task_events(self, request_id: Any, task: dict):
+        def event(result: Any) -> str:
+            return f"data: {json.dumps({'jsonrpc': '2.0', 'id': request_id, 'result': result})}\n\n"
+
+        yield event(_task_ta.dump_python(task, mode='json', by_alias=True))
+        storage: A2ATaskStore = self.task_manager.storage  # type: ignore[attr-defined]
+        while True:
+            finished = await storage.wait_finished(task['id'], timeout=STREAM_KEEPALIVE)
+            if finished:
+                break
+            yield ": keepalive\n\n"
+        status_event: Any = {
+            'task_id': finished['id'],
+            'context_id': finished['context_id'],
+            'kind': 'status-update',
+            'status': finished['status'],
+            'final': True,
+        }
+        yield event(_status_event_ta.dump_python(status_event, mode='json', by_alias=True))
+
+
 class DynamicA2AProxy:
     """Dynamic proxy for FastA2A server that allows reconfiguration."""
 
@@ -180,6 +410,7 @@ class DynamicA2AProxy:
         self._startup_done: bool = False
         self._worker_bg_task: asyncio.Task | None = None
         self._reconfigure_needed: bool = False  # Flag for deferred reconfiguration
+        self._storage: A2ATaskStore | None = None  # durable, kept across reconfigurations
 
         if FASTA2A_AVAILABLE:
             # Initialize with default token
@@ -209,7 +440,7 @@ class DynamicA2AProxy:
     def _configure(self):
         """Configure the FastA2A application with Agent Zero integration."""
         try:
-            storage = InMemoryStorage()  # type: ignore[arg-type]
+            storage = self._storage or A2ATaskStore()
             broker = InMemoryBroker()  # type: ignore[arg-type]
 
             # Define Agent Zero's skills
@@ -235,7 +466,7 @@ class DynamicA2AProxy:
             }
 
             # Create new FastA2A app with proper thread safety
-            new_app = FastA2A(  # type: ignore
+            new_app = AgentZeroA2A(  # type: ignore
                 storage=storage,
                 broker=broker,
                 name="Agent Zero",
@@ -255,6 +486,11 @@ class DynamicA2AProxy:
             self._broker = broker  # type: ignore[attr-defined]
             self._worker = AgentZeroWorker(broker=broker, storage=storage)  # type: ignore[attr-defined]
 
+            # bounded worker pool, rejects tasks while its queue is full
+            task_manager = AgentZeroTaskManager(broker=broker, storage=storage)  # type: ignore[call-arg]
+            task_manager.worker = self._worker
+            new_app.task_manager = task_manager  # type: ignore[attr-defined]
+
             # Atomic update of the app
             self.app = new_app
 
@@ -327,13 +563,19 @@ class DynamicA2AProxy:
         # Start task manager
         await self.app.task_manager.__aenter__()  # type: ignore[attr-defined]
 
+        started = asyncio.Event()
+
         async def _worker_loop():
             async with self._worker.run():  # type: ignore[attr-defined]
+                started.set()
                 await asyncio.Event().wait()
 
         # fire-and-forget background task – keep reference
         self._worker_bg_task = asyncio.create_task(_worker_loop())
-        _PRINTER.print("[A2A] Worker & TaskManager started")
+        await started.wait()
+        # tasks left over from before a restart or reconfiguration
+        await self._worker.recover()  # type: ignore[attr-defined]
+        _PRINTER.print(f"[A2A] Worker pool ({self._worker.workers}) & TaskManager started")  # type: ignore[attr-defined]
 
     async def __call__(self, scope, receive, send):
         """ASGI application interface with token-based routing."""
@@ -455,7 +697,9 @@ class DynamicA2AProxy:
             # Update scope with cleaned path
             scope = dict(scope)
             scope['path'] = remaining_path
+            route = remaining_path
         else:
+            route = path
             # No token in path, check other auth methods
             request = Request(scope, receive=receive)
 
@@ -486,6 +730,19 @@ class DynamicA2AProxy:
             else:
                 _PRINTER.print("[A2A] No expected token found in settings")
 
+        # Worker pool and task store metrics (queue depth, running, finished counts)
+        if route == '/metrics' and scope.get('method') == 'GET':
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [[b'content-type', b'application/json']],
+            })
+            await send({
+                'type': 'http.response.body',
+                'body': json.dumps(self._worker.metrics()).encode(),  # type: ignore[attr-defined]
+            })
+            return
+
         # Delegate to FastA2A app with cleaned scope
         with self._lock:
             app = self.app
@@ -2,7 +2,13 @@ import os
 from pathlib import Path
 import shutil
 import base64
-import subprocess
+import fnmatch
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Any
 from werkzeug.utils import secure_filename
 from datetime import datetime
@@ -10,6 +16,39 @@ from datetime import datetime
 from python.helpers import files
 from python.helpers.print_style import PrintStyle
 
+LISTING_CACHE_SIZE = 32  # directories kept in memory
+LISTING_TTL = 30  # seconds, file sizes and times change without touching the directory mtime
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # suggested to the client for resumable uploads
+UPLOAD_COPY_SIZE = 1024 * 1024  # request body is copied to disk in blocks of this size
+UPLOAD_PART_SUFFIX = ".part"
+UPLOAD_META_SUFFIX = ".json"  # <target>.part.json, identifies the upload the part file belongs to
+
+
+@dataclass
+class _Listing:
+    dir_mtime: int
+    created: float
+    entries: List[Dict[str, Any]]
+    sorted: Dict[Tuple[str, str], List[Dict[str, Any]]] = field(default_factory=dict)
+
+
+_listing_cache: "OrderedDict[str, _Listing]" = OrderedDict()
+_listing_lock = threading.Lock()
+
+
+def _invalidate_listing(path: Path):
+    # overwritten files keep the directory mtime, drop the listing explicitly
+    with _listing_lock:
+        _listing_cache.pop(str(path), None)
+
+
+def _file_sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(UPLOAD_COPY_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
 
 class FileBrowser:
     ALLOWED_EXTENSIONS = {
@@ -48,6 +87,7 @@ class FileBrowser:
             # Save file
             with open(target_file, "wb") as file:
                 file.write(base64.b64decode(base64_content))
+            _invalidate_listing(target_file.parent)
             return True
         except Exception as e:
             PrintStyle.error(f"Error saving file {filename}: {e}")
@@ -80,12 +120,105 @@ class FileBrowser:
                     PrintStyle.error(f"Error saving file {file.filename}: {e}")
                     failed.append(file.filename)
 
+            _invalidate_listing(target_dir)
             return successful, failed
 
         except Exception as e:
             PrintStyle.error(f"Error in save_files: {e}")
             return successful, failed
 
+    def _upload_paths(self, current_path: str, filename: str) -> Tuple[Path, Path]:
+        name = secure_filename(filename)
+        if not name:
+            raise ValueError(f"Invalid filename: {filename}")
+        target_file = (self.base_dir / current_path / name).resolve()
+        if not str(target_file).startswith(str(self.base_dir)):
+            raise ValueError("Invalid target directory")
+        return target_file, target_file.with_name(name + UPLOAD_PART_SUFFIX)
+
+    @staticmethod
+    def _upload_meta_path(part_file: Path) -> Path:
+        return part_file.with_name(part_file.name + UPLOAD_META_SUFFIX)
+
+    def _upload_matches(self, part_file: Path, total: int, upload_id: str) -> bool:
+        """True if the part file on disk was started by this upload, a part without metadata never matches"""
+        try:
+            meta = json.loads(self._upload_meta_path(part_file).read_text())
+        except (OSError, ValueError):
+            return False
+        return meta.get("total") == total and meta.get("upload_id") == upload_id
+
+    def _discard_upload(self, part_file: Path):
+        part_file.unlink(missing_ok=True)
+        self._upload_meta_path(part_file).unlink(missing_ok=True)
+
+    def get_upload_status(self, current_path: str, filename: str, total: int, upload_id: str = "") -> Dict[str, Any]:
+        """Bytes of an interrupted upload already on disk, the client resumes from there"""
+        _, part_file = self._upload_paths(current_path, filename)
+        received = part_file.stat().st_size if part_file.exists() else 0
+        if received and (received >= total or not self._upload_matches(part_file, total, upload_id)):
+            # leftover of a different file with the same name, complete parts are renamed right away
+            self._discard_upload(part_file)
+            received = 0
+        return {"received": received, "chunk_size": UPLOAD_CHUNK_SIZE}
+
+    def save_file_chunk(
+        self,
+        current_path: str,
+        filename: str,
+        start: int,
+        total: int,
+        stream,
+        chunk_sha256: str = "",
+        file_sha256: str = "",
+        upload_id: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Write one chunk of a resumable upload straight into <target>.part at its offset,
+        the part file replaces the target once all bytes are in. A chunk must start at or
+        before the bytes received so far, a retried chunk overwrites its earlier attempt.
+        The first chunk records upload_id and total in <target>.part.json, later chunks
+        of another upload are rejected so the client starts over.
+        """
+        target_file, part_file = self._upload_paths(current_path, filename)
+        os.makedirs(target_file.parent, exist_ok=True)
+        meta_file = self._upload_meta_path(part_file)
+        if start == 0:
+            meta_file.write_text(json.dumps({"upload_id": upload_id, "total": total}))
+        elif not self._upload_matches(part_file, total, upload_id):
+            return {"received": 0, "complete": False, "error": "Partial upload belongs to a different file"}
+        received = part_file.stat().st_size if part_file.exists() else 0
+        if start > received:
+            return {"received": received, "complete": False, "error": f"Expected chunk at offset {received}"}
+
+        hasher = hashlib.sha256()
+        written = 0
+        with open(part_file, "r+b" if part_file.exists() else "wb") as f:
+            f.seek(start)
+            f.truncate()
+            for block in iter(lambda: stream.read(UPLOAD_COPY_SIZE), b""):
+                if start + written + len(block) > total:
+                    f.truncate(start)
+                    raise ValueError("Chunk exceeds the declared file size")
+                hasher.update(block)
+                f.write(block)
+                written += len(block)
+            if chunk_sha256 and hasher.hexdigest() != chunk_sha256.lower():
+                f.truncate(start)
+                raise ValueError("Chunk checksum mismatch")
+
+        received = start + written
+        if received < total:
+            return {"received": received, "complete": False}
+
+        if file_sha256 and _file_sha256(part_file) != file_sha256.lower():
+            self._discard_upload(part_file)
+            raise ValueError("File checksum mismatch")
+        os.replace(part_file, target_file)
+        meta_file.unlink(missing_ok=True)
+        _invalidate_listing(target_file.parent)
+        return {"received": received, "complete": True, "filename": target_file.name}
+
     def delete_file(self, file_path: str) -> bool:
         """Delete a file or empty directory"""
         try:
@@ -99,6 +232,7 @@ class FileBrowser:
                     os.remove(full_path)
                 elif os.path.isdir(full_path):
                     shutil.rmtree(full_path)
+                _invalidate_listing(full_path.parent)
                 return True
 
             return False
@@ -122,124 +256,130 @@ class FileBrowser:
     def _get_file_extension(self, filename: str) -> str:
         return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
 
-    def _get_files_via_ls(self, full_path: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """Get files and folders using ls command for better error handling"""
-        files: List[Dict[str, Any]] = []
-        folders: List[Dict[str, Any]] = []
-
+    def _scan_directory(self, full_path: Path) -> List[Dict[str, Any]]:
+        """List a directory with os.scandir, entry type and stat come from the DirEntry"""
+        entries: List[Dict[str, Any]] = []
         try:
-            # Use ls command to get directory listing
-            result = subprocess.run(
-                ['ls', '-la', str(full_path)],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode != 0:
-                PrintStyle.error(f"ls command failed: {result.stderr}")
-                return files, folders
-
-            # Parse ls output (skip first line which is "total X")
-            lines = result.stdout.strip().split('\n')
-            if len(lines) <= 1:
-                return files, folders
-
-            for line in lines[1:]:  # Skip the "total" line
-                try:
-                    # Skip current and parent directory entries
-                    if line.endswith(' .') or line.endswith(' ..'):
-                        continue
-
-                    # Parse ls -la output format
-                    parts = line.split()
-                    if len(parts) < 9:
-                        continue
-
-                    # Check if this is a symlink (permissions start with 'l')
-                    permissions = parts[0]
-                    is_symlink = permissions.startswith('l')
-
-                    if is_symlink:
-                        # For symlinks, extract the name before the '->' arrow
-                        full_name_part = ' '.join(parts[8:])
-                        if ' -> ' in full_name_part:
-                            filename = full_name_part.split(' -> ')[0]
-                            symlink_target = full_name_part.split(' -> ')[1]
-                        else:
-                            filename = full_name_part
-                            symlink_target = None
-                    else:
-                        filename = ' '.join(parts[8:])  # Handle filenames with spaces
-                        symlink_target = None
-
-                    if not filename:
-                        continue
-
-                    # Get full path for this entry
-                    entry_path = full_path / filename
-
+            with os.scandir(full_path) as it:
+                for entry in it:
                     try:
-                        stat_info = entry_path.stat()
-
-                        entry_data: Dict[str, Any] = {
-                            "name": filename,
-                            "path": str(entry_path.relative_to(self.base_dir)),
-                            "modified": datetime.fromtimestamp(stat_info.st_mtime).isoformat()
-                        }
-
-                        # Add symlink information if this is a symlink
-                        if is_symlink and symlink_target:
-                            entry_data["symlink_target"] = symlink_target
-                            entry_data["is_symlink"] = True
-
-                        if entry_path.is_file():
-                            entry_data.update({
-                                "type": self._get_file_type(filename),
-                                "size": stat_info.st_size,
-                                "is_dir": False
-                            })
-                            files.append(entry_data)
-                        elif entry_path.is_dir():
-                            entry_data.update({
-                                "type": "folder",
-                                "size": 0,  # Directories show as 0 bytes
-                                "is_dir": True
-                            })
-                            folders.append(entry_data)
-
-                    except (OSError, PermissionError, FileNotFoundError) as e:
+                        is_dir = entry.is_dir()
+                        if not is_dir and not entry.is_file():
+                            continue  # sockets, fifos, broken symlinks
+                        stat_info = entry.stat()
+                    except OSError as e:
                         # Log error but continue with other files
-                        PrintStyle.warning(f"No access to {filename}: {e}")
+                        PrintStyle.warning(f"No access to {entry.name}: {e}")
                         continue
 
-                    if len(files) + len(folders) > 10000:
-                        break
-
-                except Exception as e:
-                    # Log error and continue with next line
-                    PrintStyle.error(f"Error parsing ls line '{line}': {e}")
-                    continue
-
-        except subprocess.TimeoutExpired:
-            PrintStyle.error("ls command timed out")
-        except Exception as e:
-            PrintStyle.error(f"Error running ls command: {e}")
+                    entry_data: Dict[str, Any] = {
+                        "name": entry.name,
+                        "path": str((full_path / entry.name).relative_to(self.base_dir)),
+                        "modified": datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
+                        "type": "folder" if is_dir else self._get_file_type(entry.name),
+                        "size": 0 if is_dir else stat_info.st_size,  # Directories show as 0 bytes
+                        "is_dir": is_dir,
+                        "_mtime": stat_info.st_mtime,
+                    }
+
+                    # Add symlink information if this is a symlink
+                    if entry.is_symlink():
+                        try:
+                            entry_data["symlink_target"] = os.readlink(entry.path)
+                            entry_data["is_symlink"] = True
+                        except OSError:
+                            pass
 
-        return files, folders
+                    entries.append(entry_data)
+        except OSError as e:
+            PrintStyle.error(f"Error listing directory {full_path}: {e}")
+        return entries
 
-    def get_files(self, current_path: str = "") -> Dict:
+    def _get_listing(self, full_path: Path, sort_by: str, sort_dir: str) -> List[Dict[str, Any]]:
+        """Sorted listing, cached until the directory mtime changes or the entry expires"""
+        try:
+            dir_mtime = os.stat(full_path).st_mtime_ns
+        except OSError:
+            return []
+
+        key = str(full_path)
+        now = time.monotonic()
+        with _listing_lock:
+            cached = _listing_cache.get(key)
+            if cached and (cached.dir_mtime != dir_mtime or now - cached.created > LISTING_TTL):
+                cached = None
+            if cached:
+                _listing_cache.move_to_end(key)
+
+        if not cached:
+            cached = _Listing(dir_mtime, now, self._scan_directory(full_path))
+            with _listing_lock:
+                _listing_cache[key] = cached
+                while len(_listing_cache) > LISTING_CACHE_SIZE:
+                    _listing_cache.popitem(last=False)
+
+        order = (sort_by, sort_dir)
+        if order not in cached.sorted:
+            cached.sorted[order] = self._sort_entries(cached.entries, sort_by, sort_dir)
+        return cached.sorted[order]
+
+    def _sort_entries(self, entries: List[Dict[str, Any]], sort_by: str, sort_dir: str) -> List[Dict[str, Any]]:
+        keys = {
+            "size": lambda e: (e["size"], e["name"].casefold()),
+            "date": lambda e: (e["_mtime"], e["name"].casefold()),
+        }
+        key = keys.get(sort_by, lambda e: e["name"].casefold())
+        reverse = sort_dir == "desc"
+        # folders always come first, whatever the direction
+        folders = sorted((e for e in entries if e["is_dir"]), key=key, reverse=reverse)
+        files = sorted((e for e in entries if not e["is_dir"]), key=key, reverse=reverse)
+        return folders + files
+
+    def _filter_entries(self, entries: List[Dict[str, Any]], filter: str) -> List[Dict[str, Any]]:
+        if not filter:
+            return entries
+        pattern = filter.casefold()
+        if any(c in pattern for c in "*?["):
+            return [e for e in entries if fnmatch.fnmatchcase(e["name"].casefold(), pattern)]
+        return [e for e in entries if pattern in e["name"].casefold()]
+
+    def get_files(
+        self,
+        current_path: str = "",
+        cursor: str = "",
+        limit: int = 0,
+        sort_by: str = "name",
+        sort_dir: str = "asc",
+        filter: str = "",
+    ) -> Dict:
         try:
             # Resolve the full path while preventing directory traversal
             full_path = (self.base_dir / current_path).resolve()
             if not str(full_path).startswith(str(self.base_dir)):
                 raise ValueError("Invalid path")
 
-            # Use ls command instead of os.scandir for better error handling
-            files, folders = self._get_files_via_ls(full_path)
+            entries = self._filter_entries(
+                self._get_listing(full_path, sort_by, sort_dir), filter
+            )
 
-            # Combine folders and files, folders first
-            all_entries = folders + files
+            # page after the entry named in the cursor, its position is only a hint
+            # so entries added or removed meanwhile do not shift the pages
+            start = 0
+            if cursor:
+                after = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+                position = after.get("position", 0)
+                if position < len(entries) and entries[position]["name"] == after.get("name"):
+                    start = position + 1
+                else:
+                    names = [e["name"] for e in entries]
+                    start = names.index(after["name"]) + 1 if after.get("name") in names else position + 1
+            end = start + limit if limit > 0 else len(entries)
+            page = [{k: v for k, v in e.items() if k != "_mtime"} for e in entries[start:end]]
+            next_cursor = ""
+            if end < len(entries):
+                next_cursor = base64.urlsafe_b64encode(
+                    json.dumps({"name": entries[end - 1]["name"], "position": end - 1}).encode()
+                ).decode()
 
             # Get parent directory path if not at root
             parent_path = ""
@@ -256,14 +396,16 @@ class FileBrowser:
                     parent_path = ""
 
             return {
-                "entries": all_entries,
+                "entries": page,
                 "current_path": current_path,
-                "parent_path": parent_path
+                "parent_path": parent_path,
+                "total": len(entries),
+                "next_cursor": next_cursor
             }
 
         except Exception as e:
             PrintStyle.error(f"Error reading directory: {e}")
-            return {"entries": [], "current_path": "", "parent_path": ""}
+            return {"entries": [], "current_path": "", "parent_path": "", "total": 0, "next_cursor": ""}
 
     def get_full_path(self, file_path: str, allow_dir: bool = False) -> str:
         """Get full file path if it exists and is within base_dir"""
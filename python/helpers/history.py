@@ -4,7 +4,7 @@ from collections import OrderedDict
 from collections.abc import Mapping
 import json
 import math
-from typing import Coroutine, Literal, TypedDict, cast, Union, Dict, List, Any
+from typing import Coroutine, Iterator, Literal, TypedDict, cast, Union, Dict, List, Any
 from python.helpers import messages, tokens, settings, call_llm
 from enum import Enum
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage
@@ -340,6 +340,29 @@ class History(Record):
         result += self.current.output()
         return result
 
+    def output_reversed(self) -> Iterator[OutputMessage]:
+        # newest first, records are only expanded as far as the caller iterates
+        for topic in [self.current, *reversed(self.topics)]:
+            if topic.summary:
+                yield from reversed(topic.output())
+            else:
+                for message in reversed(topic.messages):
+                    yield from reversed(message.output())
+        for bulk in reversed(self.bulks):
+            yield from reversed(bulk.output())
+
+    def output_text_tail(self, max_chars: int, human_label="user", ai_label="ai") -> str:
+        """Same as output_text()[-max_chars:], but only the needed suffix is built."""
+        parts: list[str] = []
+        length = 0
+        for output in self.output_reversed():
+            if length >= max_chars:
+                break
+            text = _stringify_output(output, ai_label, human_label)
+            parts.append(text)
+            length += len(text) + 1  # joined with newlines
+        return "\n".join(reversed(parts))[-max_chars:] if max_chars > 0 else ""
+
     @staticmethod
     def from_dict(data: dict, history: "History"):
         history.counter = data.get("counter", 0)
@@ -31,6 +31,10 @@ async def run_loop():
                 await scheduler_tick()
             except Exception as e:
                 PrintStyle().error(errors.format_error(e))
+            try:
+                evict_idle_chats()
+            except Exception as e:
+                PrintStyle().error(errors.format_error(e))
         await asyncio.sleep(SLEEP_TIME)  # TODO! - if we lower it under 1min, it can run a 5min job multiple times in it's target minute
 
 
@@ -41,6 +45,12 @@ async def scheduler_tick():
     await scheduler.tick()
 
 
+def evict_idle_chats():
+    # saved chats nobody accessed for a while are dropped from memory, reloaded on access
+    from python.helpers.persist_chat import evict_idle_chats as _evict_idle_chats
+    _evict_idle_chats()
+
+
 def pause_loop():
     global keep_running, pause_time
     keep_running = False
@@ -1,7 +1,10 @@
 import glob
 import os
 import hashlib
-from typing import Any, Dict, Literal, TypedDict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Dict, Literal, NotRequired, TypedDict
 from langchain_community.document_loaders import (
     CSVLoader,
     PyPDFLoader,
@@ -13,6 +16,23 @@ from python.helpers.print_style import PrintStyle
 
 text_loader_kwargs = {"autodetect_encoding": True}
 
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+PARALLEL_MIN_FILES = 8  # fewer files are parsed in-process, the pool is not worth starting
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Mapping file extensions to corresponding loader classes
+# Note: Using TextLoader for JSON and MD to avoid parsing issues with consolidation
+file_types_loaders = {
+    "txt": TextLoader,
+    "pdf": PyPDFLoader,
+    "csv": CSVLoader,
+    "html": UnstructuredHTMLLoader,
+    "json": TextLoader,  # Use TextLoader for better consolidation compatibility
+    "md": TextLoader,    # Use TextLoader for better consolidation compatibility
+}
+
+_executor: ProcessPoolExecutor | None = None
+
 
 class KnowledgeImport(TypedDict):
     file: str
@@ -20,16 +40,61 @@ class KnowledgeImport(TypedDict):
     ids: list[str]
     state: Literal["changed", "original", "removed"]
     documents: list[Any]
+    size: NotRequired[int]  # size and mtime at the last import, unchanged files are not hashed
+    mtime: NotRequired[float]
 
 
 def calculate_checksum(file_path: str) -> str:
     hasher = hashlib.md5()
     with open(file_path, "rb") as f:
-        buf = f.read()
-        hasher.update(buf)
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+            hasher.update(chunk)
     return hasher.hexdigest()
 
 
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, forking the threaded web server process is not safe
+        _executor = ProcessPoolExecutor(
+            max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def _process_file(
+    file_path: str, ext: str, checksum: str, metadata: dict[str, Any]
+) -> tuple[str, list[Any] | None]:
+    """
+    Hash a file and parse it when the checksum differs from the given one.
+    Runs in a worker process, returns the new checksum and the documents (None when unchanged).
+    """
+    new_checksum = calculate_checksum(file_path)
+    if new_checksum == checksum:
+        return new_checksum, None
+
+    loader = file_types_loaders[ext](
+        file_path,
+        **(text_loader_kwargs if ext in ["txt", "csv", "html", "md"] else {}),
+    )
+    documents = loader.load_and_split()
+
+    # Enhanced metadata for better consolidation compatibility
+    enhanced_metadata = {
+        **metadata,
+        "source_file": os.path.basename(file_path),
+        "source_path": file_path,
+        "file_type": ext,
+        "knowledge_source": True,  # Flag to distinguish from conversation memories
+        "import_timestamp": None,  # Will be set when inserted into memory
+    }
+
+    # Apply metadata to all documents
+    for doc in documents:
+        doc.metadata = {**doc.metadata, **enhanced_metadata}
+    return new_checksum, documents
+
+
 def load_knowledge(
     log_item: LogItem | None,
     knowledge_dir: str,
@@ -44,17 +109,6 @@ def load_knowledge(
     intelligent memory consolidation system.
     """
 
-    # Mapping file extensions to corresponding loader classes
-    # Note: Using TextLoader for JSON and MD to avoid parsing issues with consolidation
-    file_types_loaders = {
-        "txt": TextLoader,
-        "pdf": PyPDFLoader,
-        "csv": CSVLoader,
-        "html": UnstructuredHTMLLoader,
-        "json": TextLoader,  # Use TextLoader for better consolidation compatibility
-        "md": TextLoader,    # Use TextLoader for better consolidation compatibility
-    }
-
     cnt_files = 0
     cnt_docs = 0
 
@@ -113,6 +167,8 @@ def load_knowledge(
                 progress=f"\nFound {len(kn_files)} knowledge files in {knowledge_dir}, processing...",
             )
 
+    # cheap change detection first, only files with a different size or mtime are hashed
+    pending: list[tuple[str, str, KnowledgeImport, os.stat_result]] = []
     for file_path in kn_files:
         try:
             # Get file extension safely
@@ -124,11 +180,8 @@ def load_knowledge(
             if ext not in file_types_loaders:
                 continue  # Skip unsupported file types
 
-            checksum = calculate_checksum(file_path)
-            if not checksum:
-                continue  # Skip files with checksum errors
-
             file_key = file_path
+            stat = os.stat(file_path)
 
             # Load existing data from the index or create a new entry
             file_data: KnowledgeImport = index.get(file_key, {
@@ -139,59 +192,66 @@ def load_knowledge(
                 "documents": []
             })
 
-            # Check if file has changed
-            if file_data.get("checksum") == checksum:
+            if (
+                file_data.get("checksum")
+                and file_data.get("size") == stat.st_size
+                and file_data.get("mtime") == stat.st_mtime
+            ):
                 file_data["state"] = "original"
+                index[file_key] = file_data
             else:
-                file_data["state"] = "changed"
-
-            # Process changed files
-            if file_data["state"] == "changed":
-                file_data["checksum"] = checksum
-                loader_cls = file_types_loaders[ext]
-
-                try:
-                    loader = loader_cls(
-                        file_path,
-                        **(
-                            text_loader_kwargs
-                            if ext in ["txt", "csv", "html", "md"]
-                            else {}
-                        ),
-                    )
-                    documents = loader.load_and_split()
-
-                    # Enhanced metadata for better consolidation compatibility
-                    enhanced_metadata = {
-                        **metadata,
-                        "source_file": os.path.basename(file_path),
-                        "source_path": file_path,
-                        "file_type": ext,
-                        "knowledge_source": True,  # Flag to distinguish from conversation memories
-                        "import_timestamp": None,  # Will be set when inserted into memory
-                    }
-
-                    # Apply metadata to all documents
-                    for doc in documents:
-                        doc.metadata = {**doc.metadata, **enhanced_metadata}
-
-                    file_data["documents"] = documents
-                    cnt_files += 1
-                    cnt_docs += len(documents)
-
-                except Exception as e:
-                    PrintStyle(font_color="red").print(f"Error loading {file_path}: {e}")
-                    if log_item:
-                        log_item.stream(progress=f"\nError loading {os.path.basename(file_path)}: {e}")
-                    continue
-
-            # Update the index
-            index[file_key] = file_data
+                pending.append((file_path, ext, file_data, stat))
 
         except Exception as e:
             PrintStyle(font_color="red").print(f"Error processing {file_path}: {e}")
             continue
 
+    # hash and parse the remaining files, in worker processes when there are enough of them
+    parallel = len(pending) >= PARALLEL_MIN_FILES
+
+    def completed():
+        if parallel:
+            futures = {
+                _get_executor().submit(
+                    _process_file, file_path, ext, file_data.get("checksum", ""), metadata
+                ): (file_path, file_data, stat)
+                for file_path, ext, file_data, stat in pending
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result
+        else:
+            for file_path, ext, file_data, stat in pending:
+                yield (file_path, file_data, stat), partial(
+                    _process_file, file_path, ext, file_data.get("checksum", ""), metadata
+                )
+
+    progress_step = max(1, len(pending) // 10)
+    for done, ((file_path, file_data, stat), get_result) in enumerate(completed(), start=1):
+        try:
+            checksum, documents = get_result()
+        except Exception as e:
+            PrintStyle(font_color="red").print(f"Error loading {file_path}: {e}")
+            if log_item:
+                log_item.stream(progress=f"\nError loading {os.path.basename(file_path)}: {e}")
+            continue
+
+        file_data["size"] = stat.st_size
+        file_data["mtime"] = stat.st_mtime
+        if documents is None:
+            file_data["state"] = "original"  # touched but same content
+        else:
+            file_data["checksum"] = checksum
+            file_data["state"] = "changed"
+            file_data["documents"] = documents
+            cnt_files += 1
+            cnt_docs += len(documents)
+
+        # Update the index
+        index[file_path] = file_data
+
+        if log_item and parallel and done % progress_step == 0:
+            log_item.stream(progress=f"\n{done}/{len(pending)} files processed...")
+
     # Mark removed files
     current_files = set(kn_files)
     for file_key, file_data in list(index.items()):
@@ -2,8 +2,13 @@
 
 import base64
 import io
+import re
 import warnings
 import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator
+import numpy as np
 import soundfile as sf
 from python.helpers import runtime
 from python.helpers.print_style import PrintStyle
@@ -15,6 +20,10 @@ warnings.filterwarnings("ignore", category=UserWarning)
 _pipeline = None
 _voice = "am_puck,am_onyx"
 _speed = 1.1
+_sample_rate = 24000
+_max_workers = 1  # one KPipeline is shared and not known to be thread-safe, inference is serialized
+_prefetch = 2  # sentences queued ahead while the previous one is encoded and sent
+_executor: ThreadPoolExecutor | None = None
 is_updating_model = False
 
 
@@ -101,27 +110,81 @@ async def synthesize_sentences(sentences: list[str]):
 async def _synthesize_sentences(sentences: list[str]):
     await _preload()
 
-    combined_audio = []
-
     try:
-        for sentence in sentences:
-            if sentence.strip():
-                segments = _pipeline(sentence.strip(), voice=_voice, speed=_speed) # type: ignore
-                segment_list = list(segments)
+        # inference runs on the worker, not on the agent loop
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(
+            *[
+                loop.run_in_executor(_get_executor(), _synthesize_one, sentence.strip())
+                for sentence in sentences
+                if sentence.strip()
+            ]
+        )
+        combined_audio = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
 
-                for segment in segment_list:
-                    audio_tensor = segment.audio
-                    audio_numpy = audio_tensor.detach().cpu().numpy() # type: ignore
-                    combined_audio.extend(audio_numpy)
+        # Return base64 encoded audio
+        return _encode_wav(combined_audio)
 
-        # Convert combined audio to bytes
-        buffer = io.BytesIO()
-        sf.write(buffer, combined_audio, 24000, format="WAV")
-        audio_bytes = buffer.getvalue()
+    except Exception as e:
+        PrintStyle.error(f"Error in Kokoro TTS synthesis: {e}")
+        raise
 
-        # Return base64 encoded audio
-        return base64.b64encode(audio_bytes).decode("utf-8")
 
+def stream_sentences(sentences: list[str]) -> Iterator[tuple[int, str]]:
+    """
+    Yield (index, base64 WAV) per sentence, in order, as soon as each is synthesized.
+    Up to _prefetch sentences are queued ahead on the inference worker.
+    The model must be loaded with preload() first.
+    """
+    if not _pipeline:
+        raise RuntimeError("Kokoro TTS model is not loaded")
+
+    sentences = [s.strip() for s in sentences if s.strip()]
+    executor = _get_executor()
+    pending: deque[tuple[int, Future]] = deque()
+    next_index = 0
+
+    try:
+        while next_index < len(sentences) or pending:
+            while next_index < len(sentences) and len(pending) < _prefetch:
+                future = executor.submit(_synthesize_one, sentences[next_index])
+                pending.append((next_index, future))
+                next_index += 1
+            index, future = pending.popleft()
+            yield index, _encode_wav(future.result())
     except Exception as e:
         PrintStyle.error(f"Error in Kokoro TTS synthesis: {e}")
-        raise    
\ No newline at end of file
+        raise
+    finally:
+        for _, future in pending:  # client went away or failed, drop queued work
+            future.cancel()
+
+
+def split_sentences(text: str) -> list[str]:
+    parts = re.split(r"(?<=[.!?;:])\s+|\n+", text)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_max_workers, thread_name_prefix="kokoro-tts"
+        )
+    return _executor
+
+
+def _synthesize_one(sentence: str) -> np.ndarray:
+    segments = [
+        segment.audio.detach().cpu().numpy()  # type: ignore
+        for segment in _pipeline(sentence, voice=_voice, speed=_speed)  # type: ignore
+    ]
+    if not segments:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(segments).astype(np.float32, copy=False)
+
+
+def _encode_wav(audio: np.ndarray) -> str:
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, _sample_rate, format="WAV")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
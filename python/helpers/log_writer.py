@@ -0,0 +1,182 @@
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Callable
+
+QUEUE_SIZE = 10_000  # pending writes, further writes are dropped and counted
+BATCH_SIZE = 500  # writes joined into one file write
+FLUSH_INTERVAL = 0.5  # seconds, longest time a write waits in the queue
+MAX_BYTES = 20 * 1024 * 1024  # rotate when the file grows past this size
+MAX_AGE = 24 * 60 * 60  # seconds, rotate files older than this
+KEEP_ROTATED = 20  # compressed rotated files kept per directory
+
+
+class _Flush:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BufferedLogWriter:
+    """
+    Appends text to a log file from a background thread. write() only puts the text
+    on a bounded queue and never blocks, the thread writes queued texts in batches to a
+    file it keeps open. Files are rotated by size and age, rotated files are gzipped.
+    """
+
+    def __init__(
+        self,
+        logs_dir: str,
+        header: str = "",
+        footer: str = "",
+        name_format: str = "log_%Y%m%d_%H%M%S.html",
+        max_bytes: int = MAX_BYTES,
+        max_age: float = MAX_AGE,
+        keep_rotated: int = KEEP_ROTATED,
+        queue_size: int = QUEUE_SIZE,
+        dropped_note: Callable[[int], str] = lambda count: f"[{count} log messages dropped]\n",
+    ):
+        self.logs_dir = logs_dir
+        self.header = header
+        self.footer = footer
+        self.name_format = name_format
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.keep_rotated = keep_rotated
+        self.dropped_note = dropped_note
+        self.dropped = 0  # total since start
+        self._dropped_pending = 0  # not yet noted in the file
+        self._queue: "queue.Queue[str | _Flush | None]" = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._opened = 0.0
+        self._closed = False
+        self._lock = threading.Lock()
+        self.path = ""
+        self._open()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, text: str):
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(text)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._dropped_pending += 1
+
+    def flush(self, timeout: float = 5) -> bool:
+        """Wait until everything written so far is in the file"""
+        if self._closed or not self._thread.is_alive():
+            return False
+        marker = _Flush()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 5):
+        """Flush, write the footer and stop the thread, later writes are ignored"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    # writer thread
+
+    def _open(self):
+        os.makedirs(self.logs_dir, exist_ok=True)
+        path = os.path.join(self.logs_dir, datetime.now().strftime(self.name_format))
+        base, ext = os.path.splitext(path)
+        index = 1
+        while os.path.exists(path) or os.path.exists(path + ".gz"):
+            path = f"{base}_{index}{ext}"  # rotated within the same second
+            index += 1
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(self.header)
+        self._file.flush()
+        self._opened = time.monotonic()
+        self.path = path
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                if self._dropped_pending:
+                    self._write_batch([])
+                continue
+            batch: list[str] = []
+            markers: list[_Flush] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, _Flush):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception:
+                pass  # logging must not take the process down
+            for marker in markers:
+                marker.done.set()
+            if stop:
+                self._finish()
+                return
+
+    def _write_batch(self, batch: list[str]):
+        with self._lock:
+            dropped, self._dropped_pending = self._dropped_pending, 0
+        if dropped:
+            batch.append(self.dropped_note(dropped))
+        if not batch or not self._file:
+            return
+        self._file.write("".join(batch))
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes or time.monotonic() - self._opened >= self.max_age:
+            self._rotate()
+
+    def _rotate(self):
+        old_path = self.path
+        self._finish()
+        self._open()
+        # compress in its own thread, writes go on to the new file meanwhile
+        threading.Thread(target=self._compress, args=(old_path,), daemon=True).start()
+
+    def _finish(self):
+        if self._file:
+            self._file.write(self.footer)
+            self._file.close()
+            self._file = None
+
+    def _compress(self, path: str):
+        try:
+            with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+            rotated = sorted(
+                (name for name in os.listdir(self.logs_dir) if name.endswith(".gz")),
+                key=lambda name: os.path.getmtime(os.path.join(self.logs_dir, name)),
+            )
+            for name in rotated[: max(0, len(rotated) - self.keep_rotated)]:
+                os.remove(os.path.join(self.logs_dir, name))
+        except OSError:
+            pass
@@ -1,8 +1,14 @@
 from datetime import datetime
 from typing import Any, List, Sequence
-from langchain.storage import InMemoryByteStore, LocalFileStore
+from langchain.storage import InMemoryByteStore
 from langchain.embeddings import CacheBackedEmbeddings
 from python.helpers import guids
+from python.helpers.embedding_cache import (
+    CachedEmbeddings,
+    get_dimensions,
+    get_model_id,
+    set_dimensions,
+)
 
 # from langchain_chroma import Chroma
 from langchain_community.vectorstores import FAISS
@@ -18,7 +24,7 @@ from langchain_community.vectorstores.utils import (
 )
 from langchain_core.embeddings import Embeddings
 
-import os, json
+import asyncio, os, json, time, weakref
 
 import numpy as np
 
@@ -27,30 +33,18 @@ from . import files
 from langchain_core.documents import Document
 from python.helpers import knowledge_import
 from python.helpers.log import Log, LogItem
+from python.helpers.vector_db import MyFaiss
+from python.helpers import vector_index, disk_docstore
 from enum import Enum
 from agent import Agent
 import models
 import logging
-from simpleeval import simple_eval
 
 
 # Raise the log level so WARNING messages aren't shown
 logging.getLogger("langchain_core.vectorstores.base").setLevel(logging.ERROR)
 
 
-class MyFaiss(FAISS):
-    # override aget_by_ids
-    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
-        # return all self.docstore._dict[id] in ids
-        return [self.docstore._dict[id] for id in (ids if isinstance(ids, list) else [ids]) if id in self.docstore._dict]  # type: ignore
-
-    async def aget_by_ids(self, ids: Sequence[str], /) -> List[Document]:
-        return self.get_by_ids(ids)
-
-    def get_all_docs(self):
-        return self.docstore._dict  # type: ignore
-
-
 class Memory:
 
     class Area(Enum):
@@ -60,21 +54,55 @@ class Memory:
         INSTRUMENTS = "instruments"
 
     index: dict[str, "MyFaiss"] = {}
+    # loaded subdirs are evicted when idle or when too many are open, data is on disk
+    _last_used: dict[str, float] = {}
+    # evicted instances still used by a Memory wrapper, reused instead of loading a second one
+    _evicted: "weakref.WeakValueDictionary[str, MyFaiss]" = weakref.WeakValueDictionary()
+    MAX_LOADED_SUBDIRS = 8
+    IDLE_TIMEOUT = 30 * 60
+
+    @staticmethod
+    def _touch(memory_subdir: str):
+        now = time.time()
+        Memory._last_used[memory_subdir] = now
+        loaded = sorted(
+            (Memory._last_used.get(subdir, 0), subdir)
+            for subdir in Memory.index
+            if subdir != memory_subdir
+        )
+        excess = len(loaded) + 1 - Memory.MAX_LOADED_SUBDIRS
+        for i, (last_used, subdir) in enumerate(loaded):
+            if i < excess or now - last_used > Memory.IDLE_TIMEOUT:
+                db = Memory.index.pop(subdir, None)
+                Memory._last_used.pop(subdir, None)
+                if db is not None:
+                    Memory._evicted[subdir] = db
+        # the touched subdir is loaded again from an instance that is still referenced
+        if memory_subdir not in Memory.index:
+            db = Memory._evicted.pop(memory_subdir, None)
+            if db is not None:
+                Memory.index[memory_subdir] = db
 
     @staticmethod
     async def get(agent: Agent):
         memory_subdir = agent.config.memory_subdir or "default"
+        Memory._touch(memory_subdir)
         if Memory.index.get(memory_subdir) is None:
             log_item = agent.context.log.log(
                 type="util",
                 heading=f"Initializing VectorDB in '/{memory_subdir}'",
             )
-            db, created = Memory.initialize(
+            # loading, re-indexing or migrating the index can take a while
+            db, created = await asyncio.to_thread(
+                Memory.initialize,
                 log_item,
                 agent.config.embeddings_model,
                 memory_subdir,
                 False,
             )
+            if Memory.index.get(memory_subdir) is not None:
+                # loaded by a concurrent call meanwhile, use one instance per subdir
+                return Memory(db=Memory.index[memory_subdir], memory_subdir=memory_subdir)
             Memory.index[memory_subdir] = db
             wrap = Memory(db, memory_subdir=memory_subdir)
             if agent.config.knowledge_subdirs:
@@ -94,17 +122,22 @@ class Memory:
         log_item: LogItem | None = None,
         preload_knowledge: bool = True,
     ):
+        Memory._touch(memory_subdir)
         if not Memory.index.get(memory_subdir):
             import initialize
 
             agent_config = initialize.initialize_agent()
             model_config = agent_config.embeddings_model
-            db, _created = Memory.initialize(
+            db, _created = await asyncio.to_thread(
+                Memory.initialize,
                 log_item=log_item,
                 model_config=model_config,
                 memory_subdir=memory_subdir,
                 in_memory=False,
             )
+            if Memory.index.get(memory_subdir):
+                # loaded by a concurrent call meanwhile, use one instance per subdir
+                return Memory(db=Memory.index[memory_subdir], memory_subdir=memory_subdir)
             wrap = Memory(db, memory_subdir=memory_subdir)
             if preload_knowledge and agent_config.knowledge_subdirs:
                 await wrap.preload_knowledge(
@@ -118,6 +151,7 @@ class Memory:
         memory_subdir = agent.config.memory_subdir or "default"
         if Memory.index.get(memory_subdir):
             del Memory.index[memory_subdir]
+        Memory._evicted.pop(memory_subdir, None)
         return await Memory.get(agent)
 
     @staticmethod
@@ -133,33 +167,27 @@ class Memory:
         if log_item:
             log_item.stream(progress="\nInitializing VectorDB")
 
-        em_dir = files.get_abs_path(
-            "memory/embeddings"
-        )  # just caching, no need to parameterize
         db_dir = Memory._abs_db_dir(memory_subdir)
 
-        # make sure embeddings and database directories exist
+        # make sure database directory exists
         os.makedirs(db_dir, exist_ok=True)
 
-        if in_memory:
-            store = InMemoryByteStore()
-        else:
-            os.makedirs(em_dir, exist_ok=True)
-            store = LocalFileStore(em_dir)
-
         embeddings_model = models.get_embedding_model(
             model_config.provider,
             model_config.name,
             **model_config.build_kwargs(),
         )
-        embeddings_model_id = files.safe_file_name(
-            model_config.provider + "_" + model_config.name
-        )
+        embeddings_model_id = get_model_id(model_config.provider, model_config.name)
 
         # here we setup the embeddings model with the chosen cache storage
-        embedder = CacheBackedEmbeddings.from_bytes_store(
-            embeddings_model, store, namespace=embeddings_model_id
-        )
+        embedder: Embeddings
+        if in_memory:
+            embedder = CacheBackedEmbeddings.from_bytes_store(
+                embeddings_model, InMemoryByteStore(), namespace=embeddings_model_id
+            )
+        else:
+            # persistent cache shared across chats, subdirs and document queries
+            embedder = CachedEmbeddings(embeddings_model, embeddings_model_id)
 
         # initial DB and docs variables
         db: MyFaiss | None = None
@@ -168,7 +196,18 @@ class Memory:
         created = False
 
         # if db folder exists and is not empty:
-        if os.path.exists(db_dir) and files.exists(db_dir, "index.faiss"):
+        if files.exists(db_dir, disk_docstore.FILE_NAME) and files.exists(
+            db_dir, "index_map.json"
+        ):
+            # mmap the vectors, documents are read from sqlite on demand
+            db = MyFaiss.load_lazy(
+                db_dir,
+                embedder,
+                distance_strategy=DistanceStrategy.COSINE,
+                # normalize_L2=True,
+                relevance_score_fn=Memory._cosine_normalizer,
+            )
+        elif os.path.exists(db_dir) and files.exists(db_dir, "index.faiss"):
             db = MyFaiss.load_local(
                 folder_path=db_dir,
                 embeddings=embedder,
@@ -177,7 +216,10 @@ class Memory:
                 # normalize_L2=True,
                 relevance_score_fn=Memory._cosine_normalizer,
             )  # type: ignore
+            if not in_memory:
+                Memory._migrate_to_disk_docstore(db, memory_subdir)
 
+        if db:
             # if there is a mismatch in embeddings used, re-index the whole DB
             emb_ok = False
             emb_set_file = files.get_abs_path(db_dir, "embedding.json")
@@ -189,20 +231,32 @@ class Memory:
                 ):
                     # model matches
                     emb_ok = True
+                    # remember dimensions so new indexes need no probing
+                    set_dimensions(embeddings_model_id, db.index.d)
 
             # re-index -  create new DB and insert existing docs
             if db and not emb_ok:
-                docs = db.get_all_docs()
+                docs = dict(db.get_all_docs().items())
                 db = None
 
         # DB not loaded, create one
         if not db:
-            index = faiss.IndexFlatIP(len(embedder.embed_query("example")))
+            dimensions = get_dimensions(embeddings_model_id, embedder)
+            index = faiss.IndexFlatIP(dimensions)
+
+            docstore: InMemoryDocstore | disk_docstore.SqliteDocstore
+            if in_memory:
+                docstore = InMemoryDocstore()
+            else:
+                docstore = disk_docstore.SqliteDocstore(
+                    files.get_abs_path(db_dir, disk_docstore.FILE_NAME)
+                )
+                docstore.clear()  # documents of a previous index are re-added below
 
             db = MyFaiss(
                 embedding_function=embedder,
                 index=index,
-                docstore=InMemoryDocstore(),
+                docstore=docstore,
                 index_to_docstore_id={},
                 distance_strategy=DistanceStrategy.COSINE,
                 # normalize_L2=True,
@@ -226,12 +280,20 @@ class Memory:
                     {
                         "model_provider": model_config.provider,
                         "model_name": model_config.name,
+                        "dimensions": dimensions,
                     }
                 ),
             )
 
             created = True
 
+        # approximate index type per memory subdir, migrated once the threshold is crossed
+        db.index_config = vector_index.load_config(db_dir)
+        if db.maybe_migrate_index():
+            if log_item:
+                log_item.stream(progress="\nMigrated vector index")
+            Memory._save_db_file(db, memory_subdir)
+
         return db, created
 
     def __init__(
@@ -264,19 +326,29 @@ class Memory:
                 index = json.load(f)
 
         # preload knowledge folders
-        index = self._preload_knowledge_folders(log_item, kn_dirs, index)
+        # hashing and parsing waits on worker processes, keep the event loop free meanwhile
+        index = await asyncio.to_thread(
+            self._preload_knowledge_folders, log_item, kn_dirs, index
+        )
 
-        for file in index:
-            if index[file]["state"] in ["changed", "removed"] and index[file].get(
-                "ids", []
-            ):  # for knowledge files that have been changed or removed and have IDs
-                await self.delete_documents_by_ids(
-                    index[file]["ids"]
-                )  # remove original version
-            if index[file]["state"] == "changed":
-                index[file]["ids"] = await self.insert_documents(
-                    index[file]["documents"]
-                )  # insert new version
+        # remove original versions of changed and removed files, all at once
+        rem_ids = [
+            id
+            for file in index.values()
+            if file["state"] in ["changed", "removed"]
+            for id in file.get("ids", [])
+        ]
+        if rem_ids:
+            await self.delete_documents_by_ids(rem_ids)
+
+        # insert new versions, embedded in large batches across files
+        changed = [file for file in index.values() if file["state"] == "changed"]
+        ids = await self.insert_documents_batched(
+            [doc for file in changed for doc in file["documents"]], log_item=log_item
+        )
+        for file in changed:
+            count = len(file["documents"])
+            file["ids"], ids = ids[:count], ids[count:]
 
         # remove index where state="removed"
         index = {k: v for k, v in index.items() if v["state"] != "removed"}
@@ -323,14 +395,24 @@ class Memory:
     async def search_similarity_threshold(
         self, query: str, limit: int, threshold: float, filter: str = ""
     ):
-        comparator = Memory._get_comparator(filter) if filter else None
-
-        return await self.db.asearch(
-            query,
-            search_type="similarity_score_threshold",
-            k=limit,
-            score_threshold=threshold,
-            filter=comparator,
+        # filter is compiled once and applied as a faiss id selector before the search
+        return await self.db.asearch_threshold(
+            query, k=limit, threshold=threshold, filter=filter
+        )
+
+    async def search_similarity_threshold_by_filters(
+        self, query: str, limits: dict[str, int], threshold: float
+    ) -> dict[str, list[Document]]:
+        # one embedding and one faiss search for several filters, each with its own limit
+        embedding = await self.db._aembed_query(query)
+        return self.db.search_vector_threshold_by_filters(embedding, limits, threshold)
+
+    async def search_similarity_threshold_many(
+        self, queries: list[str], limit: int, threshold: float, filter: str = ""
+    ) -> list[list[Document]]:
+        # all queries embedded in one batch and searched in one faiss call
+        return await self.db.asearch_threshold_many(
+            queries, k=limit, threshold=threshold, filter=filter
         )
 
     async def delete_documents_by_query(
@@ -364,7 +446,7 @@ class Memory:
                 break
 
         if tot:
-            self._save_db()  # persist
+            await self._save_db()  # persist
         return removed
 
     async def delete_documents_by_ids(self, ids: list[str]):
@@ -377,7 +459,7 @@ class Memory:
             await self.db.adelete(ids=rem_ids)
 
         if rem_docs:
-            self._save_db()  # persist
+            await self._save_db()  # persist
         return rem_docs
 
     async def insert_text(self, text, metadata: dict = {}):
@@ -397,17 +479,84 @@ class Memory:
                     doc.metadata["area"] = Memory.Area.MAIN.value
 
             await self.db.aadd_documents(documents=docs, ids=ids)
-            self._save_db()  # persist
+            await self._save_db()  # persist
+        return ids
+
+    def batch(self) -> "MemoryBatch":
+        return MemoryBatch(self)
+
+    async def apply_changes(self, delete_ids: list[str], docs: list[Document]):
+        """Delete and insert documents with a single embedding call and a single save."""
+        rem_docs = await self.db.aget_by_ids(delete_ids) if delete_ids else []
+        if rem_docs:
+            await self.db.adelete(ids=[doc.metadata["id"] for doc in rem_docs])
+        if docs:
+            timestamp = self.get_timestamp()
+            for doc in docs:
+                doc.metadata.setdefault("id", self._generate_doc_id())
+                doc.metadata["timestamp"] = timestamp
+                if not doc.metadata.get("area", ""):
+                    doc.metadata["area"] = Memory.Area.MAIN.value
+            await self.db.aadd_documents(
+                documents=docs, ids=[doc.metadata["id"] for doc in docs]
+            )
+        if rem_docs or docs:
+            await self._save_db()  # persist
+        return rem_docs
+
+    async def insert_documents_batched(
+        self,
+        docs: list[Document],
+        batch_size: int = 512,
+        log_item: LogItem | None = None,
+    ):
+        """insert_documents for large imports, embedded in batches with progress and saved once."""
+        ids = [self._generate_doc_id() for _ in range(len(docs))]
+        timestamp = self.get_timestamp()
+        for doc, id in zip(docs, ids):
+            doc.metadata["id"] = id
+            doc.metadata["timestamp"] = timestamp
+            if not doc.metadata.get("area", ""):
+                doc.metadata["area"] = Memory.Area.MAIN.value
+
+        for start in range(0, len(docs), batch_size):
+            end = min(start + batch_size, len(docs))
+            await self.db.aadd_documents(documents=docs[start:end], ids=ids[start:end])
+            if log_item and len(docs) > batch_size:
+                log_item.stream(progress=f"\nEmbedded {end}/{len(docs)} knowledge chunks")
+
+        if ids:
+            await self._save_db()  # persist
         return ids
 
     async def update_documents(self, docs: list[Document]):
         ids = [doc.metadata["id"] for doc in docs]
         await self.db.adelete(ids=ids)  # delete originals
         ins = await self.db.aadd_documents(documents=docs, ids=ids)  # add updated
-        self._save_db()  # persist
+        await self._save_db()  # persist
         return ins
 
-    def _save_db(self):
+    @staticmethod
+    def _migrate_to_disk_docstore(db: MyFaiss, memory_subdir: str):
+        # convert a pickled InMemoryDocstore to the sqlite docstore, once
+        db_dir = Memory._abs_db_dir(memory_subdir)
+        docstore = disk_docstore.SqliteDocstore(
+            files.get_abs_path(db_dir, disk_docstore.FILE_NAME)
+        )
+        docstore.clear()
+        docstore.add(dict(db.get_all_docs().items()))
+        db.docstore = docstore
+        Memory._save_db_file(db, memory_subdir)
+        pickle_path = files.get_abs_path(db_dir, "index.pkl")
+        if os.path.exists(pickle_path):
+            os.remove(pickle_path)
+
+    async def _save_db(self):
+        # train the approximate index when grown large enough, or compact deleted vectors,
+        # built in a worker thread from a snapshot and swapped in here
+        snapshot = self.db.prepare_rebuild()
+        if snapshot is not None:
+            self.db.apply_rebuild(await asyncio.to_thread(self.db.build_rebuild, snapshot))
         Memory._save_db_file(self.db, self.memory_subdir)
 
     def _generate_doc_id(self):
@@ -421,18 +570,6 @@ class Memory:
         abs_dir = Memory._abs_db_dir(memory_subdir)
         db.save_local(folder_path=abs_dir)
 
-    @staticmethod
-    def _get_comparator(condition: str):
-        def comparator(data: dict[str, Any]):
-            try:
-                result = simple_eval(condition, names=data)
-                return result
-            except Exception as e:
-                PrintStyle.error(f"Error evaluating condition: {e}")
-                return False
-
-        return comparator
-
     @staticmethod
     def _score_normalizer(val: float) -> float:
         res = 1 - 1 / (1 + np.exp(val))
@@ -466,6 +603,42 @@ class Memory:
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+class MemoryBatch:
+    """
+    Collects inserts and deletes with the same calls as Memory and applies them
+    together on commit(), so concurrent writers share one embedding call and one save.
+    Reads go to the committed database.
+    """
+
+    def __init__(self, memory: Memory):
+        self.memory = memory
+        self.db = memory.db
+        self.inserts: list[Document] = []
+        self.deletes: set[str] = set()
+
+    async def insert_text(self, text, metadata: dict = {}):
+        doc = Document(text, metadata=dict(metadata))
+        doc.metadata["id"] = self.memory._generate_doc_id()
+        self.inserts.append(doc)
+        return doc.metadata["id"]
+
+    async def delete_documents_by_ids(self, ids: list[str]):
+        # a memory claimed by one writer is not removed twice
+        rem_docs = [
+            doc
+            for doc in await self.db.aget_by_ids(ids)
+            if doc.metadata["id"] not in self.deletes
+        ]
+        self.deletes.update(doc.metadata["id"] for doc in rem_docs)
+        return rem_docs
+
+    async def commit(self):
+        inserts, deletes = self.inserts, list(self.deletes)
+        self.inserts, self.deletes = [], set()
+        await self.memory.apply_changes(deletes, inserts)
+        return [doc.metadata["id"] for doc in inserts]
+
+
 def get_memory_subdir_abs(agent: Agent) -> str:
     return files.get_abs_path("memory", agent.config.memory_subdir or "default")
 
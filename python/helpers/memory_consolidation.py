@@ -7,7 +7,7 @@ from enum import Enum
 
 from langchain_core.documents import Document
 
-from python.helpers.memory import Memory
+from python.helpers.memory import Memory, MemoryBatch
 from python.helpers.dirty_json import DirtyJson
 from python.helpers.log import LogItem
 from python.helpers.print_style import PrintStyle
@@ -124,6 +124,95 @@ class MemoryConsolidator:
         # Step 1: Discover similar memories
         similar_memories = await self._find_similar_memories(new_memory, area, log_item)
 
+        db = await Memory.get(self.agent)
+        return await self._consolidate(db, new_memory, area, metadata, similar_memories, log_item)
+
+    async def process_new_memories(
+        self,
+        memories: List[Dict[str, Any]],
+        concurrency: int = 4,
+        log_item: Optional[LogItem] = None
+    ) -> List[dict]:
+        """
+        Process several new memories together.
+
+        Keyword extraction and LLM analysis run concurrently under a limit, all search
+        queries of one area are embedded in one batch and searched in one faiss call,
+        and the resulting inserts and deletes are committed in one write.
+
+        Args:
+            memories: List of {"content": str, "area": str, "metadata": dict}
+            concurrency: Maximum utility LLM calls in flight
+            log_item: Optional log item for progress tracking
+
+        Returns:
+            list: {"success": bool, "memory_ids": [str, ...]} per memory
+        """
+        if not memories:
+            return []
+        db = await Memory.get(self.agent)
+        batch = db.batch()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+
+        # Step 1: Search queries for all memories
+        queries = await asyncio.gather(
+            *[limited(self._extract_search_keywords(m["content"])) for m in memories]
+        )
+
+        # Step 2: Vectorized similarity search
+        similar = await self._find_similar_memories_many(db, memories, list(queries))
+        if log_item:
+            log_item.update(
+                progress=f"Analyzing {len(memories)} memories...",
+                similar_memories_count=sum(len(s) for s in similar)
+            )
+
+        # Step 3: Consolidation decisions, changes are collected in the batch
+        async def consolidate(memory: Dict[str, Any], similar_memories: List[Document]):
+            try:
+                return await asyncio.wait_for(
+                    self._consolidate(
+                        batch,
+                        memory["content"],
+                        memory["area"],
+                        dict(memory.get("metadata", {})),
+                        similar_memories,
+                    ),
+                    timeout=self.config.processing_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                PrintStyle().error(f"Memory consolidation timeout for area {memory['area']}")
+            except Exception as e:
+                PrintStyle().error(f"Memory consolidation error for area {memory['area']}: {str(e)}")
+            return {"success": False, "memory_ids": []}
+
+        results = await asyncio.gather(
+            *[limited(consolidate(m, sim)) for m, sim in zip(memories, similar)]
+        )
+
+        # Step 4: Commit all changes at once
+        try:
+            await batch.commit()
+        except Exception as e:
+            PrintStyle().error(f"Memory consolidation commit failed: {str(e)}")
+            return [{"success": False, "memory_ids": []} for _ in memories]
+        return list(results)
+
+    async def _consolidate(
+        self,
+        db: "Memory | MemoryBatch",
+        new_memory: str,
+        area: str,
+        metadata: Dict[str, Any],
+        similar_memories: List[Document],
+        log_item: Optional[LogItem] = None
+    ) -> dict:
+        """Validate similar memories, analyze with LLM and apply the decision to db."""
+
         # this block always returns
         if not similar_memories:
             # No similar memories found, insert directly
@@ -133,7 +222,6 @@ class MemoryConsolidator:
                     temp=True
                 )
             try:
-                db = await Memory.get(self.agent)
                 if 'timestamp' not in metadata:
                     metadata['timestamp'] = self._get_timestamp()
                 memory_id = await db.insert_text(new_memory, metadata)
@@ -162,7 +250,6 @@ class MemoryConsolidator:
             memory_ids_to_check = [doc.metadata.get('id') for doc in similar_memories if doc.metadata.get('id')]
             # Filter out None values and ensure all IDs are strings
             memory_ids_to_check = [str(id) for id in memory_ids_to_check if id is not None]
-            db = await Memory.get(self.agent)
             still_existing = db.db.get_by_ids(memory_ids_to_check)
             existing_ids = {doc.metadata.get('id') for doc in still_existing}
 
@@ -188,7 +275,6 @@ class MemoryConsolidator:
                     temp=True
                 )
             try:
-                db = await Memory.get(self.agent)
                 if 'timestamp' not in metadata:
                     metadata['timestamp'] = self._get_timestamp()
                 memory_id = await db.insert_text(new_memory, metadata)
@@ -223,7 +309,6 @@ class MemoryConsolidator:
                     temp=True
                 )
             try:
-                db = await Memory.get(self.agent)
                 if 'timestamp' not in metadata:
                     metadata['timestamp'] = self._get_timestamp()
                 memory_id = await db.insert_text(new_memory, metadata)
@@ -243,6 +328,7 @@ class MemoryConsolidator:
 
         # Step 4: Apply consolidation decisions
         memory_ids = await self._apply_consolidation_result(
+            db,
             consolidation_result,
             area,
             analysis_context.existing_metadata,  # Pass original metadata
@@ -269,7 +355,7 @@ class MemoryConsolidator:
 
     async def _gather_consolidated_metadata(
         self,
-        db: Memory,
+        db: "Memory | MemoryBatch",
         result: ConsolidationResult,
         original_metadata: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -363,16 +449,56 @@ class MemoryConsolidator:
                 )
                 all_similar.extend(keyword_similar)
 
-        # Step 4: Deduplicate by document ID and store similarity info
+        return self._rank_similar(all_similar)
+
+    async def _find_similar_memories_many(
+        self,
+        db: Memory,
+        memories: List[Dict[str, Any]],
+        queries: List[List[str]]
+    ) -> List[List[Document]]:
+        """
+        Similar memories for several new memories, same searches as _find_similar_memories
+        but all queries of one area are embedded in one batch and searched in one faiss call.
+        """
+        results: List[List[Document]] = [[] for _ in memories]
+        areas = {m["area"] for m in memories}
+        for area in areas:
+            # (memory index, query, limit) for the semantic and keyword searches
+            searches = []
+            for i, memory in enumerate(memories):
+                if memory["area"] != area:
+                    continue
+                searches.append((i, memory["content"], self.config.max_similar_memories))
+                keywords = [q.strip() for q in queries[i] if q.strip()]
+                for query in keywords:
+                    limit = max(3, self.config.max_similar_memories // max(1, len(keywords)))
+                    searches.append((i, query, limit))
+
+            found = await db.search_similarity_threshold_many(
+                queries=[query for _, query, _ in searches],
+                limit=max(limit for _, _, limit in searches),
+                threshold=self.config.similarity_threshold,
+                filter=f"area == '{area}'"
+            )
+            for (i, _, limit), docs in zip(searches, found):
+                results[i].extend(docs[:limit])
+
+        return [self._rank_similar(docs) for docs in results]
+
+    def _rank_similar(self, all_similar: List[Document]) -> List[Document]:
+        """Deduplicate search results, estimate similarity scores and limit for LLM context."""
+        # Step 1: Deduplicate by document ID and store similarity info
         seen_ids = set()
         unique_similar = []
         for doc in all_similar:
             doc_id = doc.metadata.get('id')
             if doc_id and doc_id not in seen_ids:
                 seen_ids.add(doc_id)
-                unique_similar.append(doc)
+                # copy, the same document can be found for several new memories
+                unique_similar.append(Document(doc.page_content, metadata=dict(doc.metadata)))
 
-        # Step 5: Calculate similarity scores for replacement validation
+        # Step 2: Calculate similarity scores for replacement validation
         # Since FAISS doesn't directly expose similarity scores, use ranking-based estimation
         # CRITICAL: All documents must have similarity >= search_threshold since FAISS returned them
         # FIXED: Use conservative scoring that keeps all scores in safe consolidation range
@@ -400,14 +526,14 @@ class MemoryConsolidator:
 
                 similarity_scores[doc_id] = ranking_similarity
 
-        # Step 6: Add similarity score to document metadata for LLM analysis
+        # Step 3: Add similarity score to document metadata for LLM analysis
         for doc in unique_similar:
             doc_id = doc.metadata.get('id')
             estimated_similarity = similarity_scores.get(doc_id, 0.7)
             # Store for later validation
             doc.metadata['_consolidation_similarity'] = estimated_similarity
 
-        # Step 7: Limit to max context for LLM
+        # Step 4: Limit to max context for LLM
         limited_similar = unique_similar[:self.config.max_llm_context_memories]
 
         return limited_similar
@@ -534,6 +660,7 @@ class MemoryConsolidator:
 
     async def _apply_consolidation_result(
         self,
+        db: "Memory | MemoryBatch",
         result: ConsolidationResult,
         area: str,
         original_metadata: Dict[str, Any],  # Add original metadata parameter
@@ -542,8 +669,6 @@ class MemoryConsolidator:
         """Apply the consolidation decisions to the memory database."""
 
         try:
-            db = await Memory.get(self.agent)
-
             # Retrieve metadata from memories being consolidated to preserve important fields
             consolidated_metadata = await self._gather_consolidated_metadata(db, result, original_metadata)
 
@@ -571,7 +696,7 @@ class MemoryConsolidator:
 
     async def _handle_keep_separate(
         self,
-        db: Memory,
+        db: "Memory | MemoryBatch",
         result: ConsolidationResult,
         area: str,
         original_metadata: Dict[str, Any],  # Add original metadata parameter
@@ -601,7 +726,7 @@ class MemoryConsolidator:
 
     async def _handle_merge(
         self,
-        db: Memory,
+        db: "Memory | MemoryBatch",
         result: ConsolidationResult,
         area: str,
         original_metadata: Dict[str, Any],  # Add original metadata parameter
@@ -636,7 +761,7 @@ class MemoryConsolidator:
 
     async def _handle_replace(
         self,
-        db: Memory,
+        db: "Memory | MemoryBatch",
         result: ConsolidationResult,
         area: str,
         original_metadata: Dict[str, Any],  # Add original metadata parameter
@@ -714,7 +839,7 @@ class MemoryConsolidator:
 
     async def _handle_update(
         self,
-        db: Memory,
+        db: "Memory | MemoryBatch",
         result: ConsolidationResult,
         area: str,
         original_metadata: Dict[str, Any],  # Add original metadata parameter
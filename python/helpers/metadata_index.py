@@ -0,0 +1,340 @@
+import ast
+import bisect
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+
+
+# metadata keys with inverted maps for equality lookups
+EQUALITY_FIELDS = ("area", "knowledge_source", "document_uri", "source_file")
+# metadata keys with sorted lists for range and prefix lookups
+RANGE_FIELDS = ("timestamp", "import_timestamp")
+
+# string methods allowed in filters, e.g. timestamp.startswith('2024-01')
+ALLOWED_METHODS = ("startswith", "endswith", "lower", "upper", "strip")
+
+Candidates = set[str] | None  # None means the index can not narrow the search
+
+
+class MetadataIndex:
+    """
+    Inverted maps over document metadata, used to resolve filters to a set of
+    document ids before a similarity search instead of evaluating every document.
+    """
+
+    def __init__(self):
+        self.values: dict[str, dict[Any, set[str]]] = {f: {} for f in EQUALITY_FIELDS}
+        self.ranges: dict[str, list[tuple[str, str]]] = {f: [] for f in RANGE_FIELDS}
+
+    def add(self, doc_id: str, metadata: dict[str, Any]):
+        for field in EQUALITY_FIELDS:
+            value = metadata.get(field)
+            if value is None:
+                continue
+            try:
+                self.values[field].setdefault(value, set()).add(doc_id)
+            except TypeError:
+                pass  # unhashable values are only reachable through a scan
+        for field in RANGE_FIELDS:
+            value = metadata.get(field)
+            if isinstance(value, str):
+                bisect.insort(self.ranges[field], (value, doc_id))
+
+    def remove(self, doc_id: str, metadata: dict[str, Any]):
+        for field in EQUALITY_FIELDS:
+            value = metadata.get(field)
+            try:
+                ids = self.values[field].get(value)
+            except TypeError:
+                continue
+            if ids:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.values[field][value]
+        for field in RANGE_FIELDS:
+            value = metadata.get(field)
+            if isinstance(value, str):
+                entries = self.ranges[field]
+                pos = bisect.bisect_left(entries, (value, doc_id))
+                if pos < len(entries) and entries[pos] == (value, doc_id):
+                    del entries[pos]
+
+    def equal(self, field: str, value: Any) -> set[str]:
+        try:
+            return set(self.values[field].get(value, ()))
+        except TypeError:
+            return set()
+
+    def range(
+        self,
+        field: str,
+        low: str | None = None,
+        high: str | None = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+    ) -> set[str]:
+        entries = self.ranges[field]
+        start, end = 0, len(entries)
+        if low is not None:
+            # (low, "") sorts before any (low, id), (low, "\uffff") after them
+            key = (low, "") if low_inclusive else (low, "\uffff")
+            start = bisect.bisect_left(entries, key)
+        if high is not None:
+            key = (high, "\uffff") if high_inclusive else (high, "")
+            end = bisect.bisect_left(entries, key)
+        return {doc_id for _, doc_id in entries[start:end]}
+
+
+class MetadataFilter:
+    """Filter expression compiled once into a matcher and an index lookup plan."""
+
+    def __init__(
+        self,
+        expression: str,
+        matcher: Callable[[dict[str, Any]], bool],
+        planner: Callable[[MetadataIndex], Candidates],
+    ):
+        self.expression = expression
+        self._matcher = matcher
+        self._planner = planner
+
+    def matches(self, metadata: dict[str, Any]) -> bool:
+        try:
+            return bool(self._matcher(metadata))
+        except Exception:
+            # missing keys or incomparable types do not match, as with eval before
+            return False
+
+    def candidates(self, index: MetadataIndex) -> Candidates:
+        return self._planner(index)
+
+    def select(
+        self,
+        index: MetadataIndex,
+        all_metadata: Callable[[], Iterable[tuple[str, dict[str, Any]]]],
+        get_metadata: Callable[[str], dict[str, Any] | None],
+        limit: int = 0,
+    ) -> list[str]:
+        """Ids of matching documents, narrowed by the index and verified by the matcher."""
+        ids = self.candidates(index)
+        if ids is None:
+            entries = all_metadata()  # index can not narrow it, scan everything
+        else:
+            entries = ((doc_id, get_metadata(doc_id)) for doc_id in ids)
+        result = []
+        for doc_id, metadata in entries:
+            if metadata is not None and self.matches(metadata):
+                result.append(doc_id)
+                if limit > 0 and len(result) >= limit:
+                    break
+        return result
+
+
+class _Missing(Exception):
+    pass
+
+
+@lru_cache(maxsize=256)
+def compile_filter(expression: str) -> MetadataFilter:
+    """Compiled filter expression, raises ValueError for an invalid one (not cached)"""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+        matcher, planner = _compile(tree.body)
+    except Exception as e:
+        raise ValueError(f"Invalid filter '{expression}': {e}") from e
+    return MetadataFilter(expression, matcher, planner)
+
+
+def _none(index: MetadataIndex) -> Candidates:
+    return None
+
+
+def _compile(node: ast.AST):
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(v) for v in node.values]
+        matchers = [m for m, _ in parts]
+        planners = [p for _, p in parts]
+        if isinstance(node.op, ast.And):
+            return (
+                lambda md: all(m(md) for m in matchers),
+                lambda index: _intersect(p(index) for p in planners),
+            )
+        return (
+            lambda md: any(m(md) for m in matchers),
+            lambda index: _union(p(index) for p in planners),
+        )
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        inner, _ = _compile(node.operand)
+        return (lambda md: not inner(md)), _none
+
+    if isinstance(node, ast.Compare):
+        return _compile_compare(node)
+
+    if isinstance(node, ast.Call):
+        return _compile_call(node)
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        getter = _value(node)
+        planner = _none
+        if name in EQUALITY_FIELDS:
+            planner = lambda index: _union(
+                index.equal(name, v) for v in list(index.values[name]) if v
+            )
+        return (lambda md: bool(getter(md))), planner
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return (lambda md: bool(value)), (
+            _none if value else (lambda index: set())
+        )
+
+    raise ValueError(f"unsupported expression '{ast.dump(node)}'")
+
+
+def _compile_compare(node: ast.Compare):
+    operands = [node.left, *node.comparators]
+    getters = [_value(o) for o in operands]
+    ops = [_OPERATORS[type(op)] for op in node.ops]
+
+    def matcher(md):
+        values = [g(md) for g in getters]
+        return all(
+            op(values[i], values[i + 1]) for i, op in enumerate(ops)
+        )
+
+    planners = [
+        _plan_compare(operands[i], node.ops[i], operands[i + 1])
+        for i in range(len(ops))
+    ]
+    return matcher, lambda index: _intersect(p(index) for p in planners)
+
+
+def _plan_compare(left: ast.AST, op: ast.cmpop, right: ast.AST):
+    # normalize to field <op> constant, membership is not symmetric
+    if (
+        isinstance(right, ast.Name)
+        and not isinstance(left, ast.Name)
+        and type(op) in _MIRRORED
+    ):
+        left, right = right, left
+        op = _MIRRORED[type(op)]
+    if not isinstance(left, ast.Name):
+        return _none
+    field = left.id
+    try:
+        value = ast.literal_eval(right)
+    except Exception:
+        return _none
+
+    if isinstance(op, ast.Eq) and field in EQUALITY_FIELDS:
+        return lambda index: index.equal(field, value)
+    if isinstance(op, ast.In) and field in EQUALITY_FIELDS and isinstance(
+        value, (list, tuple, set)
+    ):
+        return lambda index: _union(index.equal(field, v) for v in value)
+    if field in RANGE_FIELDS and isinstance(value, str):
+        if isinstance(op, ast.Eq):
+            return lambda index: index.range(field, value, value)
+        if isinstance(op, ast.Lt):
+            return lambda index: index.range(field, high=value, high_inclusive=False)
+        if isinstance(op, ast.LtE):
+            return lambda index: index.range(field, high=value)
+        if isinstance(op, ast.Gt):
+            return lambda index: index.range(field, low=value, low_inclusive=False)
+        if isinstance(op, ast.GtE):
+            return lambda index: index.range(field, low=value)
+    return _none
+
+
+def _compile_call(node: ast.Call):
+    func = node.func
+    if (
+        not isinstance(func, ast.Attribute)
+        or func.attr not in ALLOWED_METHODS
+        or node.keywords
+    ):
+        raise ValueError("only string methods like startswith() are supported")
+    target = _value(func.value)
+    args = [ast.literal_eval(a) for a in node.args]
+    method = func.attr
+
+    def call(md):
+        value = target(md)
+        if not isinstance(value, str):
+            raise TypeError(f"{method}() requires a string")
+        return getattr(value, method)(*args)
+
+    planner = _none
+    if (
+        method == "startswith"
+        and isinstance(func.value, ast.Name)
+        and func.value.id in RANGE_FIELDS
+        and len(args) == 1
+        and isinstance(args[0], str)
+    ):
+        field, prefix = func.value.id, args[0]
+        planner = lambda index: index.range(
+            field, prefix, prefix + "\uffff", high_inclusive=False
+        )
+    return call, planner
+
+
+def _value(node: ast.AST) -> Callable[[dict[str, Any]], Any]:
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in ("True", "False", "None"):
+            const = {"True": True, "False": False, "None": None}[name]
+            return lambda md: const
+
+        def get(md):
+            if name not in md:
+                raise _Missing(name)
+            return md[name]
+
+        return get
+    if isinstance(node, ast.Call):
+        call, _ = _compile_call(node)
+        return call
+    value = ast.literal_eval(node)
+    return lambda md: value
+
+
+def _intersect(results: Iterable[Candidates]) -> Candidates:
+    current: Candidates = None
+    for ids in results:
+        if ids is None:
+            continue
+        current = ids if current is None else current & ids
+    return current
+
+
+def _union(results: Iterable[Candidates]) -> Candidates:
+    current: set[str] = set()
+    for ids in results:
+        if ids is None:
+            return None
+        current |= ids
+    return current
+
+
+_OPERATORS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Is: lambda a, b: a is b,
+    ast.IsNot: lambda a, b: a is not b,
+}
+
+_MIRRORED = {
+    ast.Eq: ast.Eq(),
+    ast.Lt: ast.Gt(),
+    ast.LtE: ast.GtE(),
+    ast.Gt: ast.Lt(),
+    ast.GtE: ast.LtE(),
+}
@@ -1,17 +1,58 @@
 from collections import OrderedDict
 from datetime import datetime
 from typing import Any
+import os
+import threading
+import time
 import uuid
 from agent import Agent, AgentConfig, AgentContext, AgentContextType
 from python.helpers import files, history
 import json
 from initialize import initialize_agent
 
+from python.helpers.localization import Localization
 from python.helpers.log import Log, LogItem
 
 CHATS_FOLDER = "tmp/chats"
 LOG_SIZE = 1000
 CHAT_FILE_NAME = "chat.json"
+NAME_FILE_NAME = "name.json"  # name changed since the last full save
+INDEX_FILE = "tmp/chat_index.json"  # outside CHATS_FOLDER, json files there are taken for v0.8 chats
+INDEX_VERSION = 1
+IDLE_TIMEOUT = 30 * 60  # seconds without access before a saved chat is evicted from memory
+
+# summary of every chat on disk, id -> entry (see _index_entry), kept in INDEX_FILE
+_index: dict[str, dict] = {}
+_index_loaded = False
+_index_dirty = False
+# entries of chats listed for the logged in user(s) that are not in memory yet
+_unloaded: dict[str, dict] = {}
+_index_lock = threading.RLock()
+
+
+class SavedChat:
+    """A chat that is on disk and not loaded, listed in place of its context until accessed"""
+
+    def __init__(self, entry: dict):
+        self.id = entry["id"]
+        self.name = entry.get("name")
+        self.type = AgentContextType(entry.get("type", AgentContextType.USER.value))
+        self.metadata = {"owner": entry.get("owner")} if entry.get("owner") else {}
+        self.entry = entry
+
+    def serialize(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "created_at": Localization.get().serialize_datetime(_parse_time(self.entry.get("created_at"))),
+            "no": 0,
+            "log_guid": self.entry.get("log_guid", ""),
+            "log_version": 0,
+            "log_length": self.entry.get("log_length", 0),
+            "paused": False,
+            "last_message": Localization.get().serialize_datetime(_parse_time(self.entry.get("last_message"))),
+            "type": self.type.value,
+        }
 
 
 def get_user_chats_folder(username: str):
@@ -58,6 +99,32 @@ def save_tmp_chat(context: AgentContext, username: str | None = None):
     js = _safe_json_serialize(data, ensure_ascii=False)
     files.write_file(path, js)
 
+    # the name is part of the full save now
+    name_path = _get_name_file_path(path)
+    if os.path.exists(name_path):
+        os.remove(name_path)
+
+    if owner:
+        _update_index(_index_entry(data, owner, path))
+
+
+def save_tmp_chat_name(context: AgentContext):
+    """Save only the chat name, without serializing the whole context"""
+    if context.type == AgentContextType.BACKGROUND:
+        return
+    owner = context.metadata.get("owner") if hasattr(context, "metadata") else None
+    path = _get_chat_file_path(context.id, owner)
+    if not os.path.exists(path):
+        return save_tmp_chat(context)  # nothing to patch yet
+    name_path = _get_name_file_path(path)
+    files.write_file(name_path, json.dumps({"name": context.name}, ensure_ascii=False))
+    with _index_lock:
+        entry = _index.get(context.id)
+        if entry:
+            entry["name"] = context.name
+            entry["name_mtime"] = os.stat(name_path).st_mtime_ns
+            _mark_index_dirty()
+
 
 def save_tmp_chats():
     """Save all contexts to the chats folder"""
@@ -84,6 +151,10 @@ def unload_user_chats(username: str | None = None):
             del AgentContext._contexts[ctx_id]
         except Exception:
             pass
+    with _index_lock:
+        for ctx_id, entry in list(_unloaded.items()):
+            if _is_user_chat(entry, username):
+                del _unloaded[ctx_id]
     print(f"Unloaded {len(to_remove)} chats for user {username}")
 
 
@@ -100,13 +171,18 @@ def unload_all_chats():
             del AgentContext._contexts[ctx_id]
         except Exception:
             pass
+    with _index_lock:
+        _unloaded.clear()
     print(f"Unloaded {len(to_remove)} contexts (non-BACKGROUND)")
 
 
 def load_tmp_chats(username: str | None = None, reload: bool = False):
-    """Load contexts from the chats folder; if username is provided, only that user's chats, else all.
+    """List contexts from the chats folder; if username is provided, only that user's chats, else all.
     If reload=True, unload existing contexts for that user first.
 
+    Chats are not deserialized here. Their index entries are registered and each chat is
+    hydrated into an AgentContext on first access (AgentContext.get), see _hydrate.
+
     Ownership behavior:
     - When loading, we restore metadata.owner from persisted JSON if present. For any legacy chats
       lacking owner metadata, they remain admin-visible-only (stored under admin namespace after
@@ -119,49 +195,232 @@ def load_tmp_chats(username: str | None = None, reload: bool = False):
     _convert_v080_chats()
     _migrate_legacy_chats()
 
-    json_files: list[str] = []
-    if username:
-        user_dir = get_user_chats_folder(username)
-        folders = files.list_files(user_dir, "*")
-        for folder_name in folders:
-            json_files.append(_get_chat_file_path(folder_name, username))
-    else:
-        # admin/global: iterate all user subfolders
-        users = files.list_files(CHATS_FOLDER, "*")
-        for user in users:
-            user_dir = get_user_chats_folder(user)
-            folders = files.list_files(user_dir, "*")
-            for folder_name in folders:
-                json_files.append(_get_chat_file_path(folder_name, user))
-
     ctxids: list[str] = []
-    for file in json_files:
-        try:
-            js = files.read_file(file)
-            data = json.loads(js)
-            ctx = _deserialize_context(data)
-            # restore owner metadata from file if present
-            owner = data.get("metadata", {}).get("owner") if isinstance(data.get("metadata"), dict) else None
-            if owner:
-                if not hasattr(ctx, "metadata"):
-                    ctx.metadata = {}
-                ctx.metadata["owner"] = owner
-            # Security: if loading for a specific username, skip mismatched owners
-            if username and owner and owner != username:
-                print(f"Skipping context {ctx.id} for user {username}: owned by {owner}")
+    with _index_lock:
+        for entry in _refresh_index():
+            if not _is_user_chat(entry, username):
+                if username and entry["folder"] == username:
+                    print(f"Skipping context {entry['id']} for user {username}: owned by {entry.get('owner')}")
                 continue
-            ctxids.append(ctx.id)
-        except Exception as e:
-            print(f"Error loading chat {file}: {e}")
+            if entry["id"] not in AgentContext._contexts:
+                _unloaded[entry["id"]] = entry
+            ctxids.append(entry["id"])
+        _save_index()
     return ctxids
 
 
+def list_chats(username: str | None = None) -> list[dict]:
+    """Index entries of the saved chats of a user (or all), without loading them"""
+    with _index_lock:
+        entries = _refresh_index()
+        _save_index()
+    return [dict(entry) for entry in entries if _is_user_chat(entry, username)]
+
+
+def _is_user_chat(entry: dict, username: str | None) -> bool:
+    if not username:
+        return True
+    if entry["folder"] != username:
+        return False
+    # Security: if loading for a specific username, skip mismatched owners
+    owner = entry.get("owner")
+    return not owner or owner == username
+
+
+def unloaded_chats() -> list[SavedChat]:
+    """Chats listed for the logged in user(s) that are still on disk only"""
+    with _index_lock:
+        return [SavedChat(entry) for ctxid, entry in _unloaded.items() if ctxid not in AgentContext._contexts]
+
+
+def evict_idle_chats(timeout: float = IDLE_TIMEOUT) -> int:
+    """Save contexts not accessed for timeout seconds and drop them from memory.
+    They stay listed and are hydrated again on the next access."""
+    evicted = 0
+    for context in AgentContext.all():
+        if context.type == AgentContextType.BACKGROUND:
+            continue
+        owner = context.metadata.get("owner") if hasattr(context, "metadata") else None
+        if not owner:
+            continue  # never saved under a user, would not be found again
+        with _index_lock:
+            idle = time.time() - getattr(context, "last_access", time.time())
+            if idle < timeout or (context.task and context.task.is_alive()):
+                continue
+            if AgentContext._contexts.get(context.id) is not context:
+                continue
+            try:
+                save_tmp_chat(context)
+            except Exception as e:
+                print(f"Error saving chat {context.id} before eviction: {e}")
+                continue
+            entry = _index.get(context.id)
+            if not entry:
+                continue
+            del AgentContext._contexts[context.id]
+            _unloaded[context.id] = entry
+            evicted += 1
+    with _index_lock:
+        _save_index()
+    return evicted
+
+
+def _hydrate(ctxid: str | None) -> AgentContext | None:
+    # AgentContext._loader, deserializes a listed chat when it is first accessed
+    with _index_lock:
+        if ctxid is None:
+            ctxid = next(iter(_unloaded), None)
+            if ctxid is None:
+                return None
+        entry = _unloaded.get(ctxid)
+        if not entry:
+            return None
+        context = AgentContext._contexts.get(ctxid)  # hydrated while waiting for the lock
+        if not context:
+            path = _get_chat_file_path(ctxid, entry["folder"])
+            try:
+                data = json.loads(files.read_file(path))
+                _apply_saved_name(data, path)
+                context = _deserialize_context(data)
+            except Exception as e:
+                print(f"Error loading chat {path}: {e}")
+        _unloaded.pop(ctxid, None)
+        return context
+
+
+AgentContext._loader = _hydrate
+
+
+def _index_entry(data: dict, folder: str, path: str) -> dict:
+    stat = os.stat(path)
+    name_path = _get_name_file_path(path)
+    md = data.get("metadata") if isinstance(data.get("metadata"), dict) else {}
+    log = data.get("log") or {}
+    return {
+        "id": data["id"],
+        "name": data.get("name"),
+        "created_at": data.get("created_at"),
+        "last_message": data.get("last_message"),
+        "type": data.get("type", AgentContextType.USER.value),
+        "owner": md.get("owner"),
+        "folder": folder,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "name_mtime": os.stat(name_path).st_mtime_ns if os.path.exists(name_path) else 0,
+        "log_guid": log.get("guid", ""),
+        "log_length": len(log.get("logs", [])),
+    }
+
+
+def _load_index():
+    global _index_loaded, _index
+    if _index_loaded:
+        return
+    _index_loaded = True
+    path = files.get_abs_path(INDEX_FILE)
+    if not os.path.exists(path):
+        return
+    try:
+        data = json.loads(files.read_file(path))
+        if data.get("version") == INDEX_VERSION:
+            _index = {entry["id"]: entry for entry in data.get("chats", [])}
+    except Exception as e:
+        print(f"Error reading chat index {path}, rebuilding: {e}")
+
+
+def _refresh_index() -> list[dict]:
+    # stat every chat file, only files changed since they were indexed are read
+    _load_index()
+    entries: list[dict] = []
+    seen: set[str] = set()
+    for folder in files.list_files(CHATS_FOLDER, "*"):
+        for ctxid in files.list_files(get_user_chats_folder(folder), "*"):
+            path = _get_chat_file_path(ctxid, folder)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            name_path = _get_name_file_path(path)
+            name_mtime = os.stat(name_path).st_mtime_ns if os.path.exists(name_path) else 0
+            entry = _index.get(ctxid)
+            if not (
+                entry
+                and entry["folder"] == folder
+                and entry["mtime"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size
+                and entry["name_mtime"] == name_mtime
+            ):
+                try:
+                    data = json.loads(files.read_file(path))
+                    _apply_saved_name(data, path)
+                    data["id"] = data.get("id") or ctxid
+                    entry = _index_entry(data, folder, path)
+                except Exception as e:
+                    print(f"Error loading chat {path}: {e}")
+                    continue
+                _update_index(entry)
+            seen.add(entry["id"])
+            entries.append(entry)
+    for ctxid in [ctxid for ctxid in _index if ctxid not in seen]:
+        del _index[ctxid]  # deleted on disk
+        _mark_index_dirty()
+    return entries
+
+
+def _update_index(entry: dict):
+    with _index_lock:
+        _load_index()
+        _index[entry["id"]] = entry
+        if entry["id"] in _unloaded:
+            _unloaded[entry["id"]] = entry
+        _mark_index_dirty()
+
+
+def _mark_index_dirty():
+    global _index_dirty
+    _index_dirty = True
+
+
+def _save_index():
+    # written on load, eviction and removal; a stale index is corrected by the next refresh
+    global _index_dirty
+    if not _index_dirty:
+        return
+    _index_dirty = False
+    path = files.get_abs_path(INDEX_FILE)
+    try:
+        files.write_file(path + ".tmp", json.dumps({"version": INDEX_VERSION, "chats": list(_index.values())}))
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        print(f"Error writing chat index {path}: {e}")
+
+
+def _parse_time(value: str | None) -> datetime:
+    try:
+        return datetime.fromisoformat(value) if value else datetime.fromtimestamp(0)
+    except ValueError:
+        return datetime.fromtimestamp(0)
+
+
 def _get_chat_file_path(ctxid: str, username: str | None = None):
     if username:
         return files.get_abs_path(get_chat_folder_path_for_user(ctxid, username), CHAT_FILE_NAME)
     return files.get_abs_path(CHATS_FOLDER, ctxid, CHAT_FILE_NAME)
 
 
+def _get_name_file_path(chat_file_path: str):
+    return os.path.join(os.path.dirname(chat_file_path), NAME_FILE_NAME)
+
+
+def _apply_saved_name(data: dict, chat_file_path: str):
+    name_path = _get_name_file_path(chat_file_path)
+    if os.path.exists(name_path):
+        try:
+            data["name"] = json.loads(files.read_file(name_path)).get("name", data.get("name"))
+        except Exception as e:
+            print(f"Error reading chat name {name_path}: {e}")
+
+
 def _convert_v080_chats():
     json_files = files.list_files(CHATS_FOLDER, "*.json")
     for file in json_files:
@@ -221,37 +480,39 @@ def export_json_chat(context: AgentContext):
     return js
 
 
+def _index_folder(ctxid: str) -> str | None:
+    # user folder of a saved chat, the index covers every chat on disk once refreshed
+    with _index_lock:
+        _load_index()
+        entry = _index.get(ctxid)
+        return entry["folder"] if entry else None
+
+
 def remove_chat(ctxid: str):
-    """Remove a chat or task context across per-user folders and legacy root."""
+    """Remove a chat or task context from its user folder (found through the index) and legacy root."""
     # Delete from legacy global path if exists
     legacy_path = get_chat_folder_path(ctxid)
     files.delete_dir(legacy_path)
 
-    # Delete from any user subfolder
-    try:
-        users = files.list_files(CHATS_FOLDER, "*")
-        for user in users:
-            user_ctx_path = get_chat_folder_path_for_user(ctxid, user)
-            files.delete_dir(user_ctx_path)
-    except Exception:
-        # ignore scanning errors to be robust
-        pass
+    with _index_lock:
+        folder = _index_folder(ctxid)
+        if folder:
+            files.delete_dir(get_chat_folder_path_for_user(ctxid, folder))
+            del _index[ctxid]
+            _mark_index_dirty()
+            _save_index()
+        _unloaded.pop(ctxid, None)
 
 
 def remove_msg_files(ctxid: str):
-    """Remove all message files for a chat or task context across per-user folders and legacy root."""
+    """Remove all message files for a chat or task context from its user folder and legacy root."""
     # Legacy global messages folder
     legacy_msgs = get_chat_msg_files_folder(ctxid)
     files.delete_dir(legacy_msgs)
 
-    # Per-user messages folders
-    try:
-        users = files.list_files(CHATS_FOLDER, "*")
-        for user in users:
-            msgs_path = get_chat_msg_files_folder(ctxid, user)
-            files.delete_dir(msgs_path)
-    except Exception:
-        pass
+    folder = _index_folder(ctxid)
+    if folder:
+        files.delete_dir(get_chat_msg_files_folder(ctxid, folder))
 
 
 def _serialize_context(context: AgentContext):
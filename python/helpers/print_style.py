@@ -1,11 +1,14 @@
 import os, webcolors, html
 import sys
-from datetime import datetime
+import threading
 from . import files
+from .log_writer import BufferedLogWriter
 
 class PrintStyle:
     last_endline = True
     log_file_path = None
+    log_writer: "BufferedLogWriter | None" = None
+    _log_writer_lock = threading.Lock()
 
     def __init__(self, bold=False, italic=False, underline=False, font_color="default", background_color="default", padding=False, log_only=False):
         self.bold = bold
@@ -17,13 +20,16 @@ class PrintStyle:
         self.padding_added = False  # Flag to track if padding was added
         self.log_only = log_only
 
-        if PrintStyle.log_file_path is None:
-            logs_dir = files.get_abs_path("logs")
-            os.makedirs(logs_dir, exist_ok=True)
-            log_filename = datetime.now().strftime("log_%Y%m%d_%H%M%S.html")
-            PrintStyle.log_file_path = os.path.join(logs_dir, log_filename)
-            with open(PrintStyle.log_file_path, "w") as f:
-                f.write("<html><body style='background-color:black;font-family: Arial, Helvetica, sans-serif;'><pre>\n")
+        if PrintStyle.log_writer is None:
+            with PrintStyle._log_writer_lock:
+                if PrintStyle.log_writer is None:
+                    PrintStyle.log_writer = BufferedLogWriter(
+                        files.get_abs_path("logs"),
+                        header="<html><body style='background-color:black;font-family: Arial, Helvetica, sans-serif;'><pre>\n",
+                        footer="</pre></body></html>",
+                        dropped_note=lambda count: f'<span style="color: rgb(255, 165, 0);">[{count} log messages dropped]</span><br>\n',
+                    )
+                    PrintStyle.log_file_path = PrintStyle.log_writer.path
 
     def _get_rgb_color_code(self, color, is_background=False):
         try:
@@ -81,14 +87,17 @@ class PrintStyle:
             self.padding_added = True
 
     def _log_html(self, html):
-        with open(PrintStyle.log_file_path, "a", encoding='utf-8') as f: # type: ignore # add encoding='utf-8'
-            f.write(html)
+        # queued for the background writer, never blocks the caller
+        PrintStyle.log_writer.write(html) # type: ignore
+
+    @staticmethod
+    def flush_log(timeout: float = 5) -> bool:
+        return bool(PrintStyle.log_writer and PrintStyle.log_writer.flush(timeout))
 
     @staticmethod
     def _close_html_log():
-        if PrintStyle.log_file_path:
-            with open(PrintStyle.log_file_path, "a") as f:
-                f.write("</pre></body></html>")
+        if PrintStyle.log_writer:
+            PrintStyle.log_writer.close()
 
     def get(self, *args, sep=' ', **kwargs):
         text = sep.join(map(str, args))
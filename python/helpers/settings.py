@@ -94,6 +94,10 @@ class Settings(TypedDict):
     stt_silence_threshold: float
     stt_silence_duration: int
     stt_waiting_timeout: int
+    stt_workers: int
+    stt_timeout: int
+    stt_quantize: bool
+    stt_transcribe_language: str
 
     tts_kokoro: bool
 
@@ -1297,6 +1301,46 @@ def convert_out(settings: Settings) -> SettingsOutput:
         }
     )
 
+    stt_fields.append(
+        {
+            "id": "stt_workers",
+            "title": "Speech-to-text workers",
+            "description": "Number of transcriptions running in parallel. Each worker loads its own copy of the Whisper model.",
+            "type": "number",
+            "value": settings["stt_workers"],
+        }
+    )
+
+    stt_fields.append(
+        {
+            "id": "stt_timeout",
+            "title": "Speech-to-text timeout (s)",
+            "description": "Maximum time for a single transcription before it is cancelled.",
+            "type": "number",
+            "value": settings["stt_timeout"],
+        }
+    )
+
+    stt_fields.append(
+        {
+            "id": "stt_quantize",
+            "title": "Quantize Whisper model on CPU",
+            "description": "Use int8 weights for faster CPU transcription at a small accuracy cost.",
+            "type": "switch",
+            "value": settings["stt_quantize"],
+        }
+    )
+
+    stt_fields.append(
+        {
+            "id": "stt_transcribe_language",
+            "title": "Whisper transcription language",
+            "description": "Language code for server-side transcription (e.g. en, fr). Leave empty to detect the language automatically.",
+            "type": "text",
+            "value": settings["stt_transcribe_language"],
+        }
+    )
+
     # TTS fields
     tts_fields: list[SettingsField] = []
 
@@ -1773,6 +1817,10 @@ def get_default_settings() -> Settings:
         stt_silence_threshold=0.3,
         stt_silence_duration=1000,
         stt_waiting_timeout=2000,
+        stt_workers=1,
+        stt_timeout=900,
+        stt_quantize=False,
+        stt_transcribe_language="",
         tts_kokoro=True,
         mcp_servers='{\n    "mcpServers": {}\n}',
         mcp_client_init_timeout=10,
@@ -1819,7 +1867,11 @@ def _apply_settings(previous: Settings | None):
                 agent = agent.get_data(agent.DATA_NAME_SUBORDINATE)
 
         # reload whisper model if necessary
-        if not previous or _settings["stt_model_size"] != previous["stt_model_size"]:
+        if (
+            not previous
+            or _settings["stt_model_size"] != previous["stt_model_size"]
+            or _settings["stt_quantize"] != previous["stt_quantize"]
+        ):
             task = defer.DeferredTask().start_task(
                 whisper.preload, _settings["stt_model_size"]
             )  # TODO overkill, replace with background task
@@ -0,0 +1,209 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from flask import Request, Response
+
+from python.helpers import files
+
+try:
+    import brotli  # optional, gzip only without it
+except ImportError:
+    brotli = None
+
+STATIC_DIR = "webui"
+FINGERPRINT_EXTENSIONS = {".js", ".css"}
+COMPRESS_EXTENSIONS = {".js", ".mjs", ".css", ".html", ".json", ".svg", ".map", ".txt", ".md", ".wasm"}
+COMPRESS_MIN_SIZE = 1024  # smaller files are sent as they are
+CACHE_BYTES = 64 * 1024 * 1024  # compressed variants kept in memory
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+MODULE_EXCLUDE = ("/vendor/",)  # classic scripts, fingerprinted by their tags only
+
+# stylesheet links and scripts, module scripts included: the import map sends imports of
+# a module to the same fingerprinted url as its tag, so no second copy is loaded
+_ASSET_TAG = re.compile(r"<(link|script)\b[^>]*>", re.IGNORECASE)
+_ASSET_URL = re.compile(r"""\b(href|src)=(["'])([^"'?#]+)\2""", re.IGNORECASE)
+_HEAD_TAG = re.compile(r"<head\b[^>]*>", re.IGNORECASE)
+
+
+class StaticAssets:
+    """
+    Content hashes of the web UI scripts and styles, computed once at startup, and
+    gzip/brotli variants of text files compressed on first request and kept in memory.
+    Urls carrying the current hash (?v=) are served as immutable, others revalidate.
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = os.path.realpath(root or files.get_abs_path(STATIC_DIR))
+        self.hashes: dict[str, str] = {}  # url path -> short content hash
+        self.generation = 0  # bumped when a hash changes, pages embedding them re-render
+        self._mtimes: dict[str, int] = {}
+        self._compressed: "OrderedDict[tuple[str, str], tuple[int, bytes]]" = OrderedDict()
+        self._compressed_bytes = 0
+        self._lock = threading.Lock()
+
+    def build(self):
+        hashes, mtimes = {}, {}
+        for folder, _, names in os.walk(self.root):
+            for name in names:
+                if os.path.splitext(name)[1].lower() in FINGERPRINT_EXTENSIONS:
+                    path = os.path.join(folder, name)
+                    url = "/" + os.path.relpath(path, self.root).replace(os.sep, "/")
+                    mtimes[url] = os.stat(path).st_mtime_ns
+                    hashes[url] = _file_hash(path)
+        self.hashes, self._mtimes = hashes, mtimes
+        self.generation += 1
+
+    def warm(self):
+        """Compress fingerprinted assets ahead of the first page load"""
+        for url in list(self.hashes):
+            path = self._resolve(url)
+            if path:
+                for encoding in self._encodings():
+                    self._get_compressed(url, path, encoding)
+
+    def import_map(self) -> str:
+        """Import map from module urls to their fingerprinted urls, relative imports resolve to these too"""
+        imports = {
+            url: f"{url}?v={digest}"
+            for url, digest in sorted(self.hashes.items())
+            if url.endswith(".js") and not url.startswith(MODULE_EXCLUDE)
+        }
+        return json.dumps({"imports": imports})
+
+    def fingerprint_html(self, html: str, base: str = "/") -> str:
+        def tag(match: re.Match) -> str:
+            text = match.group(0)
+
+            def url(m: re.Match) -> str:
+                value = m.group(3)
+                if "://" in value or value.startswith("//"):
+                    return m.group(0)
+                key = value if value.startswith("/") else base + value
+                digest = self.hashes.get(key)
+                if not digest:
+                    return m.group(0)
+                return f"{m.group(1)}={m.group(2)}{value}?v={digest}{m.group(2)}"
+
+            return _ASSET_URL.sub(url, text)
+
+        html = _ASSET_TAG.sub(tag, html)
+        # the import map has to come before the first module script
+        import_map = f'<script type="importmap">{self.import_map()}</script>'
+        return _HEAD_TAG.sub(lambda m: f"{m.group(0)}\n    {import_map}", html, count=1)
+
+    def response(self, filename: str, request: Request) -> Response | None:
+        """Response for a static file, None when it does not exist"""
+        url = "/" + filename.lstrip("/")
+        path = self._resolve(url)
+        if not path:
+            return None
+        stat = os.stat(path)
+        digest = self.hashes.get(url)
+        if digest and self._mtimes.get(url) != stat.st_mtime_ns:
+            # edited since startup, the old hash must not mark the new content immutable
+            digest = self.hashes[url] = _file_hash(path)
+            self._mtimes[url] = stat.st_mtime_ns
+            self.generation += 1
+        encoding = self._choose_encoding(path, stat.st_size, request)
+
+        etag = f"{digest or f'{stat.st_mtime_ns:x}-{stat.st_size:x}'}{'-' + encoding if encoding else ''}"
+        headers = {
+            "ETag": f'"{etag}"',
+            "Vary": "Accept-Encoding",
+            "Cache-Control": IMMUTABLE_CACHE if digest and request.args.get("v") == digest else "no-cache",
+        }
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if encoding:
+            body = self._get_compressed(url, path, encoding)
+            headers["Content-Encoding"] = encoding
+            return Response(body, mimetype=mimetype, headers=headers)
+        with open(path, "rb") as f:
+            return Response(f.read(), mimetype=mimetype, headers=headers)
+
+    def compress_response(
+        self, body: bytes, mimetype: str, request: Request, headers: dict | None = None, cache_key: str = ""
+    ) -> Response:
+        """Response for generated content, compressed for the client when worth it"""
+        headers = {"Vary": "Accept-Encoding", **(headers or {})}
+        encoding = next(
+            (e for e in self._encodings() if e in request.accept_encodings and len(body) >= COMPRESS_MIN_SIZE),
+            None,
+        )
+        if encoding:
+            if cache_key:
+                # same body compressed once, keyed by its hash
+                version = hash(body)
+                body = self._cached(cache_key, encoding, version, lambda: body)
+            else:
+                body = _compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+        return Response(body, mimetype=mimetype, headers=headers)
+
+    def _resolve(self, url: str) -> str | None:
+        path = os.path.realpath(os.path.join(self.root, url.lstrip("/")))
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def _encodings(self) -> list[str]:
+        return ["br", "gzip"] if brotli else ["gzip"]
+
+    def _choose_encoding(self, path: str, size: int, request: Request) -> str | None:
+        if size < COMPRESS_MIN_SIZE or os.path.splitext(path)[1].lower() not in COMPRESS_EXTENSIONS:
+            return None
+        for encoding in self._encodings():
+            if encoding in request.accept_encodings:
+                return encoding
+        return None
+
+    def _get_compressed(self, url: str, path: str, encoding: str) -> bytes:
+        def load() -> bytes:
+            with open(path, "rb") as f:
+                return f.read()
+
+        return self._cached(url, encoding, os.stat(path).st_mtime_ns, load)
+
+    def _cached(self, key: str, encoding: str, version: int, load) -> bytes:
+        cache_key = (key, encoding)
+        with self._lock:
+            cached = self._compressed.get(cache_key)
+            if cached and cached[0] == version:
+                self._compressed.move_to_end(cache_key)
+                return cached[1]
+        body = _compress(load(), encoding)
+        with self._lock:
+            old = self._compressed.pop(cache_key, None)
+            if old:
+                self._compressed_bytes -= len(old[1])
+            self._compressed[cache_key] = (version, body)
+            self._compressed_bytes += len(body)
+            while self._compressed_bytes > CACHE_BYTES and len(self._compressed) > 1:
+                _, (_, evicted) = self._compressed.popitem(last=False)
+                self._compressed_bytes -= len(evicted)
+        return body
+
+
+def _file_hash(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()[:12]
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)  # type: ignore
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
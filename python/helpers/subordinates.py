@@ -0,0 +1,140 @@
+import asyncio
+import dataclasses
+from collections import OrderedDict
+
+from agent import Agent, AgentConfig, AgentContext, AgentContextType, UserMessage
+from python.helpers import errors, history
+
+PARALLEL_LIMIT = 4  # subordinates streaming at once in one delegation
+POOL_SIZE = 8  # warm parallel subordinates kept per superior
+POLL_INTERVAL = 0.1  # seconds between checks of the superior for interventions and pause
+DATA_NAME_POOL = "_subordinate_pool"  # underscore data is not persisted with the chat
+
+
+def subordinate_config(superior: Agent, profile: str = "") -> AgentConfig:
+    """Config for a subordinate, the context config (current settings) with the profile set"""
+    config = superior.context.config
+    if profile and profile != config.profile:
+        config = dataclasses.replace(config, profile=profile)
+    return config
+
+
+def reset_agent(agent: Agent):
+    """Clear history and data of a subordinate so it can take a new task, keeps its superior"""
+    superior = agent.get_data(Agent.DATA_NAME_SUPERIOR)
+    agent.history = history.History(agent)  # type: ignore[abstract]
+    agent.data = {}
+    agent.last_user_message = None
+    agent.intervention = None
+    if superior:
+        agent.set_data(Agent.DATA_NAME_SUPERIOR, superior)
+
+
+def unique_names(subtasks: list[tuple[str, str, str]]) -> list[tuple[str, str, str]]:
+    """(name, profile, message) subtasks with repeated names suffixed -2, -3..."""
+    names = {name for name, _, _ in subtasks}
+    seen: set[str] = set()
+    result = []
+    for name, profile, message in subtasks:
+        unique, n = name, 1
+        while unique in seen or (unique != name and unique in names):
+            n += 1
+            unique = f"{name}-{n}"
+        seen.add(unique)
+        result.append((unique, profile, message))
+    return result
+
+
+class SubordinatePool:
+    """
+    Subordinates of one agent that run in parallel. Each has its own BACKGROUND context
+    sharing the superior's log, so streaming, interventions and pause of the superior chain
+    are not mixed up between them. Contexts are owned by the pool, not registered, and the
+    agents stay warm between calls under their name until reset or pushed out of the pool.
+    Model calls go through the same per-model rate limiters as every other agent.
+    """
+
+    def __init__(self, superior: Agent):
+        self.superior = superior
+        self.agents: OrderedDict[str, Agent] = OrderedDict()
+
+    @staticmethod
+    def get(superior: Agent) -> "SubordinatePool":
+        pool = superior.get_data(DATA_NAME_POOL)
+        if not pool:
+            pool = SubordinatePool(superior)
+            superior.set_data(DATA_NAME_POOL, pool)
+        return pool
+
+    def acquire(self, name: str, profile: str = "", reset: bool = False) -> Agent:
+        config = subordinate_config(self.superior, profile)
+        agent = self.agents.get(name)
+        if agent and agent.config.profile != config.profile:
+            agent = None  # another profile, prompts differ
+        if agent:
+            agent.config = agent.context.config = config  # settings may have changed since
+            if reset:
+                reset_agent(agent)
+        else:
+            agent = self._create(name, config)
+        self.agents[name] = agent
+        self.agents.move_to_end(name)
+        while len(self.agents) > POOL_SIZE:
+            self.agents.popitem(last=False)
+        return agent
+
+    async def run(self, subtasks: list[tuple[str, str, str]], reset: bool = False) -> list[tuple[str, str]]:
+        """
+        Run (name, profile, message) subtasks, at most PARALLEL_LIMIT at a time, and return
+        (name, result) in the same order. An intervention or kill of the superior cancels all.
+        A name given more than once gets a -2, -3... suffix, each subtask needs its own agent.
+        """
+        subtasks = unique_names(subtasks)
+        agents = [self.acquire(name, profile, reset) for name, profile, _ in subtasks]
+        semaphore = asyncio.Semaphore(PARALLEL_LIMIT)
+
+        async def run_one(agent: Agent, message: str) -> str:
+            async with semaphore:
+                agent.hist_add_user_message(UserMessage(message=message, attachments=[]))
+                return await agent.monologue()
+
+        tasks = [
+            asyncio.create_task(run_one(agent, message))
+            for agent, (_, _, message) in zip(agents, subtasks)
+        ]
+        try:
+            pending = set(tasks)
+            while pending:
+                for agent in agents:
+                    agent.context.paused = self.superior.context.paused
+                # waits while paused, raises InterventionException for a new user message
+                await self.superior.handle_intervention()
+                _, pending = await asyncio.wait(pending, timeout=POLL_INTERVAL)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for agent in agents:
+                agent.context.paused = False
+
+        results = []
+        for (name, _, _), task in zip(subtasks, tasks):
+            error = task.exception()
+            results.append((name, f"Error: {errors.error_text(error)}" if error else task.result()))
+        return results
+
+    def _create(self, name: str, config: AgentConfig) -> Agent:
+        # agent0 placeholder avoids creating an unused agent, replaced right below
+        context = AgentContext(
+            config=config,
+            agent0=self.superior,
+            log=self.superior.context.log,
+            type=AgentContextType.BACKGROUND,
+        )
+        AgentContext.remove(context.id)  # owned by the pool, not listed or looked up by id
+        context.metadata = dict(getattr(self.superior.context, "metadata", {}))
+        agent = Agent(self.superior.number + 1, config, context)
+        agent.agent_name = f"{agent.agent_name}:{name}"
+        agent.set_data(Agent.DATA_NAME_SUPERIOR, self.superior)
+        context.agent0 = agent
+        return agent
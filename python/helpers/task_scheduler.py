@@ -1,4 +1,5 @@
 import asyncio
+import importlib
 from datetime import datetime, timezone, timedelta
 import os
 import random
@@ -27,6 +28,11 @@ from typing import Annotated
 
 SCHEDULER_FOLDER = "tmp/scheduler"
 
+# built-in jobs a task can run instead of an agent, name -> "module:function"
+TASK_JOBS = {
+    "backup_snapshot": "python.helpers.backup:run_scheduled_snapshot",
+}
+
 # ----------------------
 # Task Models
 # ----------------------
@@ -128,6 +134,8 @@ class BaseTask(BaseModel):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     last_run: datetime | None = None
     last_result: str | None = None
+    job: str = ""  # name from TASK_JOBS, runs instead of the agent when set
+    job_args: dict[str, Any] = Field(default_factory=dict)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -626,7 +634,8 @@ class TaskScheduler:
 
     async def add_task(self, task: Union[ScheduledTask, AdHocTask, PlannedTask]) -> "TaskScheduler":
         await self._tasks.add_task(task)
-        ctx = await self._get_chat_context(task)  # invoke context creation
+        if not task.job:
+            ctx = await self._get_chat_context(task)  # invoke context creation
         return self
 
     async def remove_task_by_uuid(self, task_uuid: str) -> "TaskScheduler":
@@ -775,67 +784,71 @@ class TaskScheduler:
             try:
                 self._printer.print(f"Scheduler Task '{current_task.name}' started")
 
-                context = await self._get_chat_context(current_task)
-
-                # Ensure the context is properly registered in the AgentContext._contexts
-                # This is critical for the polling mechanism to find and stream logs
-                # Dict operations are atomic
-                # AgentContext._contexts[context.id] = context
-                agent = context.streaming_agent or context.agent0
-
-                # Prepare attachment filenames for logging
-                attachment_filenames = []
-                if current_task.attachments:
-                    for attachment in current_task.attachments:
-                        if os.path.exists(attachment):
-                            attachment_filenames.append(attachment)
-                        else:
-                            try:
-                                url = urlparse(attachment)
-                                if url.scheme in ["http", "https", "ftp", "ftps", "sftp"]:
-                                    attachment_filenames.append(attachment)
-                                else:
-                                    self._printer.print(f"Skipping attachment: [{attachment}]")
-                            except Exception:
-                                self._printer.print(f"Skipping attachment: [{attachment}]")
-
-                self._printer.print("User message:")
-                self._printer.print(f"> {current_task.prompt}")
-                if attachment_filenames:
-                    self._printer.print("Attachments:")
-                    for filename in attachment_filenames:
-                        self._printer.print(f"- {filename}")
-
-                task_prompt = f"# Starting scheduler task '{current_task.name}' ({current_task.uuid})"
-                if task_context:
-                    task_prompt = f"## Context:\n{task_context}\n\n## Task:\n{current_task.prompt}"
+                if current_task.job:
+                    # built-in job, no agent and no chat
+                    result = await run_job(current_task)
                 else:
-                    task_prompt = f"## Task:\n{current_task.prompt}"
-
-                # Log the message with message_id and attachments
-                context.log.log(
-                    type="user",
-                    heading="User message",
-                    content=task_prompt,
-                    kvps={"attachments": attachment_filenames},
-                    id=str(uuid.uuid4()),
-                )
+                    context = await self._get_chat_context(current_task)
+
+                    # Ensure the context is properly registered in the AgentContext._contexts
+                    # This is critical for the polling mechanism to find and stream logs
+                    # Dict operations are atomic
+                    # AgentContext._contexts[context.id] = context
+                    agent = context.streaming_agent or context.agent0
+
+                    # Prepare attachment filenames for logging
+                    attachment_filenames = []
+                    if current_task.attachments:
+                        for attachment in current_task.attachments:
+                            if os.path.exists(attachment):
+                                attachment_filenames.append(attachment)
+                            else:
+                                try:
+                                    url = urlparse(attachment)
+                                    if url.scheme in ["http", "https", "ftp", "ftps", "sftp"]:
+                                        attachment_filenames.append(attachment)
+                                    else:
+                                        self._printer.print(f"Skipping attachment: [{attachment}]")
+                                except Exception:
+                                    self._printer.print(f"Skipping attachment: [{attachment}]")
 
-                agent.hist_add_user_message(
-                    UserMessage(
-                        message=task_prompt,
-                        system_message=[current_task.system_prompt],
-                        attachments=attachment_filenames))
+                    self._printer.print("User message:")
+                    self._printer.print(f"> {current_task.prompt}")
+                    if attachment_filenames:
+                        self._printer.print("Attachments:")
+                        for filename in attachment_filenames:
+                            self._printer.print(f"- {filename}")
+
+                    task_prompt = f"# Starting scheduler task '{current_task.name}' ({current_task.uuid})"
+                    if task_context:
+                        task_prompt = f"## Context:\n{task_context}\n\n## Task:\n{current_task.prompt}"
+                    else:
+                        task_prompt = f"## Task:\n{current_task.prompt}"
+
+                    # Log the message with message_id and attachments
+                    context.log.log(
+                        type="user",
+                        heading="User message",
+                        content=task_prompt,
+                        kvps={"attachments": attachment_filenames},
+                        id=str(uuid.uuid4()),
+                    )
+
+                    agent.hist_add_user_message(
+                        UserMessage(
+                            message=task_prompt,
+                            system_message=[current_task.system_prompt],
+                            attachments=attachment_filenames))
 
-                # Persist after setting up the context but before running the agent
-                # This ensures the task context is saved and can be found by polling
-                await self._persist_chat(current_task, context)
+                    # Persist after setting up the context but before running the agent
+                    # This ensures the task context is saved and can be found by polling
+                    await self._persist_chat(current_task, context)
 
-                result = await agent.monologue()
+                    result = await agent.monologue()
+                    await self._persist_chat(current_task, context)
 
                 # Success
                 self._printer.print(f"Scheduler Task '{current_task.name}' completed: {result}")
-                await self._persist_chat(current_task, context)
                 await current_task.on_success(result)
 
                 # Explicitly verify task was updated in storage after success
@@ -895,6 +908,16 @@ class TaskScheduler:
 # Task Serialization Helpers
 # ----------------------
 
+async def run_job(task: Union[ScheduledTask, AdHocTask, PlannedTask]) -> str:
+    """Run a built-in job of a task, only jobs listed in TASK_JOBS can be run"""
+    target = TASK_JOBS.get(task.job)
+    if not target:
+        raise ValueError(f"Unknown scheduler job '{task.job}'")
+    module_name, function_name = target.split(":")
+    function = getattr(importlib.import_module(module_name), function_name)
+    return await function(**task.job_args)
+
+
 def serialize_datetime(dt: Optional[datetime]) -> Optional[str]:
     """
     Serialize a datetime object to ISO format string in the user's timezone.
@@ -1041,7 +1064,9 @@ def serialize_task(task: Union[ScheduledTask, AdHocTask, PlannedTask]) -> Dict[s
         "last_run": serialize_datetime(task.last_run),
         "next_run": serialize_datetime(task.get_next_run()),
         "last_result": task.last_result,
-        "context_id": task.context_id
+        "context_id": task.context_id,
+        "job": task.job,
+        "job_args": task.job_args
     }
 
     # Add type-specific fields
@@ -1105,7 +1130,9 @@ def deserialize_task(task_data: Dict[str, Any], task_class: Optional[Type[T]] =
         "updated_at": parse_datetime(task_data.get("updated_at")),
         "last_run": parse_datetime(task_data.get("last_run")),
         "last_result": task_data.get("last_result"),
-        "context_id": task_data.get("context_id")
+        "context_id": task_data.get("context_id"),
+        "job": task_data.get("job", ""),
+        "job_args": task_data.get("job_args", {})
     }
 
     # Add type-specific fields
@@ -1,9 +1,17 @@
 import os
+import queue
 import sqlite3
 import hashlib
+import hmac
 import secrets
+import threading
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, Iterator, List
 
 from python.helpers import dotenv
 
@@ -11,19 +19,131 @@ ROLE_ADMIN = "admin"
 ROLE_USER = "user"
 DB_PATH = os.path.join("tmp", "users.db")
 
+POOL_SIZE = 8  # sqlite connections shared by all request threads
+STATEMENT_CACHE = 64  # prepared statements kept per connection
+
+# scrypt cost, ~32 MB and tens of milliseconds per hash, raise N to make stored hashes harder
+# to brute-force, existing hashes are upgraded on the next successful login
+SCRYPT_N = 2**15
+SCRYPT_R = 8
+SCRYPT_P = 1
+KDF_WORKERS = min(4, os.cpu_count() or 1)  # bounds memory of concurrent logins
+
+VERIFIED_TTL = 60  # seconds a verified username/password pair is trusted without the KDF
+VERIFIED_MAX = 1024
+
+
+class _ConnectionPool:
+    """Reused sqlite connections in WAL mode, readers do not block the writer"""
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, cached_statements=STATEMENT_CACHE
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._idle.get()  # all in use, wait for one
+        try:
+            with conn:  # commit, or rollback on error
+                yield conn
+        finally:
+            self._idle.put(conn)
+
+
+_pool: Optional[_ConnectionPool] = None
+_pool_lock = threading.Lock()
+_kdf_executor: Optional[ThreadPoolExecutor] = None
+_verified: "OrderedDict[str, float]" = OrderedDict()
+_verified_lock = threading.Lock()
+_verified_key = secrets.token_bytes(32)  # per process, cache keys are useless outside it
+
 
 def _get_conn():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.path != DB_PATH:
+            _pool = _ConnectionPool(DB_PATH, POOL_SIZE)
+        return _pool.connection()
+
+
+def _scrypt(password: str, salt: str, n: int, r: int, p: int) -> str:
+    return hashlib.scrypt(
+        password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+        maxmem=256 * n * r * p + 1024 * 1024, dklen=32,
+    ).hex()
 
 
 def _hash_password(password: str, salt: Optional[str] = None) -> tuple[str, str]:
     if not salt:
         salt = secrets.token_hex(16)
-    h = hashlib.sha256((salt + password).encode()).hexdigest()
-    return h, salt
+    h = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${h}", salt
+
+
+def _verify_password(password: str, salt: str, stored_hash: str) -> tuple[bool, bool]:
+    """(matches, needs rehash with the current parameters)"""
+    if stored_hash.startswith("scrypt$"):
+        _, n, r, p, expected = stored_hash.split("$")
+        params = (int(n), int(r), int(p))
+        ok = hmac.compare_digest(_scrypt(password, salt, *params), expected)
+        return ok, ok and params != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    # salted sha256 of older databases
+    legacy = hashlib.sha256((salt + password).encode()).hexdigest()
+    ok = hmac.compare_digest(legacy, stored_hash)
+    return ok, ok
+
+
+def _verified_cache_key(username: str, password: str, stored_hash: str) -> str:
+    # includes the stored hash, a changed password invalidates the entry by itself
+    message = "\0".join((username, password, stored_hash)).encode()
+    return hmac.new(_verified_key, message, hashlib.sha256).hexdigest()
+
+
+def _is_verified(key: str) -> bool:
+    with _verified_lock:
+        expires = _verified.get(key)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del _verified[key]
+            return False
+        return True
+
+
+def _mark_verified(key: str):
+    with _verified_lock:
+        _verified[key] = time.monotonic() + VERIFIED_TTL
+        _verified.move_to_end(key)
+        while len(_verified) > VERIFIED_MAX:
+            _verified.popitem(last=False)
 
 
 def initialize_database():
@@ -75,13 +195,13 @@ def create_user(username: str, password: str, role: str, created_by: str) -> Dic
     if role not in (ROLE_ADMIN, ROLE_USER):
         raise ValueError("Rôle invalide (admin/user)")
 
+    ph, salt = _hash_password(password)  # before taking a pooled connection
     with _get_conn() as conn:
         cur = conn.cursor()
         # ensure unique
         cur.execute("SELECT 1 FROM users WHERE username=?", (username,))
         if cur.fetchone():
             raise ValueError("Nom d'utilisateur déjà utilisé")
-        ph, salt = _hash_password(password)
         cur.execute(
             """
             INSERT INTO users (username, password_hash, salt, role, created_at, created_by)
@@ -90,7 +210,7 @@ def create_user(username: str, password: str, role: str, created_by: str) -> Dic
             (username, ph, salt, role, datetime.utcnow().isoformat(), created_by),
         )
         conn.commit()
-        return get_user_by_username(username)  # type: ignore
+    return get_user_by_username(username)  # type: ignore
 
 
 def authenticate_user(username: str, password: str) -> Optional[Dict[str, Any]]:
@@ -98,14 +218,36 @@ def authenticate_user(username: str, password: str) -> Optional[Dict[str, Any]]:
         cur = conn.cursor()
         cur.execute("SELECT * FROM users WHERE username=?", (username,))
         row = cur.fetchone()
-        if not row:
-            return None
-        expected_hash = row["password_hash"]
-        salt = row["salt"]
-        got_hash, _ = _hash_password(password, salt)
-        if got_hash != expected_hash:
-            return None
-        return dict(row)
+    if not row:
+        return None
+    user = dict(row)
+    key = _verified_cache_key(username, password, user["password_hash"])
+    if _is_verified(key):
+        return user
+
+    ok, needs_rehash = _verify_password(password, user["salt"], user["password_hash"])
+    if not ok:
+        return None
+    if needs_rehash:
+        ph, salt = _hash_password(password)
+        with _get_conn() as conn:
+            conn.execute(
+                "UPDATE users SET password_hash=?, salt=? WHERE id=?", (ph, salt, user["id"])
+            )
+        user.update(password_hash=ph, salt=salt)
+        key = _verified_cache_key(username, password, ph)
+    _mark_verified(key)
+    return user
+
+
+async def authenticate_user_async(username: str, password: str) -> Optional[Dict[str, Any]]:
+    """authenticate_user on a small worker pool, the KDF does not block the event loop"""
+    global _kdf_executor
+    with _pool_lock:
+        if _kdf_executor is None:
+            _kdf_executor = ThreadPoolExecutor(max_workers=KDF_WORKERS)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_kdf_executor, authenticate_user, username, password)
 
 
 def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
@@ -130,10 +272,12 @@ def update_user(user_id: int, **kwargs) -> Dict[str, Any]:
     if not updates:
         raise ValueError("Aucune mise à jour spécifiée")
 
+    if "password" in updates:
+        updates["password"] = _hash_password(updates["password"])
     with _get_conn() as conn:
         cur = conn.cursor()
         if "password" in updates:
-            ph, salt = _hash_password(updates.pop("password"))
+            ph, salt = updates.pop("password")
             cur.execute("UPDATE users SET password_hash=?, salt=? WHERE id=?", (ph, salt, user_id))
         if "role" in updates:
             role = updates["role"]
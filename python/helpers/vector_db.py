@@ -1,5 +1,9 @@
-from typing import Any, List, Sequence
+from typing import Any, Iterator, List, Sequence
+import asyncio
+import json
+import os
 import uuid
+import numpy as np
 from langchain_community.vectorstores import FAISS
 
 # faiss needs to be patched for python 3.12 on arm #TODO remove once not needed
@@ -8,17 +12,78 @@ import faiss
 
 
 from langchain_core.documents import Document
-from langchain.storage import InMemoryByteStore
 from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores.utils import (
     DistanceStrategy,
 )
-from langchain.embeddings import CacheBackedEmbeddings
+from python.helpers.embedding_cache import CachedEmbeddings, content_hash, get_dimensions, get_model_id
+from python.helpers.metadata_index import MetadataIndex, compile_filter
+from python.helpers import vector_index
+from python.helpers.disk_docstore import SqliteDocstore
+from python.helpers.print_style import PrintStyle
 
 from agent import Agent
 
 
 class MyFaiss(FAISS):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._meta_index: MetadataIndex | None = None
+        self._positions: dict[str, int] | None = None
+        # approximate index settings, None keeps the exact flat index
+        self.index_config: vector_index.IndexConfig | None = None
+        # path of a read-only memory-mapped index, loaded fully before the first write
+        self._mmap_path: str | None = None
+        # deleted positions of an approximate index, mapped to None until it is compacted
+        self._deleted: set[int] | None = None
+        self._version = 0  # bumped on every change, a rebuild made meanwhile is discarded
+
+    @classmethod
+    def load_lazy(cls, folder_path: str, embeddings, **kwargs) -> "MyFaiss":
+        """
+        Open an index saved with a SqliteDocstore. The faiss index is memory-mapped
+        when possible and documents stay on disk until they are read.
+        """
+        index_path = os.path.join(folder_path, "index.faiss")
+        mmap_path: str | None = index_path
+        try:
+            index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except Exception:
+            index = faiss.read_index(index_path)
+            mmap_path = None
+        with open(os.path.join(folder_path, "index_map.json"), "r") as f:
+            ids = json.load(f)
+        docstore = SqliteDocstore(os.path.join(folder_path, "docstore.db"))
+        db = cls(
+            embeddings,
+            index,
+            docstore,
+            {i: id for i, id in enumerate(ids)},  # None for deleted positions
+            **kwargs,
+        )
+        db._mmap_path = mmap_path
+        return db
+
+    def save_local(self, folder_path: str, index_name: str = "index") -> None:
+        if not isinstance(self.docstore, SqliteDocstore):
+            return super().save_local(folder_path, index_name)
+        # docstore is already persisted, write vectors and id map atomically
+        os.makedirs(folder_path, exist_ok=True)
+        if not self._mmap_path:  # a mapped index has no unsaved changes
+            index_path = os.path.join(folder_path, f"{index_name}.faiss")
+            faiss.write_index(self.index, index_path + ".tmp")
+            os.replace(index_path + ".tmp", index_path)
+        map_path = os.path.join(folder_path, "index_map.json")
+        with open(map_path + ".tmp", "w") as f:
+            json.dump([self.index_to_docstore_id[i] for i in range(len(self.index_to_docstore_id))], f)
+        os.replace(map_path + ".tmp", map_path)
+
+    def _ensure_writable(self):
+        self._version += 1
+        if self._mmap_path:
+            self.index = faiss.read_index(self._mmap_path)
+            self._mmap_path = None
+
     # override aget_by_ids
     def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
         # return all self.docstore._dict[id] in ids
@@ -30,37 +95,293 @@ class MyFaiss(FAISS):
     def get_all_docs(self) -> dict[str, Document]:
         return self.docstore._dict  # type: ignore
 
+    # keep the metadata index in sync with the docstore
+    def add_texts(self, *args, **kwargs) -> List[str]:
+        self._ensure_writable()
+        ids = super().add_texts(*args, **kwargs)
+        self._index_added(ids)
+        return ids
+
+    async def aadd_texts(self, *args, **kwargs) -> List[str]:
+        self._ensure_writable()
+        ids = await super().aadd_texts(*args, **kwargs)
+        self._index_added(ids)
+        return ids
+
+    def add_embeddings(self, *args, **kwargs) -> List[str]:
+        self._ensure_writable()
+        ids = super().add_embeddings(*args, **kwargs)
+        self._index_added(ids)
+        return ids
+
+    def delete(self, ids: list[str] | None = None, **kwargs) -> bool | None:
+        metadata = [(id, self._get_metadata(id)) for id in ids or []]
+        self._ensure_writable()
+        if vector_index.is_flat(self.index):
+            res = super().delete(ids, **kwargs)
+            self._positions = None  # faiss positions shift after removal
+        else:
+            res = self._delete_approximate(ids or [])
+        if self._meta_index is not None:
+            for doc_id, meta in metadata:
+                if meta is not None:
+                    self._meta_index.remove(doc_id, meta)
+        return res
+
+    def _delete_approximate(self, ids: list[str]) -> bool:
+        # same contract as FAISS.delete, but IVF and HNSW can not remove cheaply, so the
+        # positions are kept as tombstones, skipped by searches until the index is compacted
+        positions = self._get_positions()
+        missing = set(ids).difference(positions)
+        if missing:
+            raise ValueError(f"Some specified ids do not exist in the current store. Ids not found: {missing}")
+        deleted = self._get_deleted()
+        for id_ in ids:
+            position = positions.pop(id_)
+            self.index_to_docstore_id[position] = None  # type: ignore[assignment]
+            deleted.add(position)
+        self.docstore.delete(ids)  # type: ignore
+        return True
+
+    def _get_deleted(self) -> set[int]:
+        if self._deleted is None:
+            self._deleted = {i for i, id_ in self.index_to_docstore_id.items() if id_ is None}
+        return self._deleted
+
+    def maybe_migrate_index(self) -> bool:
+        """Switch to the configured index type, or compact deleted positions, when due."""
+        snapshot = self.prepare_rebuild()
+        return snapshot is not None and self.apply_rebuild(self.build_rebuild(snapshot))
+
+    def prepare_rebuild(self) -> tuple | None:
+        """
+        Snapshot for a due migration or compaction, None when none is due. The snapshot is
+        a copy, so build_rebuild can run in a worker thread while the store stays in use.
+        """
+        if not self.index_config or self.index.ntotal == 0:
+            return None
+        migrate = vector_index.needs_migration(self.index, self.index_config)
+        if not migrate and not vector_index.needs_compaction(self.index.ntotal, len(self._get_deleted())):
+            return None
+        live = [(i, id_) for i, id_ in sorted(self.index_to_docstore_id.items()) if id_ is not None]
+        return self._version, migrate, faiss.clone_index(self.index), live
+
+    def build_rebuild(self, snapshot: tuple) -> tuple:
+        version, migrate, index, live = snapshot
+        vectors = self._stored_vectors(index, live)
+        if migrate:
+            PrintStyle.standard(
+                f"Migrating vector index with {len(live)} vectors to '{self.index_config['type']}'..."  # type: ignore[index]
+            )
+            index = vector_index.migrate(index, self.index_config, vectors)  # type: ignore[arg-type]
+        else:
+            index = vector_index.rebuild(index, vectors, self.index_config)
+        return version, index, {i: id_ for i, (_, id_) in enumerate(live)}
+
+    def apply_rebuild(self, rebuilt: tuple) -> bool:
+        """Swap in a rebuilt index, unless the store changed since its snapshot (retried on a later save)."""
+        version, index, index_to_docstore_id = rebuilt
+        if version != self._version:
+            return False
+        self.index, self.index_to_docstore_id = index, index_to_docstore_id
+        self._mmap_path = None
+        self._positions = None
+        self._deleted = None
+        self._version += 1
+        return True
+
+    def _stored_vectors(self, index: faiss.Index, live: list[tuple[int, str]]) -> np.ndarray:
+        # the original embeddings from the cache where present, so lossy PQ/SQ8 codes are
+        # not re-encoded from their own reconstructions, other vectors are reconstructed
+        vectors = vector_index.all_vectors(index)[[i for i, _ in live]]
+        embedder = self.embedding_function
+        if isinstance(embedder, CachedEmbeddings) and len(live):
+            docs = self.get_all_docs()
+            hashes = [content_hash(docs[id_].page_content) if id_ in docs else "" for _, id_ in live]
+            found = embedder.cache.get_many(embedder.model_id, [h for h in hashes if h])
+            for row, h in enumerate(hashes):
+                vector = found.get(h)
+                if vector is not None and len(vector) == index.d:
+                    vectors[row] = vector
+            if self._normalize_L2:
+                faiss.normalize_L2(vectors)
+        return vectors
+
+    def _index_added(self, ids: Sequence[str]):
+        if self._meta_index is not None:
+            for doc_id in ids:
+                meta = self._get_metadata(doc_id)
+                if meta is not None:
+                    self._meta_index.add(doc_id, meta)
+        if self._positions is not None:
+            start = self.index.ntotal - len(ids)
+            for i, doc_id in enumerate(ids):
+                self._positions[doc_id] = start + i
+
+    def get_meta_index(self) -> MetadataIndex:
+        if self._meta_index is None:
+            index = MetadataIndex()
+            for doc_id, meta in self._iter_metadata():
+                index.add(doc_id, meta)
+            self._meta_index = index
+        return self._meta_index
+
+    def _get_metadata(self, doc_id: str) -> dict[str, Any] | None:
+        if isinstance(self.docstore, SqliteDocstore):
+            return self.docstore.get_metadata(doc_id)  # without loading the text
+        doc = self.get_all_docs().get(doc_id)
+        return doc.metadata if doc else None
+
+    def _iter_metadata(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        if isinstance(self.docstore, SqliteDocstore):
+            return self.docstore.iter_metadata()
+        return ((doc_id, doc.metadata) for doc_id, doc in self.get_all_docs().items())
+
+    def _get_positions(self) -> dict[str, int]:
+        if self._positions is None:
+            self._positions = {v: k for k, v in self.index_to_docstore_id.items() if v is not None}
+        return self._positions
+
+    def select_ids_by_filter(self, filter: str, limit: int = 0) -> list[str]:
+        condition = compile_filter(filter)
+        return condition.select(
+            self.get_meta_index(),
+            self._iter_metadata,
+            self._get_metadata,
+            limit,
+        )
+
+    def select_by_filter(self, filter: str, limit: int = 0) -> list[Document]:
+        return self.get_by_ids(self.select_ids_by_filter(filter, limit))
+
+    async def asearch_threshold(
+        self, query: str, k: int, threshold: float, filter: str = ""
+    ) -> list[Document]:
+        """
+        Similarity search with relevance threshold. The filter is resolved to document ids
+        through the metadata index and passed to faiss as an ID selector, so only
+        matching vectors are scored.
+        """
+        embedding = await self._aembed_query(query)
+        return self.search_vector_threshold(embedding, k, threshold, filter)
+
+    async def asearch_threshold_many(
+        self, queries: list[str], k: int, threshold: float, filter: str = ""
+    ) -> list[list[Document]]:
+        """Similarity search for several queries, embedded as queries at once and searched in one faiss call."""
+        if not queries:
+            return []
+        if isinstance(self.embedding_function, CachedEmbeddings):
+            embeddings = await self.embedding_function.aembed_queries(queries)
+        else:
+            embeddings = await asyncio.gather(*(self._aembed_query(q) for q in queries))
+        return self.search_vectors_threshold(embeddings, k, threshold, filter)
+
+    def search_vector_threshold(
+        self, embedding: list[float], k: int, threshold: float, filter: str = ""
+    ) -> list[Document]:
+        return self.search_vectors_threshold([embedding], k, threshold, filter)[0]
+
+    def search_vector_threshold_by_filters(
+        self, embedding: list[float], limits: dict[str, int], threshold: float
+    ) -> dict[str, list[Document]]:
+        """
+        One search for several filters with their own k, e.g. one per memory area.
+        The union of the filters is searched once with some headroom, only filters
+        that come up short because the union was truncated are searched on their own.
+        """
+        results: dict[str, list[Document]] = {f: [] for f in limits}
+        filters = [f for f, k in limits.items() if k > 0]
+        if not filters:
+            return results
+        k = 2 * sum(limits[f] for f in filters)
+        union = " or ".join(f"({f})" for f in filters)
+        found = self.search_vector_threshold(embedding, k, threshold, union)
+        for doc in found:
+            for f in filters:
+                if len(results[f]) < limits[f] and compile_filter(f).matches(doc.metadata):
+                    results[f].append(doc)
+        if len(found) >= k:
+            for f in filters:
+                if len(results[f]) < limits[f]:
+                    results[f] = self.search_vector_threshold(embedding, limits[f], threshold, f)
+        return results
+
+    def search_vectors_threshold(
+        self, embeddings: list[list[float]], k: int, threshold: float, filter: str = ""
+    ) -> list[list[Document]]:
+        empty: list[list[Document]] = [[] for _ in embeddings]
+        if self.index.ntotal == 0 or k <= 0 or not embeddings:
+            return empty
+
+        if filter:
+            positions = self._get_positions()
+            selected = np.array(
+                [positions[i] for i in self.select_ids_by_filter(filter) if i in positions],
+                dtype=np.int64,
+            )
+            if not len(selected):
+                return empty
+            k = min(k, len(selected))
+            # keep references alive until the search returns, faiss only holds pointers
+            selector = faiss.IDSelectorBatch(len(selected), faiss.swig_ptr(selected))
+        elif self._get_deleted():
+            # skip tombstones of deleted vectors
+            deleted = np.fromiter(self._get_deleted(), dtype=np.int64)
+            excluded = faiss.IDSelectorBatch(len(deleted), faiss.swig_ptr(deleted))
+            selector = faiss.IDSelectorNot(excluded)
+        else:
+            selector = None
+        params = vector_index.search_params(self.index, self.index_config, selector)
+
+        vectors = np.array(embeddings, dtype=np.float32)
+        if self._normalize_L2:
+            faiss.normalize_L2(vectors)
+        scores, indices = self.index.search(vectors, min(k, self.index.ntotal), params=params)
+
+        relevance = self.override_relevance_score_fn or (lambda s: s)
+        results = []
+        for row_scores, row_indices in zip(scores, indices):
+            result = []
+            for score, i in zip(row_scores, row_indices):
+                if i == -1:
+                    continue
+                if relevance(float(score)) < threshold:
+                    continue
+                doc = self.docstore.search(self.index_to_docstore_id[int(i)])
+                if isinstance(doc, Document):
+                    result.append(doc)
+            results.append(result)
+        return results
+
 
 class VectorDB:
 
-    _cached_embeddings: dict[str, CacheBackedEmbeddings] = {}
+    _cached_embeddings: dict[str, CachedEmbeddings] = {}
 
     @staticmethod
     def _get_embeddings(agent: Agent, cache: bool = True):
         model = agent.get_embedding_model()
         if not cache:
             return model  # return raw embeddings if cache is False
-        namespace = getattr(
-            model,
-            "model_name",
-            "default",
+        # persistent cache shared with memory, keyed by model id and content hash
+        model_id = get_model_id(
+            agent.config.embeddings_model.provider,
+            agent.config.embeddings_model.name,
         )
-        if namespace not in VectorDB._cached_embeddings:
-            store = InMemoryByteStore()
-            VectorDB._cached_embeddings[namespace] = (
-                CacheBackedEmbeddings.from_bytes_store(
-                    model,
-                    store,
-                    namespace=namespace,
-                )
-            )
-        return VectorDB._cached_embeddings[namespace]
+        if model_id not in VectorDB._cached_embeddings:
+            VectorDB._cached_embeddings[model_id] = CachedEmbeddings(model, model_id)
+        return VectorDB._cached_embeddings[model_id]
 
     def __init__(self, agent: Agent, cache: bool = True):
         self.agent = agent
         self.cache = cache  # store cache preference
         self.embeddings = self._get_embeddings(agent, cache=cache)
-        self.index = faiss.IndexFlatIP(len(self.embeddings.embed_query("example")))
+        model_id = get_model_id(
+            agent.config.embeddings_model.provider,
+            agent.config.embeddings_model.name,
+        )
+        self.index = faiss.IndexFlatIP(get_dimensions(model_id, self.embeddings))
 
         self.db = MyFaiss(
             embedding_function=self.embeddings,
@@ -75,27 +396,19 @@ class VectorDB:
     async def search_by_similarity_threshold(
         self, query: str, limit: int, threshold: float, filter: str = ""
     ):
-        comparator = get_comparator(filter) if filter else None
-
-        return await self.db.asearch(
-            query,
-            search_type="similarity_score_threshold",
-            k=limit,
-            score_threshold=threshold,
-            filter=comparator,
+        return await self.db.asearch_threshold(
+            query, k=limit, threshold=threshold, filter=filter
+        )
+
+    async def search_by_similarity_threshold_many(
+        self, queries: list[str], limit: int, threshold: float, filter: str = ""
+    ) -> list[list[Document]]:
+        return await self.db.asearch_threshold_many(
+            queries, k=limit, threshold=threshold, filter=filter
         )
 
     async def search_by_metadata(self, filter: str, limit: int = 0) -> list[Document]:
-        comparator = get_comparator(filter)
-        all_docs = self.db.get_all_docs()
-        result = []
-        for doc in all_docs.values():
-            if comparator(doc.metadata):
-                result.append(doc)
-                # stop if limit reached and limit > 0
-                if limit > 0 and len(result) >= limit:
-                    break
-        return result
+        return self.db.select_by_filter(filter, limit)
 
     async def insert_documents(self, docs: list[Document]):
         ids = [str(uuid.uuid4()) for _ in range(len(docs))]
@@ -135,15 +448,3 @@ def cosine_normalizer(val: float) -> float:
         0, min(1, res)
     )  # float precision can cause values like 1.0000000596046448
     return res
-
-
-def get_comparator(condition: str):
-    def comparator(data: dict[str, Any]):
-        try:
-            result = eval(condition, {}, data)
-            return result
-        except Exception as e:
-            # PrintStyle.error(f"Error evaluating condition: {e}")
-            return False
-
-    return comparator
@@ -0,0 +1,197 @@
+import json
+import math
+import os
+from typing import Any, TypedDict
+
+import numpy as np
+
+# faiss needs to be patched for python 3.12 on arm #TODO remove once not needed
+from python.helpers import faiss_monkey_patch
+import faiss
+
+from python.helpers.print_style import PrintStyle
+
+CONFIG_FILE = "index.json"  # per memory subdir, next to index.faiss
+
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq", "ivf_sq8")
+COMPACT_RATIO = 0.2  # share of deleted vectors at which an approximate index is rebuilt
+
+
+class IndexConfig(TypedDict):
+    type: str  # one of INDEX_TYPES
+    train_threshold: int  # stay on exact flat index until this many vectors
+    hnsw_m: int
+    hnsw_ef_search: int
+    ivf_nlist: int  # 0 = derived from collection size
+    ivf_nprobe: int
+    pq_m: int  # 0 = derived from dimensions
+
+
+def default_config() -> IndexConfig:
+    return {
+        "type": "flat",
+        "train_threshold": 20000,
+        "hnsw_m": 32,
+        "hnsw_ef_search": 64,
+        "ivf_nlist": 0,
+        "ivf_nprobe": 16,
+        "pq_m": 0,
+    }
+
+
+def load_config(db_dir: str) -> IndexConfig:
+    config = default_config()
+    path = os.path.join(db_dir, CONFIG_FILE)
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                config.update(json.load(f))
+        except Exception as e:
+            PrintStyle.error(f"Error reading index config {path}: {e}")
+    if config["type"] not in INDEX_TYPES:
+        PrintStyle.error(f"Unknown index type '{config['type']}', using flat index")
+        config["type"] = "flat"
+    return config
+
+
+def is_flat(index: faiss.Index) -> bool:
+    return isinstance(index, faiss.IndexFlat)
+
+
+def factory_string(config: IndexConfig, dimensions: int, count: int) -> str:
+    kind = config["type"]
+    if kind == "hnsw":
+        return f"HNSW{config['hnsw_m']}"
+    # rule of thumb: ~4*sqrt(n) lists, with at least 39 training points per list
+    nlist = config["ivf_nlist"] or int(4 * math.sqrt(count))
+    nlist = max(1, min(nlist, count // 39))
+    if kind == "ivf_flat":
+        return f"IVF{nlist},Flat"
+    if kind == "ivf_sq8":
+        return f"IVF{nlist},SQ8"
+    if kind == "ivf_pq":
+        return f"IVF{nlist},PQ{_pq_m(config, dimensions)}"
+    return "Flat"
+
+
+def _pq_m(config: IndexConfig, dimensions: int) -> int:
+    m = config["pq_m"] or max(1, dimensions // 8)
+    # PQ needs the number of sub-quantizers to divide the dimensions
+    while dimensions % m:
+        m -= 1
+    return m
+
+
+def build_index(config: IndexConfig, vectors: np.ndarray) -> faiss.Index:
+    count, dimensions = vectors.shape
+    index = faiss.index_factory(
+        dimensions,
+        factory_string(config, dimensions, count),
+        faiss.METRIC_INNER_PRODUCT,
+    )
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    _prepare(index)
+    return index
+
+
+def _prepare(index: faiss.Index):
+    ivf = _ivf(index)
+    if ivf is not None:
+        ivf.make_direct_map()  # needed for reconstruct when migrating or deleting
+
+
+def _ivf(index: faiss.Index):
+    try:
+        return faiss.extract_index_ivf(index)
+    except Exception:
+        return None
+
+
+def all_vectors(index: faiss.Index) -> np.ndarray:
+    if index.ntotal == 0:
+        return np.zeros((0, index.d), dtype=np.float32)
+    _prepare(index)
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def index_type(index: faiss.Index) -> str:
+    """Which of INDEX_TYPES an index is, read from the index itself"""
+    if is_flat(index):
+        return "flat"
+    ivf = _ivf(index)
+    if ivf is not None:
+        ivf = faiss.downcast_index(ivf)
+        if isinstance(ivf, faiss.IndexIVFPQ):
+            return "ivf_pq"
+        if isinstance(ivf, faiss.IndexIVFScalarQuantizer):
+            return "ivf_sq8"
+        return "ivf_flat"
+    return "hnsw"
+
+
+def needs_migration(index: faiss.Index, config: IndexConfig) -> bool:
+    if config["type"] == "flat":
+        return not is_flat(index) and index.ntotal > 0
+    if is_flat(index):
+        return index.ntotal >= config["train_threshold"]
+    # configured type changed between approximate types, e.g. hnsw to ivf
+    return index_type(index) != config["type"]
+
+
+def needs_compaction(total: int, deleted: int) -> bool:
+    return deleted > 0 and deleted >= total * COMPACT_RATIO
+
+
+def migrate(
+    index: faiss.Index, config: IndexConfig, vectors: np.ndarray | None = None
+) -> faiss.Index:
+    """Rebuild the index as the configured type from vectors (default: all of index, in position order)."""
+    if vectors is None:
+        vectors = all_vectors(index)
+    if config["type"] == "flat":
+        flat = faiss.IndexFlatIP(index.d)
+        flat.add(vectors)
+        return flat
+    return build_index(config, vectors)
+
+
+def rebuild(
+    index: faiss.Index, vectors: np.ndarray, config: IndexConfig | None = None
+) -> faiss.Index:
+    """
+    Index of the same type holding only vectors, used to compact deleted positions.
+    Trained IVF quantizers are reused, HNSW can not remove so the graph is built anew.
+    """
+    if is_flat(index):
+        flat = faiss.IndexFlatIP(index.d)
+        flat.add(vectors)
+        return flat
+    if _ivf(index) is not None:
+        rebuilt = faiss.clone_index(index)
+        rebuilt.reset()
+        rebuilt.add(vectors)
+    else:
+        hnsw_m = (config or default_config())["hnsw_m"]
+        rebuilt = faiss.index_factory(
+            index.d, f"HNSW{hnsw_m}", faiss.METRIC_INNER_PRODUCT
+        )
+        rebuilt.add(vectors)
+    _prepare(rebuilt)
+    return rebuilt
+
+
+def search_params(
+    index: faiss.Index, config: IndexConfig | None, selector: Any = None
+):
+    """Type specific search parameters, faiss rejects generic ones for IVF and HNSW."""
+    config = config or default_config()
+    kwargs = {"sel": selector} if selector is not None else {}
+    if _ivf(index) is not None:
+        return faiss.SearchParametersIVF(nprobe=config["ivf_nprobe"], **kwargs)
+    if isinstance(faiss.downcast_index(index), faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=config["hnsw_ef_search"], **kwargs)
+    if kwargs:
+        return faiss.SearchParameters(**kwargs)
+    return None
@@ -1,8 +1,14 @@
 import base64
+import queue
+import subprocess
+import threading
+import time
 import warnings
 import whisper
-import tempfile
 import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator
+import numpy as np
 from python.helpers import runtime, rfc, settings, files
 from python.helpers.print_style import PrintStyle
 from python.helpers.notification import NotificationManager, NotificationType, NotificationPriority
@@ -12,8 +18,21 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 
 _model = None
 _model_name = ""
+_model_quantize = False  # stt_quantize the loaded models were built with
 is_updating_model = False  # Tracks whether the model is currently updating
 
+# transcription worker pool, sized by the stt_workers setting
+_executor: ThreadPoolExecutor | None = None
+_executor_workers = 0
+_models: queue.Queue = queue.Queue()  # idle model instances, one per busy worker at most
+_models_loaded = 0
+_models_generation = 0  # bumped on model change, older instances are dropped
+_pending = 0  # queued and running jobs
+_queue_per_worker = 4  # admission limit, further requests are rejected
+_split_search = 5  # seconds before a window end searched for the quietest point to cut at
+_split_frame = 0.1  # seconds per energy frame when searching for the cut
+_pool_lock = threading.Lock()
+
 async def preload(model_name:str):
     try:
         # return await runtime.call_development_function(_preload, model_name)
@@ -23,14 +42,15 @@ async def preload(model_name:str):
         raise e
         
 async def _preload(model_name:str):
-    global _model, _model_name, is_updating_model
+    global _model, _model_name, _model_quantize, is_updating_model
 
     while is_updating_model:
         await asyncio.sleep(0.1)
 
     try:
         is_updating_model = True
-        if not _model or _model_name != model_name:
+        quantize = _get_quantize()
+        if not _model or _model_name != model_name or _model_quantize != quantize:
             NotificationManager.send_notification(
                 NotificationType.INFO,
                 NotificationPriority.NORMAL,
@@ -38,8 +58,10 @@ async def _preload(model_name:str):
                 display_time=99,
                 group="whisper-preload")
             PrintStyle.standard(f"Loading Whisper model: {model_name}")
-            _model = whisper.load_model(name=model_name, download_root=files.get_abs_path("/tmp/models/whisper")) # type: ignore
+            _model = _load_model(model_name, quantize)
             _model_name = model_name
+            _model_quantize = quantize
+            _reset_models(_model)
             NotificationManager.send_notification(
                 NotificationType.INFO,
                 NotificationPriority.NORMAL,
@@ -76,21 +98,201 @@ async def transcribe(model_name:str, audio_bytes_b64: str):
 
 async def _transcribe(model_name:str, audio_bytes_b64: str):
     await _preload(model_name)
-    
-    # Decode audio bytes if encoded as a base64 string
-    audio_bytes = base64.b64decode(audio_bytes_b64)
-
-    # Create temp audio file
-    import os
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as audio_file:
-        audio_file.write(audio_bytes)
-        temp_path = audio_file.name
+
+    # decode and transcribe in the worker pool, the agent loop stays free
+    job = _submit(audio_bytes_b64)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(job.future), _get_timeout())
+    except asyncio.TimeoutError:
+        job.cancel.set()
+        raise TimeoutError("Transcription timed out")
+
+
+def stream_transcription(audio_bytes_b64: str) -> Iterator[dict]:
+    """
+    Transcribe in the worker pool and yield partial results per window of up to 30 seconds,
+    then the final result. The model must be loaded with preload() first.
+    """
+    partials: queue.Queue = queue.Queue()
+    job = _submit(audio_bytes_b64, on_partial=partials.put)
+    deadline = time.monotonic() + _get_timeout()
+    try:
+        while not job.future.done() or not partials.empty():
+            try:
+                yield partials.get(timeout=0.25)
+            except queue.Empty:
+                if time.monotonic() > deadline:
+                    raise TimeoutError("Transcription timed out")
+        yield {**job.future.result(), "done": True}
+    finally:
+        job.cancel.set()  # stop remaining windows if the client went away
+
+
+class _Job:
+    def __init__(self, future: Future, cancel: threading.Event):
+        self.future = future
+        self.cancel = cancel
+
+
+def _submit(audio_bytes_b64: str, on_partial: Callable[[dict], None] | None = None) -> _Job:
+    global _pending
+    workers = _get_workers()
+    with _pool_lock:
+        if _pending >= workers * _queue_per_worker:
+            raise RuntimeError("Too many transcriptions in progress, please try again later")
+        _pending += 1
+    cancel = threading.Event()
+    future = _get_executor(workers).submit(_run_job, audio_bytes_b64, cancel, on_partial)
+    return _Job(future, cancel)
+
+
+def _run_job(audio_bytes_b64: str, cancel: threading.Event, on_partial: Callable[[dict], None] | None):
+    global _pending
+    model = None
+    generation = -1
     try:
-        # Transcribe the audio file
-        result = _model.transcribe(temp_path, fp16=False) # type: ignore
-        return result
+        audio = _decode_audio(base64.b64decode(audio_bytes_b64))
+        model, generation = _acquire_model()
+        return _transcribe_windows(model, audio, cancel, on_partial)
     finally:
+        if model is not None and generation == _models_generation:
+            _models.put(model)
+        with _pool_lock:
+            _pending -= 1
+
+
+def _transcribe_windows(model, audio: np.ndarray, cancel: threading.Event, on_partial: Callable[[dict], None] | None):
+    # recordings up to one window are transcribed in one call, longer ones window by window
+    windows = _split_windows(audio)
+    language = _get_language()  # None detects it, then the first window's language is kept
+    texts: list[str] = []
+    segments: list[dict] = []
+    for index, (start, end) in enumerate(windows):
+        if cancel.is_set():
+            raise TimeoutError("Transcription cancelled")
+        result = model.transcribe(
+            audio[start:end],
+            fp16=False,
+            language=language,
+            # previous text keeps wording consistent across windows
+            initial_prompt=" ".join(texts)[-200:] or None,
+        )
+        language = language or result.get("language")
+        text = str(result.get("text", "")).strip()
+        texts.append(text)
+        for segment in result.get("segments", []):
+            segments.append(
+                {
+                    "start": segment["start"] + start / whisper.audio.SAMPLE_RATE,
+                    "end": segment["end"] + start / whisper.audio.SAMPLE_RATE,
+                    "text": segment["text"],
+                }
+            )
+        if on_partial and len(windows) > 1:
+            on_partial({"index": index, "text": text, "partial": True})
+    return {"text": " ".join(t for t in texts if t), "segments": segments, "language": language}
+
+
+def _split_windows(audio: np.ndarray) -> list[tuple[int, int]]:
+    """(start, end) sample ranges of at most 30 seconds, cut at the quietest point near each window end"""
+    window = whisper.audio.N_SAMPLES  # 30 seconds at 16 kHz
+    search = int(_split_search * whisper.audio.SAMPLE_RATE)
+    frame = int(_split_frame * whisper.audio.SAMPLE_RATE)
+    bounds: list[tuple[int, int]] = []
+    start = 0
+    while len(audio) - start > window:
+        end = start + window
+        frames = audio[end - search : end].reshape(-1, frame)
+        cut = end - search + int((frames**2).mean(axis=1).argmin()) * frame + frame // 2
+        bounds.append((start, cut))
+        start = cut
+    bounds.append((start, len(audio)))
+    return bounds
+
+
+def _decode_audio(audio_bytes: bytes) -> np.ndarray:
+    # decode with ffmpeg through pipes, same format as whisper.load_audio but without a temp file
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le",
+        "-ar", str(whisper.audio.SAMPLE_RATE),
+        "pipe:1",
+    ]
+    try:
+        out = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='replace')}") from e
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def _acquire_model():
+    """(model, generation) for one job. Waits in short steps, so a model reset (new queue) is noticed."""
+    # each worker needs its own model, whisper decoding installs hooks on the model
+    global _models_loaded
+    workers = _get_workers()
+    while True:
+        with _pool_lock:
+            models, generation = _models, _models_generation
+            load = models.empty() and _models_loaded < workers
+            if load:
+                _models_loaded += 1
+        if load:
+            try:
+                return _load_model(_model_name, _model_quantize), generation
+            except Exception:
+                with _pool_lock:
+                    if generation == _models_generation:
+                        _models_loaded -= 1
+                raise
         try:
-            os.remove(temp_path)
-        except Exception:
-            pass # ignore errors during cleanup
+            return models.get(timeout=0.5), generation
+        except queue.Empty:
+            continue
+
+
+def _load_model(model_name: str, quantize: bool):
+    model = whisper.load_model(name=model_name, download_root=files.get_abs_path("/tmp/models/whisper"))  # type: ignore
+    if quantize and model.device.type == "cpu":
+        import torch
+        # int8 dynamic quantization of linear layers, faster CPU inference
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def _reset_models(model):
+    global _models, _models_loaded, _models_generation
+    with _pool_lock:
+        _models = queue.Queue()
+        _models.put(model)
+        _models_loaded = 1
+        _models_generation += 1
+
+
+def _get_executor(workers: int) -> ThreadPoolExecutor:
+    global _executor, _executor_workers
+    with _pool_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper")
+            _executor_workers = workers
+        return _executor
+
+
+def _get_workers() -> int:
+    return max(1, int(settings.get_settings().get("stt_workers", 1)))
+
+
+def _get_timeout() -> float:
+    return float(settings.get_settings().get("stt_timeout", 900))
+
+
+def _get_quantize() -> bool:
+    return bool(settings.get_settings().get("stt_quantize", False))
+
+
+def _get_language() -> str | None:
+    # stt_language is for the browser speech recognition, Whisper detects unless set here
+    language = settings.get_settings().get("stt_transcribe_language", "")
+    return language.strip() or None
@@ -0,0 +1,245 @@
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from python.helpers.print_style import PrintStyle
+
+CHUNK_SIZE = 1024 * 1024  # unit of parallel compression
+WINDOW_SIZE = 32 * 1024  # deflate window, each chunk is primed with the bytes before it
+MAX_WORKERS = os.cpu_count() or 1
+ZIP64_LIMIT = (1 << 31) - 1  # same conservative limit as zipfile
+
+# formats that are compressed already, deflating them again only costs time
+STORED_EXTENSIONS = {
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".rar",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".heic",
+    ".mp3", ".ogg", ".opus", ".m4a", ".aac", ".flac",
+    ".mp4", ".mkv", ".webm", ".mov", ".avi",
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp", ".epub", ".jar", ".whl",
+}
+
+_STORED = 0
+_DEFLATED = 8
+_FLAGS = 0x08 | 0x800  # sizes in data descriptor, utf-8 names
+
+
+@dataclass
+class _Entry:
+    name: str
+    path: str | None
+    data: bytes | None
+    size: int
+    mtime: float
+    mode: int
+    method: int
+    zip64: bool
+    offset: int = 0
+    crc: int = 0
+    compressed_size: int = 0
+    read: int = 0
+    skipped: bool = False
+
+
+def stream_zip(
+    members: Iterable[tuple[str, str | bytes]],
+    level: int = 6,
+    workers: int = MAX_WORKERS,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Zip archive as a stream of bytes, written while it is built, no seeking and no temp file.
+    Members are (archive name, file path or content). Files are split into chunks that
+    are read and deflated in parallel threads (zlib releases the GIL) and written in order,
+    so memory stays bounded by the chunks in flight. Already compressed formats are stored.
+    """
+    entries = (_entry(name, source, chunk_size) for name, source in members)
+    central: list[_Entry] = []
+    offset = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque[tuple[_Entry, int, int, Future]] = deque()
+        jobs = _jobs(entries, chunk_size)
+
+        def fill():
+            while len(pending) < workers * 4:
+                job = next(jobs, None)
+                if job is None:
+                    return
+                entry, index, count = job
+                future = executor.submit(_read_chunk, entry, index, count, level, chunk_size)
+                pending.append((entry, index, count, future))
+
+        fill()
+        while pending:
+            entry, index, count, future = pending.popleft()
+            fill()
+            if entry.skipped:
+                continue
+            try:
+                raw, out = future.result()
+            except OSError as e:
+                # first chunk, nothing written yet, leave the file out
+                PrintStyle().warning(f"Warning: Could not backup file {entry.path}: {e}")
+                entry.skipped = True
+                continue
+
+            if index == 0:
+                entry.offset = offset
+                header = _local_header(entry)
+                offset += len(header)
+                yield header
+                central.append(entry)
+
+            entry.crc = zlib.crc32(raw, entry.crc)
+            entry.read += len(raw)
+            entry.compressed_size += len(out)
+            offset += len(out)
+            if out:
+                yield out
+
+            if index == count - 1:
+                entry.size = entry.read  # the file may have shrunk since it was listed
+                descriptor = _data_descriptor(entry)
+                offset += len(descriptor)
+                yield descriptor
+
+    yield _central_directory(central, offset)
+
+
+def _entry(name: str, source: str | bytes, chunk_size: int) -> _Entry:
+    if isinstance(source, bytes):
+        return _Entry(
+            name=name, path=None, data=source, size=len(source), mtime=time.time(),
+            mode=0o100644, method=_DEFLATED, zip64=len(source) > ZIP64_LIMIT,
+        )
+    try:
+        stat = os.stat(source)
+        size, mtime, mode = stat.st_size, stat.st_mtime, stat.st_mode
+    except OSError:
+        size, mtime, mode = 0, time.time(), 0o100644  # reported when the first chunk fails
+    ext = os.path.splitext(name)[1].lower()
+    return _Entry(
+        name=name, path=source, data=None, size=size, mtime=mtime, mode=mode,
+        method=_STORED if ext in STORED_EXTENSIONS else _DEFLATED,
+        zip64=size > ZIP64_LIMIT,
+    )
+
+
+def _jobs(entries: Iterable[_Entry], chunk_size: int) -> Iterator[tuple[_Entry, int, int]]:
+    for entry in entries:
+        count = max(1, -(-entry.size // chunk_size))
+        for index in range(count):
+            yield entry, index, count
+
+
+def _read_chunk(
+    entry: _Entry, index: int, count: int, level: int, chunk_size: int
+) -> tuple[bytes, bytes]:
+    start = index * chunk_size
+    last = index == count - 1
+    length = max(0, min(chunk_size, entry.size - start))
+    window = min(start, WINDOW_SIZE) if entry.method == _DEFLATED else 0
+    if entry.data is not None:
+        zdict = entry.data[start - window : start]
+        raw = entry.data[start : start + length]
+    else:
+        try:
+            with open(entry.path, "rb") as f:  # type: ignore[arg-type]
+                f.seek(start - window)
+                zdict = f.read(window)
+                raw = f.read(length)
+        except OSError:
+            if index == 0:
+                raise
+            zdict, raw = b"", b""  # file vanished mid-way, archive what was read
+
+    if entry.method == _STORED:
+        return raw, raw
+    compressor = (
+        zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict)
+        if zdict
+        else zlib.compressobj(level, zlib.DEFLATED, -15)
+    )
+    # sync flush keeps chunks byte aligned and open, so they concatenate into one deflate stream
+    out = compressor.compress(raw) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+    return raw, out
+
+
+def _dos_time(mtime: float) -> tuple[int, int]:
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1  # 1980-01-01 00:00
+    return (
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+    )
+
+
+def _local_header(entry: _Entry) -> bytes:
+    name = entry.name.encode("utf-8")
+    dos_time, dos_date = _dos_time(entry.mtime)
+    if entry.zip64:
+        extra = struct.pack("<HHQQ", 0x0001, 16, 0, 0)
+        sizes = 0xFFFFFFFF
+    else:
+        extra = b""
+        sizes = 0
+    return (
+        struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50, 45 if entry.zip64 else 20, _FLAGS, entry.method,
+            dos_time, dos_date, 0, sizes, sizes, len(name), len(extra),
+        )
+        + name
+        + extra
+    )
+
+
+def _data_descriptor(entry: _Entry) -> bytes:
+    if entry.zip64:
+        return struct.pack("<IIQQ", 0x08074B50, entry.crc, entry.compressed_size, entry.size)
+    return struct.pack("<IIII", 0x08074B50, entry.crc, entry.compressed_size, entry.size)
+
+
+def _central_directory(entries: list[_Entry], cd_offset: int) -> bytes:
+    records = []
+    for entry in entries:
+        name = entry.name.encode("utf-8")
+        dos_time, dos_date = _dos_time(entry.mtime)
+        values = [entry.size, entry.compressed_size, entry.offset]
+        big = [v for v in values if v >= 0xFFFFFFFF]
+        extra = struct.pack(f"<HH{len(big)}Q", 0x0001, 8 * len(big), *big) if big else b""
+        size, compressed_size, offset = (min(v, 0xFFFFFFFF) for v in values)
+        version = 45 if entry.zip64 or big else 20
+        records.append(
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50, (3 << 8) | version, version, _FLAGS, entry.method,
+                dos_time, dos_date, entry.crc, compressed_size, size,
+                len(name), len(extra), 0, 0, 0, (entry.mode & 0xFFFF) << 16, offset,
+            )
+            + name
+            + extra
+        )
+    directory = b"".join(records)
+    count, cd_size = len(entries), len(directory)
+
+    if count >= 0xFFFF or cd_size >= 0xFFFFFFFF or cd_offset >= 0xFFFFFFFF:
+        zip64_end_offset = cd_offset + cd_size
+        directory += struct.pack(
+            "<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset
+        )
+        directory += struct.pack("<IIQI", 0x07064B50, 0, zip64_end_offset, 1)
+        count, cd_size, cd_offset = (
+            min(count, 0xFFFF), min(cd_size, 0xFFFFFFFF), min(cd_offset, 0xFFFFFFFF),
+        )
+    return directory + struct.pack(
+        "<IHHHHIIH", 0x06054B50, 0, 0, count, count, cd_size, cd_offset, 0
+    )
@@ -1,6 +1,6 @@
 from python.helpers.tool import Tool, Response
 from python.helpers.print_style import PrintStyle
-from python.helpers.fasta2a_client import connect_to_agent, is_client_available
+from python.helpers.fasta2a_client import get_connection, is_client_available
 
 
 class A2AChatTool(Tool):
@@ -28,26 +28,25 @@ class A2AChatTool(Tool):
 
         context_id = None if reset else sessions.get(agent_url)
         try:
-            async with await connect_to_agent(agent_url) as conn:
-                task_resp = await conn.send_message(user_message, attachments=attachments, context_id=context_id)
-                task_id = task_resp.get("result", {}).get("id")  # type: ignore[index]
-                if not task_id:
-                    return Response(message="Remote agent failed to create task.", break_loop=False)
-                final = await conn.wait_for_completion(task_id)
-                new_context_id = final["result"].get("context_id")  # type: ignore[index]
-                if isinstance(new_context_id, str):
-                    sessions[agent_url] = new_context_id
-                    # persist back to agent data
-                    self.agent.set_data("_a2a_sessions", sessions)
-                # Extract latest assistant text
-                history = final["result"].get("history", [])
-                assistant_text = ""
-                if history:
-                    last_parts = history[-1].get("parts", [])
-                    assistant_text = "\n".join(
-                        p.get("text", "") for p in last_parts if p.get("kind") == "text"
-                    )
-                return Response(message=assistant_text or "(no response)", break_loop=False)
+            # pooled connection, streams the result when the remote agent supports it
+            conn = await get_connection(agent_url)
+            final = await conn.send_and_wait(user_message, attachments=attachments, context_id=context_id)
+            if "result" not in final:
+                return Response(message="Remote agent failed to create task.", break_loop=False)
+            new_context_id = final["result"].get("context_id")  # type: ignore[index]
+            if isinstance(new_context_id, str):
+                sessions[agent_url] = new_context_id
+                # persist back to agent data
+                self.agent.set_data("_a2a_sessions", sessions)
+            # Extract latest assistant text
+            history = final["result"].get("history", [])
+            assistant_text = ""
+            if history:
+                last_parts = history[-1].get("parts", [])
+                assistant_text = "\n".join(
+                    p.get("text", "") for p in last_parts if p.get("kind") == "text"
+                )
+            return Response(message=assistant_text or "(no response)", break_loop=False)
         except Exception as e:
             PrintStyle.error(f"A2A chat error: {e}")
             return Response(message=f"A2A chat error: {e}", break_loop=False)
@@ -1,37 +1,19 @@
 from agent import Agent, UserMessage
 from python.helpers.tool import Tool, Response
-from initialize import initialize_agent
+from python.helpers.subordinates import SubordinatePool, reset_agent, subordinate_config
 from python.extensions.hist_add_tool_result import _90_save_tool_call_file as save_tool_call_file
 
 
 class Delegation(Tool):
 
-    async def execute(self, message="", reset="", **kwargs):
-        # create subordinate agent using the data object on this agent and set superior agent to his data object
-        if (
-            self.agent.get_data(Agent.DATA_NAME_SUBORDINATE) is None
-            or str(reset).lower().strip() == "true"
-        ):
-            # initialize default config
-            config = initialize_agent()
-
-            # set subordinate prompt profile if provided, if not, keep original
-            agent_profile = kwargs.get("profile")
-            if agent_profile:
-                config.profile = agent_profile
-
-            # crate agent
-            sub = Agent(self.agent.number + 1, config, self.agent.context)
-            # register superior/subordinate
-            sub.set_data(Agent.DATA_NAME_SUPERIOR, self.agent)
-            self.agent.set_data(Agent.DATA_NAME_SUBORDINATE, sub)
-
-        # add user message to subordinate agent
-        subordinate: Agent = self.agent.get_data(Agent.DATA_NAME_SUBORDINATE)  # type: ignore
-        subordinate.hist_add_user_message(UserMessage(message=message, attachments=[]))
+    async def execute(self, message="", reset="", subtasks=None, **kwargs):
+        reset = str(reset).lower().strip() == "true"
+        agent_profile = kwargs.get("profile") or ""
 
-        # run subordinate monologue
-        result = await subordinate.monologue()
+        if subtasks:
+            result = await self.delegate_parallel(subtasks, agent_profile, reset)
+        else:
+            result = await self.delegate(message, agent_profile, reset)
 
         # hint to use includes for long responses
         additional = None
@@ -43,10 +25,52 @@ class Delegation(Tool):
         # result
         return Response(message=result, break_loop=False, additional=additional)
 
+    async def delegate(self, message: str, agent_profile: str, reset: bool) -> str:
+        # create subordinate agent using the data object on this agent and set superior agent to his data object
+        subordinate: Agent | None = self.agent.get_data(Agent.DATA_NAME_SUBORDINATE)
+        config = subordinate_config(self.agent, agent_profile)
+        if subordinate and reset and subordinate.config.profile == config.profile:
+            # same profile, reuse the warm agent with a clean history and current settings
+            subordinate.config = config
+            reset_agent(subordinate)
+        elif subordinate is None or reset:
+            # crate agent
+            subordinate = Agent(self.agent.number + 1, config, self.agent.context)
+            # register superior/subordinate
+            subordinate.set_data(Agent.DATA_NAME_SUPERIOR, self.agent)
+            self.agent.set_data(Agent.DATA_NAME_SUBORDINATE, subordinate)
+
+        # add user message to subordinate agent
+        subordinate.hist_add_user_message(UserMessage(message=message, attachments=[]))
+
+        # run subordinate monologue
+        return await subordinate.monologue()
+
+    async def delegate_parallel(self, subtasks, agent_profile: str, reset: bool) -> str:
+        # subtasks: list of messages or {"message", "profile", "name"}, names address warm subordinates later
+        items = []
+        for i, subtask in enumerate(subtasks if isinstance(subtasks, list) else [subtasks]):
+            if not isinstance(subtask, dict):
+                subtask = {"message": str(subtask)}
+            name = str(subtask.get("name") or f"sub{i + 1}")
+            items.append((name, subtask.get("profile") or agent_profile, str(subtask.get("message", ""))))
+
+        results = await SubordinatePool.get(self.agent).run(items, reset)
+        return "\n\n".join(
+            self.agent.read_prompt("fw.call_sub.result.md", name=name, result=result)
+            for name, result in results
+        )
+
     def get_log_object(self):
+        subtasks = self.args.get("subtasks")
+        if subtasks:
+            count = len(subtasks) if isinstance(subtasks, list) else 1
+            heading = f"icon://communication {self.agent.agent_name}: Calling {count} Subordinate Agents"
+        else:
+            heading = f"icon://communication {self.agent.agent_name}: Calling Subordinate Agent"
         return self.agent.context.log.log(
             type="tool",
-            heading=f"icon://communication {self.agent.agent_name}: Calling Subordinate Agent",
+            heading=heading,
             content="",
             kvps=self.args,
         )
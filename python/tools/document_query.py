@@ -7,7 +7,9 @@ class DocumentQueryTool(Tool):
     async def execute(self, **kwargs):
         document_uri = kwargs["document"] or None
         queries = kwargs["queries"] if "queries" in kwargs else [kwargs["query"]] if ("query" in kwargs and kwargs["query"]) else []
-        if not isinstance(document_uri, str) or not document_uri:
+        if isinstance(document_uri, list) and document_uri and queries:
+            pass  # several documents can be queried at once
+        elif not isinstance(document_uri, str) or not document_uri:
             return Response(message="Error: no document provided", break_loop=False)
         try:
 
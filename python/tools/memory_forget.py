@@ -7,7 +7,10 @@ class MemoryForget(Tool):
 
     async def execute(self, query="", threshold=DEFAULT_THRESHOLD, filter="", **kwargs):
         db = await Memory.get(self.agent)
-        dels = await db.delete_documents_by_query(query=query, threshold=threshold, filter=filter)
+        try:
+            dels = await db.delete_documents_by_query(query=query, threshold=threshold, filter=filter)
+        except ValueError as e:  # invalid filter, let the agent correct it
+            return Response(message=str(e), break_loop=False)
 
         result = self.agent.read_prompt("fw.memories_deleted.md", memory_count=len(dels))
         return Response(message=result, break_loop=False)
@@ -9,7 +9,10 @@ class MemoryLoad(Tool):
 
     async def execute(self, query="", threshold=DEFAULT_THRESHOLD, limit=DEFAULT_LIMIT, filter="", **kwargs):
         db = await Memory.get(self.agent)
-        docs = await db.search_similarity_threshold(query=query, limit=limit, threshold=threshold, filter=filter)
+        try:
+            docs = await db.search_similarity_threshold(query=query, limit=limit, threshold=threshold, filter=filter)
+        except ValueError as e:  # invalid filter, let the agent correct it
+            return Response(message=str(e), break_loop=False)
 
         if len(docs) == 0:
             result = self.agent.read_prompt("fw.memories_not_found.md", query=query)
@@ -9,7 +9,7 @@ import socket
 import struct
 from functools import wraps
 import threading
-from flask import Flask, request, Response, session, redirect, url_for, render_template_string
+from flask import Flask, request, Response, session, redirect, url_for, render_template_string, abort
 from werkzeug.wrappers.response import Response as BaseResponse
 import initialize
 from python.helpers import files, git, mcp_server, fasta2a_server
@@ -19,6 +19,7 @@ from python.helpers import runtime, dotenv, process
 from python.helpers.extract_tools import load_classes_from_folder
 from python.helpers.api import ApiHandler
 from python.helpers.print_style import PrintStyle
+from python.helpers.static_assets import StaticAssets
 
 # disable logging
 import logging
@@ -45,6 +46,10 @@ webapp.config.update(
 
 lock = threading.Lock()
 
+static_assets = StaticAssets()
+_version_info = None
+_index_cache = {}
+
 # Set up basic authentication for UI and API but not MCP
 # basic_auth = BasicAuth(webapp)
 
@@ -174,7 +179,7 @@ async def login():
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
-        user = user_management.authenticate_user(username, password)
+        user = await user_management.authenticate_user_async(username, password)
         if user:
             session['username'] = user['username']
             session['role'] = user['role']
@@ -227,25 +232,52 @@ async def logout():
     session.clear()
     return redirect(url_for('login'))
 
+def _get_version_info():
+    # git lookups are slow, the version does not change while running
+    global _version_info
+    if _version_info is None:
+        try:
+            _version_info = git.get_git_info()
+        except Exception:
+            _version_info = {
+                "version": "unknown",
+                "commit_time": "unknown",
+            }
+    return _version_info
+
+
+def _render_index() -> bytes:
+    # rendered once per index.html version, with fingerprinted asset urls
+    version = (os.stat(get_abs_path("webui/index.html")).st_mtime_ns, static_assets.generation)
+    if _index_cache.get("version") != version:
+        gitinfo = _get_version_info()
+        index = files.read_file("webui/index.html")
+        index = files.replace_placeholders_text(
+            _content=index,
+            version_no=gitinfo["version"],
+            version_time=gitinfo["commit_time"]
+        )
+        _index_cache.update(version=version, html=static_assets.fingerprint_html(index).encode("utf-8"))
+    return _index_cache["html"]
+
+
 # handle default address, load index
 @webapp.route("/", methods=["GET"])
 @requires_auth
 async def serve_index():
-    gitinfo = None
-    try:
-        gitinfo = git.get_git_info()
-    except Exception:
-        gitinfo = {
-            "version": "unknown",
-            "commit_time": "unknown",
-        }
-    index = files.read_file("webui/index.html")
-    index = files.replace_placeholders_text(
-        _content=index,
-        version_no=gitinfo["version"],
-        version_time=gitinfo["commit_time"]
+    return static_assets.compress_response(
+        _render_index(), "text/html", request, {"Cache-Control": "no-cache"}, cache_key="/"
     )
-    return index
+
+
+def serve_static(filename):
+    response = static_assets.response(filename, request)
+    if response is None:
+        abort(404)
+    return response
+
+
+webapp.view_functions["static"] = serve_static
 
 def run():
     PrintStyle().print("Initializing framework...")
@@ -268,6 +300,9 @@ def run():
         runtime.get_arg("host") or dotenv.get_dotenv_value("WEB_UI_HOST") or "localhost"
     )
     server = None
+    # "asgi" serves API handlers, MCP and A2A on one event loop under uvicorn
+    server_mode = runtime.get_arg("server") or dotenv.get_dotenv_value("WEB_UI_SERVER") or "wsgi"
+    api_views = {}
 
     def register_api_handler(app, handler: type[ApiHandler]):
         name = handler.__module__.split(".")[-1]
@@ -293,29 +328,48 @@ def run():
             handler_wrap,
             methods=handler.get_methods(),
         )
+        api_views[f"/{name}"] = (handler_wrap, handler.get_methods(), handler.runs_on_event_loop())
+
+    # content hashes of scripts and styles, compressed variants are prepared in the background
+    static_assets.build()
+    _get_version_info()
+    threading.Thread(target=static_assets.warm, daemon=True).start()
 
     # initialize and register API handlers
     handlers = load_classes_from_folder("python/api", "*.py", ApiHandler)
     for handler in handlers:
         register_api_handler(webapp, handler)
 
-    # add the webapp, mcp, and a2a to the app
-    middleware_routes = {
-        "/mcp": ASGIMiddleware(app=mcp_server.DynamicMcpProxy.get_instance()),  # type: ignore
-        "/a2a": ASGIMiddleware(app=fasta2a_server.DynamicA2AProxy.get_instance()),  # type: ignore
-    }
+    PrintStyle().debug(f"Starting server at http://{host}:{port} ...")
 
-    app = DispatcherMiddleware(webapp, middleware_routes)  # type: ignore
+    if server_mode == "asgi":
+        from python.helpers.asgi_server import AsgiApp, AsgiServer
 
-    PrintStyle().debug(f"Starting server at http://{host}:{port} ...")
+        asgi_app = AsgiApp(
+            webapp,
+            api_views,
+            {
+                "/mcp": mcp_server.DynamicMcpProxy.get_instance(),
+                "/a2a": fasta2a_server.DynamicA2AProxy.get_instance(),
+            },
+        )
+        server = AsgiServer(asgi_app, host, port)
+    else:
+        # add the webapp, mcp, and a2a to the app
+        middleware_routes = {
+            "/mcp": ASGIMiddleware(app=mcp_server.DynamicMcpProxy.get_instance()),  # type: ignore
+            "/a2a": ASGIMiddleware(app=fasta2a_server.DynamicA2AProxy.get_instance()),  # type: ignore
+        }
 
-    server = make_server(
-        host=host,
-        port=port,
-        app=app,
-        request_handler=NoRequestLoggingWSGIRequestHandler,
-        threaded=True,
-    )
+        app = DispatcherMiddleware(webapp, middleware_routes)  # type: ignore
+
+        server = make_server(
+            host=host,
+            port=port,
+            app=app,
+            request_handler=NoRequestLoggingWSGIRequestHandler,
+            threaded=True,
+        )
     process.set_server(server)
     server.log_startup()
 
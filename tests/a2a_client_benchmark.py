@@ -0,0 +1,105 @@
+import sys, os, time, asyncio, threading, contextlib, tempfile, statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# latency of waiting for remote A2A tasks against a local in-process server, with a stub
+# worker that answers after a fixed delay: fixed 2 s polling (the old client), polling
+# with exponential backoff, and the message/stream event stream
+# usage: python tests/a2a_client_benchmark.py [concurrent tasks, default 20]
+
+TASKS = 20
+WORK_TIME = 0.5  # seconds the stub worker takes per task
+PORT = 50881
+
+
+def build_app(db_path: str):
+    from fasta2a import Worker
+    from fasta2a.broker import InMemoryBroker
+    from python.helpers.a2a_task_store import A2ATaskStore
+    from python.helpers.fasta2a_server import AgentZeroA2A, AgentZeroTaskManager
+
+    class EchoWorker(Worker):
+        async def run_task(self, params):
+            asyncio.create_task(self._answer(params))
+
+        async def _answer(self, params):
+            await self.storage.update_task(params["id"], state="working")
+            await asyncio.sleep(WORK_TIME)
+            text = params["message"]["parts"][0]["text"]
+            reply = {"role": "agent", "parts": [{"kind": "text", "text": f"echo: {text}"}], "kind": "message", "message_id": "r"}
+            await self.storage.update_task(params["id"], state="completed", new_messages=[reply])
+
+        async def cancel_task(self, params):
+            await self.storage.update_task(params["id"], state="canceled")
+
+        def build_message_history(self, history):
+            return history
+
+        def build_artifacts(self, result):
+            return []
+
+    storage = A2ATaskStore(db_path)
+    broker = InMemoryBroker()
+    worker = EchoWorker(broker=broker, storage=storage)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with app.task_manager, worker.run():
+            yield
+
+    app = AgentZeroA2A(storage=storage, broker=broker, name="benchmark", lifespan=lifespan)
+    app.task_manager = AgentZeroTaskManager(broker=broker, storage=storage)
+    return app
+
+
+async def run_tasks(streaming: bool) -> list[float]:
+    from python.helpers import fasta2a_client
+
+    conn = await fasta2a_client.get_connection(f"http://127.0.0.1:{PORT}", token="")
+    conn._agent_card = dict(conn._agent_card or {}, capabilities={"streaming": streaming})
+
+    async def one(i: int) -> float:
+        start = time.perf_counter()
+        final = await conn.send_and_wait(f"task {i}", context_id=f"bench-{i}")
+        assert final["result"]["history"][-1]["parts"][0]["text"] == f"echo: task {i}", final
+        return time.perf_counter() - start
+
+    latencies = await asyncio.gather(*(one(i) for i in range(TASKS)))
+    await fasta2a_client.close_connections()
+    fasta2a_client._agent_cards.clear()
+    return list(latencies)
+
+
+def report(label: str, latencies: list[float]):
+    print(
+        f"{label:16} mean {statistics.mean(latencies):6.2f} s  max {max(latencies):6.2f} s"
+        f"  (work {WORK_TIME:.2f} s, {TASKS} tasks at once)"
+    )
+
+
+def bench(label: str, streaming: bool, poll_min: float):
+    from python.helpers import fasta2a_client
+
+    fasta2a_client.POLL_MIN_INTERVAL = poll_min
+    report(label, asyncio.run(run_tasks(streaming)))
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else TASKS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(os.path.join(tmp, "a2a_tasks.db"))
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=PORT, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+        try:
+            bench("poll fixed 2 s", streaming=False, poll_min=2)
+            bench("poll backoff", streaming=False, poll_min=0.25)
+            bench("event stream", streaming=True, poll_min=0.25)
+        finally:
+            server.should_exit = True
+            thread.join()
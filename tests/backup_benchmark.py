@@ -0,0 +1,65 @@
+import sys, os, time, shutil, tempfile, zipfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import zip_stream
+
+# backup archive throughput and peak extra disk usage on a synthetic tree:
+# serial zipfile into a temp file (as before) vs the parallel zip stream sent straight to the client
+# usage: python tests/backup_benchmark.py [size in GB, default 5]
+
+SIZE_GB = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+FILE_SIZE = 8 * 1024 * 1024
+TEXT = b"memory fragment with some repetitive json {\"area\": \"main\", \"id\": 123}\n"
+
+
+def build(folder: str) -> list[tuple[str, str]]:
+    members = []
+    count = int(SIZE_GB * 1024**3 // FILE_SIZE)
+    text = (TEXT * (FILE_SIZE // len(TEXT) + 1))[:FILE_SIZE]
+    for i in range(count):
+        # a quarter already compressed media, the rest compressible text
+        ext = "jpg" if i % 4 == 0 else "json"
+        path = os.path.join(folder, f"dir{i % 20}", f"file{i}.{ext}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(os.urandom(FILE_SIZE) if ext == "jpg" else text)
+        members.append((os.path.relpath(path, folder), path))
+    return members
+
+
+def serial(members, out_dir: str) -> tuple[int, int]:
+    zip_path = os.path.join(out_dir, "backup.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for name, path in members:
+            zipf.write(path, name)
+    size = os.path.getsize(zip_path)
+    os.remove(zip_path)
+    return size, size  # whole archive sits on disk before the download starts
+
+
+def streamed(members, out_dir: str) -> tuple[int, int]:
+    size = 0
+    for chunk in zip_stream.stream_zip(members):
+        size += len(chunk)  # sent to the client, nothing written locally
+    return size, 0
+
+
+def run(label: str, fn, members, out_dir: str, total: int):
+    start = time.perf_counter()
+    size, disk = fn(members, out_dir)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:8} {elapsed:7.2f}s  {total / elapsed / 1024**2:8.1f} MB/s  "
+        f"archive {size / 1024**2:8.1f} MB  peak extra disk {disk / 1024**2:8.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    folder = tempfile.mkdtemp()
+    try:
+        members = build(folder)
+        total = sum(os.path.getsize(path) for _, path in members)
+        run("serial", serial, members, folder, total)
+        run("streamed", streamed, members, folder, total)
+    finally:
+        shutil.rmtree(folder)
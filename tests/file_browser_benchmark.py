@@ -0,0 +1,67 @@
+import sys, os, time, shutil, tempfile, subprocess
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import file_browser
+from python.helpers.file_browser import FileBrowser
+
+# listing a 100k entry directory: ls -la parsing plus a stat per entry (as before)
+# vs the os.scandir lister, cold, cached and paged
+
+ENTRIES = 100_000
+PAGE = 500
+
+
+def build(folder: str):
+    for i in range(ENTRIES):
+        if i % 50 == 0:
+            os.mkdir(os.path.join(folder, f"dir{i}"))
+        else:
+            with open(os.path.join(folder, f"file{i}.txt"), "w") as f:
+                f.write("x" * (i % 1000))
+
+
+def ls_listing(folder: str) -> int:
+    result = subprocess.run(["ls", "-la", folder], capture_output=True, text=True)
+    count = 0
+    for line in result.stdout.strip().split("\n")[1:]:
+        parts = line.split()
+        if len(parts) < 9 or parts[8] in (".", ".."):
+            continue
+        os.stat(os.path.join(folder, " ".join(parts[8:])))
+        count += 1
+    return count
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:24} {time.perf_counter() - start:7.3f}s  {result}")
+
+
+if __name__ == "__main__":
+    folder = tempfile.mkdtemp()
+    try:
+        build(folder)
+        browser = FileBrowser()
+        browser.base_dir = Path(folder)
+        timed("ls -la + stat", lambda: f"{ls_listing(folder)} entries")
+        timed("scandir cold, all", lambda: f"{len(browser.get_files('', limit=0)['entries'])} entries")
+        timed("cached, first page", lambda: f"{len(browser.get_files('', limit=PAGE)['entries'])} entries")
+        timed("cached, sort by size", lambda: f"{len(browser.get_files('', limit=PAGE, sort_by='size', sort_dir='desc')['entries'])} entries")
+        timed("cached, filter", lambda: f"{browser.get_files('', limit=PAGE, filter='file9*')['total']} matches")
+
+        def walk_pages():
+            cursor, pages = "", 0
+            while True:
+                page = browser.get_files("", cursor=cursor, limit=PAGE)
+                pages += 1
+                cursor = page["next_cursor"]
+                if not cursor:
+                    return f"{pages} pages"
+
+        timed("cached, all pages", walk_pages)
+        file_browser._listing_cache.clear()
+        timed("scandir cold, first page", lambda: f"{len(browser.get_files('', limit=PAGE)['entries'])} entries")
+    finally:
+        shutil.rmtree(folder)
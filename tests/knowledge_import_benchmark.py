@@ -0,0 +1,42 @@
+import sys, os, time, tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import knowledge_import
+
+# knowledge import throughput in files/sec on a synthetic corpus:
+# cold import (hash and parse everything), warm rescan (size/mtime skip) and a touched corpus (hash only)
+
+FILES = 10_000
+TEXT = "lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 60  # ~3.5 KB per file
+
+
+def build(folder: str):
+    for i in range(FILES):
+        sub = os.path.join(folder, f"dir{i % 100}")
+        os.makedirs(sub, exist_ok=True)
+        ext = "md" if i % 2 else "txt"
+        with open(os.path.join(sub, f"file{i}.{ext}"), "w") as f:
+            f.write(f"# Document {i}\n\n{TEXT}")
+
+
+def run(label: str, folder: str, index: dict):
+    start = time.perf_counter()
+    index = knowledge_import.load_knowledge(None, folder, index, {"area": "main"})
+    elapsed = time.perf_counter() - start
+    changed = sum(1 for f in index.values() if f["state"] == "changed")
+    print(f"{label:8} {elapsed:7.2f}s  {FILES / elapsed:9.0f} files/s  {changed} changed")
+    for f in index.values():
+        f["documents"] = []
+    return index
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        build(folder)
+        index = run("cold", folder, {})
+        index = run("warm", folder, index)
+        now = time.time()
+        for root, _, names in os.walk(folder):
+            for name in names:
+                os.utime(os.path.join(root, name), (now, now))
+        run("touched", folder, index)
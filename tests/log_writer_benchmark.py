@@ -0,0 +1,40 @@
+import sys, os, time, tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers.log_writer import BufferedLogWriter
+
+# time spent by the printing thread on HTML log writes of a streamed response:
+# open/append/close per print (as before) vs the buffered background writer
+
+PRINTS = 100_000
+LINE = '<span style="color: rgb(179, 255, 217);">streamed response token chunk</span>'
+
+
+def direct(folder: str) -> float:
+    path = os.path.join(folder, "direct.html")
+    start = time.perf_counter()
+    for _ in range(PRINTS):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(LINE)
+    return time.perf_counter() - start
+
+
+def buffered(folder: str) -> tuple[float, float, int]:
+    writer = BufferedLogWriter(os.path.join(folder, "buffered"))
+    start = time.perf_counter()
+    for _ in range(PRINTS):
+        writer.write(LINE)
+    caller = time.perf_counter() - start
+    writer.close(timeout=60)
+    return caller, time.perf_counter() - start, writer.dropped
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        elapsed = direct(folder)
+        print(f"direct    caller {elapsed:6.2f}s  {PRINTS / elapsed:10.0f} prints/s")
+        caller, total, dropped = buffered(folder)
+        print(
+            f"buffered  caller {caller:6.2f}s  {PRINTS / caller:10.0f} prints/s  "
+            f"until flushed {total:6.2f}s  dropped {dropped}"
+        )
@@ -0,0 +1,95 @@
+import sys, os, time, asyncio, json, tempfile
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# end-of-monologue memorization wall time: one consolidation per memory vs the batched pipeline,
+# with a local fake utility LLM and embedding model that only add latency
+
+MEMORIES = 12  # extracted fragments and solutions
+EXISTING = 5000  # memories already in the database
+DIMENSIONS = 384
+LLM_LATENCY = 0.5  # seconds per utility model call
+EMBED_LATENCY = 0.02  # seconds per embedding call, independent of batch size
+
+
+def fake_embeddings():
+    from langchain_core.embeddings import FakeEmbeddings
+
+    class SlowFakeEmbeddings(FakeEmbeddings):
+        def embed_documents(self, texts):
+            time.sleep(EMBED_LATENCY)
+            return super().embed_documents(texts)
+
+        def embed_query(self, text):
+            time.sleep(EMBED_LATENCY)
+            return super().embed_query(text)
+
+    return SlowFakeEmbeddings(size=DIMENSIONS)
+
+
+class FakeAgent:
+    def __init__(self):
+        self.config = SimpleNamespace(memory_subdir="benchmark")
+        self.calls = 0
+
+    def read_prompt(self, file, **kwargs):
+        return file
+
+    async def call_utility_model(self, system, message, callback=None, background=False):
+        self.calls += 1
+        await asyncio.sleep(LLM_LATENCY)
+        if "keyword" in system:
+            return json.dumps(["benchmark keyword", "memory"])
+        return json.dumps({"action": "keep_separate", "new_memory_content": "consolidated memory"})
+
+
+def build_memory(folder: str):
+    import numpy as np
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_core.documents import Document
+    from python.helpers.memory import Memory
+    from python.helpers.vector_db import MyFaiss
+
+    embeddings = fake_embeddings()
+    db = MyFaiss(embeddings, faiss.IndexFlatIP(DIMENSIONS), InMemoryDocstore(), {})
+    docs = [
+        Document(f"existing memory {i}", metadata={"id": f"m{i}", "area": "fragments"})
+        for i in range(EXISTING)
+    ]
+    # precomputed vectors, only the benchmarked part pays embedding latency
+    vectors = np.random.default_rng(0).normal(size=(EXISTING, DIMENSIONS)).tolist()
+    db.add_embeddings(
+        [(d.page_content, v) for d, v in zip(docs, vectors)],
+        metadatas=[d.metadata for d in docs],
+        ids=[d.metadata["id"] for d in docs],
+    )
+    Memory.index["benchmark"] = db
+    Memory._save_db_file = staticmethod(lambda db, subdir: db.save_local(folder))
+
+
+async def run(batched: bool):
+    from python.helpers.memory_consolidation import create_memory_consolidator
+
+    agent = FakeAgent()
+    consolidator = create_memory_consolidator(agent)  # type: ignore
+    items = [
+        {"content": f"new memory {i}", "area": "fragments", "metadata": {"area": "fragments"}}
+        for i in range(MEMORIES)
+    ]
+    start = time.perf_counter()
+    if batched:
+        await consolidator.process_new_memories(items, concurrency=4)
+    else:
+        for item in items:
+            await consolidator.process_new_memory(item["content"], item["area"], item["metadata"])
+    elapsed = time.perf_counter() - start
+    print(f"{'batched' if batched else 'sequential':10} {elapsed:7.2f}s  {agent.calls} LLM calls")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        build_memory(folder)
+        asyncio.run(run(batched=False))
+        asyncio.run(run(batched=True))
@@ -0,0 +1,72 @@
+import sys, os, time, json, subprocess, tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# cold open time and RSS of a memory subdir: pickled docstore vs sqlite docstore + mmap index
+
+DOCS = 100_000
+DIMENSIONS = 384
+TEXT = "lorem ipsum dolor sit amet " * 40  # ~1 KB per document
+
+
+def build(folder: str):
+    import numpy as np
+    import faiss
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import FakeEmbeddings
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from python.helpers.vector_db import MyFaiss
+    from python.helpers.disk_docstore import SqliteDocstore
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(DOCS, DIMENSIONS)).astype(np.float32)
+    ids = [f"doc{i}" for i in range(DOCS)]
+    docs = {
+        id: Document(TEXT, metadata={"id": id, "area": "main", "timestamp": "2024-01-01 00:00:00"})
+        for id in ids
+    }
+    mapping = {i: id for i, id in enumerate(ids)}
+
+    for name, docstore in (
+        ("pickle", InMemoryDocstore(dict(docs))),
+        ("sqlite", SqliteDocstore(os.path.join(folder, "sqlite", "docstore.db"))),
+    ):
+        if isinstance(docstore, SqliteDocstore):
+            docstore.add(docs)
+        index = faiss.IndexFlatIP(DIMENSIONS)
+        index.add(vectors)
+        db = MyFaiss(FakeEmbeddings(size=DIMENSIONS), index, docstore, dict(mapping))
+        db.save_local(os.path.join(folder, name))
+
+
+def open_db(folder: str, kind: str):
+    import psutil
+    from langchain_core.embeddings import FakeEmbeddings
+    from python.helpers.vector_db import MyFaiss
+
+    process = psutil.Process()
+    before = process.memory_info().rss
+    start = time.perf_counter()
+    path = os.path.join(folder, kind)
+    if kind == "pickle":
+        db = MyFaiss.load_local(path, FakeEmbeddings(size=DIMENSIONS), allow_dangerous_deserialization=True)
+    else:
+        db = MyFaiss.load_lazy(path, FakeEmbeddings(size=DIMENSIONS))
+    opened = time.perf_counter() - start
+    # steady state: a few filtered searches
+    for _ in range(10):
+        db.search_vector_threshold([0.1] * DIMENSIONS, 10, 0.0, "area == 'main'")
+    rss = (process.memory_info().rss - before) / 1024 / 1024
+    print(json.dumps({"kind": kind, "open_s": round(opened, 3), "rss_mb": round(rss, 1)}))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        open_db(sys.argv[1], sys.argv[2])
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as folder:
+        build(folder)
+        for kind in ("pickle", "sqlite"):
+            # fresh process per format so caches and RSS do not carry over
+            subprocess.run([sys.executable, __file__, folder, kind], check=True)
@@ -0,0 +1,90 @@
+import sys, os, time, asyncio, threading, http.client, statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flask import Flask, Response, request
+
+# requests/s and latency of an async API handler on the threaded werkzeug server
+# (an event loop per request) vs the ASGI mode (one uvicorn event loop)
+# usage: python tests/server_benchmark.py [concurrency, default 32]
+
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+REQUESTS = 3000
+HANDLER_WAIT = 0.005  # seconds the handler awaits, like a short RFC or db call
+
+
+def build_app() -> Flask:
+    app = Flask("benchmark")
+
+    async def api():
+        await asyncio.sleep(HANDLER_WAIT)
+        return Response(f'{{"ok": true, "len": {len(request.get_data())}}}', mimetype="application/json")
+
+    app.add_url_rule("/api", "/api", api, methods=["POST"])
+    return app
+
+
+def load(port: int) -> tuple[float, list[float]]:
+    local = threading.local()
+
+    def one(_):
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection("127.0.0.1", port)
+        start = time.perf_counter()
+        local.conn.request("POST", "/api", body=b'{"text": "hello"}', headers={"Content-Type": "application/json"})
+        local.conn.getresponse().read()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        latencies = list(executor.map(one, range(REQUESTS)))
+    return time.perf_counter() - start, latencies
+
+
+def report(label: str, elapsed: float, latencies: list[float]):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{label:6} {REQUESTS / elapsed:8.0f} req/s  p50 {statistics.median(latencies) * 1000:7.1f} ms"
+        f"  p99 {p99 * 1000:7.1f} ms"
+    )
+
+
+def bench_wsgi(app: Flask, port: int):
+    from werkzeug.serving import make_server, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive like uvicorn
+
+        def log_request(self, code="-", size="-"):
+            pass
+
+    server = make_server("127.0.0.1", port, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        report("wsgi", *load(port))
+    finally:
+        server.shutdown()
+
+
+def bench_asgi(app: Flask, port: int):
+    from python.helpers.asgi_server import AsgiApp, AsgiServer
+
+    api = app.view_functions["/api"]
+    server = AsgiServer(AsgiApp(app, {"/api": (api, ["POST"], True)}, {}), "127.0.0.1", port)
+    thread = threading.Thread(target=server.server.run, daemon=True)
+    thread.start()
+    while not server.server.started:
+        time.sleep(0.05)
+    try:
+        report("asgi", *load(port))
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+if __name__ == "__main__":
+    app = build_app()
+    bench_wsgi(app, 50871)
+    bench_asgi(app, 50872)
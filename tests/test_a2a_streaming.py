@@ -0,0 +1,65 @@
+import sys, os, json, asyncio, contextlib, time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from a2a_client_benchmark import WORK_TIME, build_app
+from python.helpers import fasta2a_client
+
+BASE_URL = "http://a2a.test"
+
+
+@contextlib.asynccontextmanager
+async def connection(db_path: str, methods: list[str]):
+    """Client connection to the benchmark's in-process A2A app, records the JSON-RPC methods sent"""
+    app = build_app(db_path)
+
+    async def record(request: httpx.Request):
+        if request.method == "POST":
+            methods.append(json.loads(request.content)["method"])
+
+    fasta2a_client._agent_cards.pop(BASE_URL, None)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url=BASE_URL, event_hooks={"request": [record]}
+        ) as client:
+            yield fasta2a_client.AgentConnection(BASE_URL, http_client=client)
+    fasta2a_client._agent_cards.pop(BASE_URL, None)
+
+
+def test_send_and_wait_over_stream(tmp_path):
+    async def run():
+        methods = []
+        async with connection(str(tmp_path / "a2a_tasks.db"), methods) as conn:
+            start = time.perf_counter()
+            final = await conn.send_and_wait("hello", context_id="ctx")
+            elapsed = time.perf_counter() - start
+
+        task = final["result"]
+        assert task["status"]["state"] == "completed"
+        assert task["history"][-1]["parts"][0]["text"] == "echo: hello"
+        # answered off the event stream, without polling tasks/get
+        assert methods == ["message/stream", "tasks/get"]
+        assert elapsed < WORK_TIME + 1
+
+    asyncio.run(run())
+
+
+def test_wait_for_tasks_resubscribes(tmp_path):
+    async def run():
+        methods = []
+        async with connection(str(tmp_path / "a2a_tasks.db"), methods) as conn:
+            ids = [
+                (await conn.send_message(f"task {i}", context_id=f"ctx-{i}"))["result"]["id"]
+                for i in range(3)
+            ]
+            finals = await conn.wait_for_tasks(ids, max_wait=10)
+
+        assert [final["result"]["history"][-1]["parts"][0]["text"] for final in finals] == [
+            f"echo: task {i}" for i in range(3)
+        ]
+        assert methods.count("tasks/resubscribe") == 3
+
+    asyncio.run(run())
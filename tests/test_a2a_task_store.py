@@ -0,0 +1,139 @@
+import sys, os, asyncio, time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fasta2a.broker import InMemoryBroker
+
+from python.helpers.a2a_task_store import A2ATaskStore
+from python.helpers.fasta2a_server import AgentZeroTaskManager, AgentZeroWorker
+
+
+def user_message(text: str) -> dict:
+    return {"role": "user", "kind": "message", "message_id": "m", "parts": [{"kind": "text", "text": text}]}
+
+
+def agent_message(text: str) -> dict:
+    return {"role": "agent", "kind": "message", "message_id": "r", "parts": [{"kind": "text", "text": text}]}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "a2a_tasks.db")
+
+
+def test_store_round_trip(db_path):
+    async def run():
+        store = A2ATaskStore(db_path)
+        task = await store.submit_task("ctx", user_message("hello"))
+        assert task["status"]["state"] == "submitted"
+        assert task["history"][0]["task_id"] == task["id"]
+
+        await store.update_task(task["id"], "working")
+        done = await store.update_task(task["id"], "completed", new_messages=[agent_message("hi")])
+        store.set_push_config(task["id"], {"url": "http://client/hook", "token": "t"})
+        await store.update_context("ctx", {"turns": 1})
+        store.close()
+
+        # everything is back after a restart
+        store = A2ATaskStore(db_path)
+        loaded = await store.load_task(task["id"])
+        assert loaded == done
+        assert loaded["history"][-1]["context_id"] == "ctx"
+        assert (await store.load_task(task["id"], history_length=1))["history"] == [done["history"][-1]]
+        assert store.get_push_config(task["id"]) == {"url": "http://client/hook", "token": "t"}
+        assert await store.load_context("ctx") == {"turns": 1}
+        assert await store.load_task("missing") is None
+        assert store.counts() == {"completed": 1}
+        # finished tasks past the retention are dropped
+        store.purge(retention=-1)
+        assert await store.load_task(task["id"]) is None
+        store.close()
+
+    asyncio.run(run())
+
+
+def test_wait_finished(db_path):
+    async def run():
+        store = A2ATaskStore(db_path)
+        task = await store.submit_task("ctx", user_message("hello"))
+        assert await store.wait_finished(task["id"], timeout=0.05) is None
+
+        waiter = asyncio.create_task(store.wait_finished(task["id"], timeout=5))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await store.update_task(task["id"], "completed", new_messages=[agent_message("hi")])
+        finished = await waiter
+        assert finished["status"]["state"] == "completed"
+        assert time.perf_counter() - start < 1
+        # already finished, answered at once
+        assert (await store.wait_finished(task["id"], timeout=0))["status"]["state"] == "completed"
+        with pytest.raises(KeyError):
+            await store.wait_finished("missing", timeout=0)
+        store.close()
+
+    asyncio.run(run())
+
+
+def test_recover_unfinished_tasks(db_path):
+    async def run():
+        store = A2ATaskStore(db_path)
+        queued = await store.submit_task("ctx", user_message("queued before the restart"))
+        running = await store.submit_task("ctx", user_message("running at the restart"))
+        await store.update_task(running["id"], "working")
+        finished = await store.submit_task("ctx", user_message("done"))
+        await store.update_task(finished["id"], "completed")
+        assert [task["id"] for task in store.unfinished_tasks()] == [queued["id"], running["id"]]
+
+        worker = AgentZeroWorker(broker=InMemoryBroker(), storage=store)
+        worker._queue = asyncio.Queue()
+        await worker.recover()
+
+        # submitted tasks are queued again, interrupted ones fail
+        params = worker._queue.get_nowait()
+        assert params["id"] == queued["id"]
+        assert params["message"]["parts"][0]["text"] == "queued before the restart"
+        assert worker._queue.empty()
+        failed = await store.load_task(running["id"])
+        assert failed["status"]["state"] == "failed"
+        assert "restart" in failed["history"][-1]["parts"][0]["text"]
+        assert worker.stats["failed"] == 1
+        store.close()
+
+    asyncio.run(run())
+
+
+def test_admission_rejects_when_queue_is_full(db_path):
+    async def run():
+        store = A2ATaskStore(db_path)
+        broker = InMemoryBroker()
+        worker = AgentZeroWorker(broker=broker, storage=store, queue_limit=1)
+        worker._queue = asyncio.Queue()
+        manager = AgentZeroTaskManager(broker=broker, storage=store)
+        manager.worker = worker
+
+        def request(text: str) -> dict:
+            return {"jsonrpc": "2.0", "id": "1", "method": "message/send", "params": {"message": user_message(text)}}
+
+        async with broker:
+            received = []
+
+            async def receive():
+                async for operation in broker.receive_task_operations():
+                    received.append(operation)
+                    return
+
+            receiver = asyncio.create_task(receive())
+            admitted = (await manager.send_message(request("first")))["result"]
+            await receiver
+            assert admitted["status"]["state"] == "submitted"
+            assert received[0]["params"]["id"] == admitted["id"]
+
+            worker._queue.put_nowait(received[0]["params"])  # waiting for a worker
+            rejected = (await manager.send_message(request("second")))["result"]
+            assert rejected["status"]["state"] == "rejected"
+            assert (await store.load_task(rejected["id"]))["status"]["state"] == "rejected"
+            assert worker.stats["rejected"] == 1
+        store.close()
+
+    asyncio.run(run())
@@ -0,0 +1,105 @@
+import sys, os, io, asyncio, hashlib, threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from flask import Flask, request
+
+from python.api.download_work_dir_file import parse_range
+from python.api.upload_work_dir_chunk import UploadWorkDirChunk
+from python.helpers import runtime
+from python.helpers.file_browser import FileBrowser
+
+DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def upload(browser: FileBrowser, folder: str, start: int, chunk: bytes, upload_id="a", **kwargs):
+    return browser.save_file_chunk(
+        folder, "data.bin", start, len(DATA), io.BytesIO(chunk), upload_id=upload_id, **kwargs
+    )
+
+
+@pytest.fixture
+def browser():
+    return FileBrowser()  # base dir "/", the tests upload into tmp_path
+
+
+def test_parse_range():
+    assert parse_range("", 100) is None
+    assert parse_range("bytes=0-", 100) == (0, 99)
+    assert parse_range("bytes=10-19", 100) == (10, 19)
+    assert parse_range("bytes=90-200", 100) == (90, 99)
+    assert parse_range("bytes=-30", 100) == (70, 99)
+    assert parse_range("bytes=-300", 100) == (0, 99)
+    assert parse_range("bytes=0-9,20-29", 100) is None  # multiple ranges, whole file
+    assert parse_range("items=0-9", 100) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=100-", 100)
+    with pytest.raises(ValueError):
+        parse_range("bytes=20-10", 100)
+
+
+def test_chunk_resume(browser, tmp_path):
+    folder = str(tmp_path)
+    assert browser.get_upload_status(folder, "data.bin", len(DATA), "a")["received"] == 0
+    assert upload(browser, folder, 0, DATA[:4000]) == {"received": 4000, "complete": False}
+
+    # interrupted, the same upload resumes where it stopped
+    assert browser.get_upload_status(folder, "data.bin", len(DATA), "a")["received"] == 4000
+    # a retried chunk overwrites its earlier attempt
+    assert upload(browser, folder, 2000, DATA[2000:6000])["received"] == 6000
+    result = upload(browser, folder, 6000, DATA[6000:], file_sha256=sha256(DATA))
+    assert result == {"received": len(DATA), "complete": True, "filename": "data.bin"}
+
+    assert (tmp_path / "data.bin").read_bytes() == DATA
+    assert sorted(os.listdir(tmp_path)) == ["data.bin"]
+
+
+def test_other_upload_does_not_resume(browser, tmp_path):
+    folder = str(tmp_path)
+    upload(browser, folder, 0, DATA[:4000], upload_id="a")
+
+    # another file with the same name and size starts over
+    assert browser.get_upload_status(folder, "data.bin", len(DATA), "b")["received"] == 0
+    upload(browser, folder, 0, DATA[:4000], upload_id="a")
+    result = upload(browser, folder, 4000, DATA[4000:8000], upload_id="b")
+    assert result["received"] == 0 and "error" in result
+
+
+def test_checksum_mismatch(browser, tmp_path):
+    folder = str(tmp_path)
+    upload(browser, folder, 0, DATA[:4000])
+
+    with pytest.raises(ValueError, match="Chunk checksum"):
+        upload(browser, folder, 4000, DATA[4000:8000], chunk_sha256=sha256(b"other"))
+    # the bad chunk is cut off, the upload goes on from before it
+    assert browser.get_upload_status(folder, "data.bin", len(DATA), "a")["received"] == 4000
+
+    with pytest.raises(ValueError, match="File checksum"):
+        upload(browser, folder, 4000, DATA[4000:], file_sha256=sha256(b"other"))
+    assert os.listdir(tmp_path) == []
+
+
+def test_out_of_order_chunk_409(tmp_path, monkeypatch):
+    monkeypatch.setattr(runtime, "is_development", lambda: False)
+    app = Flask("test")
+    handler = UploadWorkDirChunk(app, threading.Lock())
+    url = f"/upload_work_dir_chunk?path={tmp_path}&filename=data.bin&upload_id=a"
+
+    def post(start: int, chunk: bytes):
+        headers = {"Content-Range": f"bytes {start}-{start + len(chunk) - 1}/{len(DATA)}"}
+        with app.test_request_context(
+            url, method="POST", data=chunk, headers=headers, content_type="application/octet-stream"
+        ):
+            return asyncio.run(handler.process({}, request))
+
+    assert post(0, DATA[:4000])["received"] == 4000
+    response = post(8000, DATA[8000:])
+    assert response.status_code == 409
+    assert response.get_json()["received"] == 4000
+    assert post(4000, DATA[4000:])["complete"]
+    assert (tmp_path / "data.bin").read_bytes() == DATA
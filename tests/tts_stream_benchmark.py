@@ -0,0 +1,31 @@
+import sys, os, time, asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import kokoro_tts
+
+# time-to-first-audio of the blocking /synthesize path vs the streamed /synthesize_stream path
+
+TEXT = " ".join(
+    f"This is sentence number {i} of a longer agent response that is read aloud." for i in range(12)
+)
+
+
+async def run():
+    await kokoro_tts.preload()
+    sentences = kokoro_tts.split_sentences(TEXT)
+
+    start = time.perf_counter()
+    await kokoro_tts.synthesize_sentences([TEXT])
+    print(f"blocking:  first audio after {time.perf_counter() - start:.2f}s (whole text)")
+
+    start = time.perf_counter()
+    first = None
+    for index, _audio in kokoro_tts.stream_sentences(sentences):
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    print(f"streaming: first audio after {first:.2f}s, all {len(sentences)} sentences after {total:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
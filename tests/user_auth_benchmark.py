@@ -0,0 +1,63 @@
+import sys, os, time, asyncio, sqlite3, tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from python.helpers import user_management
+
+# users DB under concurrent load: per-request role lookups with a new connection per call
+# (as before) vs the connection pool, and a login burst through the scrypt KDF, cold and cached
+
+USERS = 20
+THREADS = 16
+LOOKUPS = 500  # per thread
+LOGINS = 200
+
+
+def lookup_new_connection(username: str):
+    conn = sqlite3.connect(user_management.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        row = conn.execute("SELECT role FROM users WHERE username=?", (username,)).fetchone()
+        return row["role"] if row else None
+    finally:
+        conn.close()
+
+
+def lookups(label: str, fn):
+    def worker(i: int):
+        for j in range(LOOKUPS):
+            fn(f"user{(i + j) % USERS}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(worker, range(THREADS)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:16} {THREADS * LOOKUPS / elapsed:10.0f} lookups/s")
+
+
+async def logins(label: str):
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        user_management.authenticate_user_async(f"user{i % USERS}", f"password{i % USERS}")
+        for i in range(LOGINS)
+    ))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    print(f"{label:16} {LOGINS / elapsed:10.1f} logins/s")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        user_management.DB_PATH = os.path.join(folder, "users.db")
+        user_management.initialize_database()
+        for i in range(USERS):
+            user_management.create_user(f"user{i}", f"password{i}", user_management.ROLE_USER, "benchmark")
+
+        lookups("new connection", lookup_new_connection)
+        lookups("pooled", user_management.get_user_role)
+
+        user_management.VERIFIED_TTL = 0  # every login pays the KDF
+        asyncio.run(logins("login, KDF"))
+        user_management.VERIFIED_TTL = 60
+        asyncio.run(logins("login, warm"))  # fills the verified cache
+        asyncio.run(logins("login, cached"))
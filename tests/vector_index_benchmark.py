@@ -0,0 +1,50 @@
+import sys, os, time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+from python.helpers import vector_index
+
+# recall@k vs latency of the memory index types on synthetic clustered embeddings
+
+DIMENSIONS = 384  # same as the default sentence-transformers model
+VECTORS = 100_000
+QUERIES = 200
+K = 10
+
+
+def synthetic(count: int, dimensions: int, clusters: int = 256, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimensions)).astype(np.float32)
+    data = centers[rng.integers(0, clusters, count)]
+    data += 0.3 * rng.normal(size=data.shape).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data
+
+
+def run(index_type: str, data: np.ndarray, queries: np.ndarray, truth: np.ndarray):
+    config = vector_index.default_config()
+    config["type"] = index_type
+
+    start = time.perf_counter()
+    index = vector_index.build_index(config, data)
+    build = time.perf_counter() - start
+
+    params = vector_index.search_params(index, config)
+    start = time.perf_counter()
+    _, found = index.search(queries, K, params=params)
+    latency = (time.perf_counter() - start) / len(queries) * 1000
+
+    recall = np.mean([len(set(f) & set(t)) / K for f, t in zip(found, truth)])
+    print(f"{index_type:10} build {build:7.2f}s  recall@{K} {recall:.3f}  {latency:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    # queries are held-out points of the same distribution as the data
+    data = synthetic(VECTORS + QUERIES, DIMENSIONS)
+    data, queries = data[:VECTORS], data[VECTORS:]
+
+    exact = vector_index.build_index(vector_index.default_config(), data)
+    _, truth = exact.search(queries, K)
+
+    for index_type in vector_index.INDEX_TYPES:
+        run(index_type, data, queries, truth)
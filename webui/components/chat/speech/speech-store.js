@@ -27,6 +27,7 @@ const model = {
 
   // TTS State
   isSpeaking: false,
+  kokoroPlayback: null,
   speakingId: "",
   speakingText: "",
   currentAudio: null,
@@ -386,33 +387,42 @@ const model = {
     this.synth.speak(this.browserUtterance);
   },
 
-  // Kokoro TTS
+  // Kokoro TTS, audio is streamed per sentence so playback starts with the first one
   async speakWithKokoro(text, waitForPrevious = false, terminator = null) {
     try {
-      // synthesize on the backend
-      const response = await sendJsonData("/synthesize", { text });
-
-      // wait for previous to finish if requested
-      while (waitForPrevious && this.isSpeaking) await sleep(25);
-      if (terminator && terminator()) return;
-
-      // stop previous if any
-      this.stopAudio();
-
-      if (response.success) {
-        if (response.audio_parts) {
-          // Multiple chunks - play sequentially
-          for (const audioPart of response.audio_parts) {
-            if (terminator && terminator()) return;
-            await this.playAudio(audioPart);
-            await sleep(100); // Brief pause
-          }
-        } else if (response.audio) {
-          // Single audio
-          this.playAudio(response.audio);
+      const response = await fetchApi("/synthesize_stream", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        credentials: "same-origin",
+        body: JSON.stringify({ text }),
+      });
+      if (!response || !response.ok)
+        throw new Error(response ? await response.text() : "No response");
+
+      let playback = null;
+      for await (const part of readJsonLines(response)) {
+        if (part.success === false) throw new Error(part.error);
+        if (!part.audio) continue;
+        if (terminator && terminator()) return;
+
+        if (!playback) {
+          // wait for previous to finish if requested
+          while (waitForPrevious && this.isSpeaking) await sleep(25);
+          if (waitForPrevious && this.kokoroPlayback) await this.kokoroPlayback;
+          if (terminator && terminator()) return;
+
+          // stop previous if any
+          this.stopAudio();
+          playback = this.playAudio(part.audio);
+        } else {
+          // queue following sentences behind the ones already playing
+          const audio = part.audio;
+          playback = playback.then(() =>
+            terminator && terminator() ? undefined : this.playAudio(audio)
+          );
         }
-      } else {
-        throw new Error("Kokoro TTS error:", response.error);
+        playback = playback.catch((error) => console.error(error));
+        this.kokoroPlayback = playback;
       }
     } catch (error) {
       throw new Error("Kokoro TTS error:", error);
@@ -943,6 +953,25 @@ class MicrophoneInput {
   }
 }
 
+// Parse a newline delimited JSON response as it arrives
+async function* readJsonLines(response) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let newline;
+    while ((newline = buffer.indexOf("\n")) >= 0) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      if (line) yield JSON.parse(line);
+    }
+  }
+  if (buffer.trim()) yield JSON.parse(buffer);
+}
+
 export const store = createStore("speech", model);
 
 // Initialize speech store
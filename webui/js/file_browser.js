@@ -9,8 +9,13 @@ const fileBrowserModalProxy = {
     parentPath: "",
     sortBy: "name",
     sortDirection: "asc",
+    filter: "",
+    total: 0,
+    nextCursor: "",
   },
 
+  pageSize: 500,
+
   // Initialize navigation history
   history: [],
 
@@ -36,18 +41,29 @@ const fileBrowserModalProxy = {
     return archiveExts.includes(ext);
   },
 
-  async fetchFiles(path = "") {
-    this.isLoading = true;
+  async fetchFiles(path = "", cursor = "") {
+    if (!cursor) this.isLoading = true;
     try {
-      const response = await fetchApi(
-        `/get_work_dir_files?path=${encodeURIComponent(path)}`
-      );
+      // sorting, filtering and paging happen on the server
+      const params = new URLSearchParams({
+        path,
+        cursor,
+        limit: this.pageSize,
+        sort_by: this.browser.sortBy,
+        sort_dir: this.browser.sortDirection,
+        filter: this.browser.filter,
+      });
+      const response = await fetchApi(`/get_work_dir_files?${params}`);
 
       if (response.ok) {
         const data = await response.json();
-        this.browser.entries = data.data.entries;
+        this.browser.entries = cursor
+          ? [...this.browser.entries, ...data.data.entries]
+          : data.data.entries;
         this.browser.currentPath = data.data.current_path;
         this.browser.parentPath = data.data.parent_path;
+        this.browser.total = data.data.total;
+        this.browser.nextCursor = data.data.next_cursor;
       } else {
         console.error("Error fetching files:", await response.text());
         this.browser.entries = [];
@@ -60,11 +76,22 @@ const fileBrowserModalProxy = {
     }
   },
 
+  async loadMore() {
+    if (this.browser.nextCursor) {
+      await this.fetchFiles(this.browser.currentPath, this.browser.nextCursor);
+    }
+  },
+
+  async applyFilter() {
+    await this.fetchFiles(this.browser.currentPath);
+  },
+
   async navigateToFolder(path) {
     // Push current path to history before navigating
     if (this.browser.currentPath !== path) {
       this.history.push(this.browser.currentPath);
     }
+    this.browser.filter = "";
     await this.fetchFiles(path);
   },
 
@@ -72,32 +99,12 @@ const fileBrowserModalProxy = {
     if (this.browser.parentPath !== "") {
       // Push current path to history before navigating up
       this.history.push(this.browser.currentPath);
+      this.browser.filter = "";
       await this.fetchFiles(this.browser.parentPath);
     }
   },
 
-  sortFiles(entries) {
-    return [...entries].sort((a, b) => {
-      // Folders always come first
-      if (a.is_dir !== b.is_dir) {
-        return a.is_dir ? -1 : 1;
-      }
-
-      const direction = this.browser.sortDirection === "asc" ? 1 : -1;
-      switch (this.browser.sortBy) {
-        case "name":
-          return direction * a.name.localeCompare(b.name);
-        case "size":
-          return direction * (a.size - b.size);
-        case "date":
-          return direction * (new Date(a.modified) - new Date(b.modified));
-        default:
-          return 0;
-      }
-    });
-  },
-
-  toggleSort(column) {
+  async toggleSort(column) {
     if (this.browser.sortBy === column) {
       this.browser.sortDirection =
         this.browser.sortDirection === "asc" ? "desc" : "asc";
@@ -105,6 +112,7 @@ const fileBrowserModalProxy = {
       this.browser.sortBy = column;
       this.browser.sortDirection = "asc";
     }
+    await this.fetchFiles(this.browser.currentPath);
   },
 
   async deleteFile(file) {
@@ -118,17 +126,14 @@ const fileBrowserModalProxy = {
         headers: {
           "Content-Type": "application/json",
         },
-        body: JSON.stringify({
-          path: file.path,
-          currentPath: this.browser.currentPath,
-        }),
+        body: JSON.stringify({ path: file.path }),
       });
 
       if (response.ok) {
-        const data = await response.json();
         this.browser.entries = this.browser.entries.filter(
           (entry) => entry.path !== file.path
         );
+        this.browser.total = Math.max(0, this.browser.total - 1);
         alert("File deleted successfully.");
       } else {
         alert(`Error deleting file: ${await response.text()}`);
@@ -147,18 +152,41 @@ const fileBrowserModalProxy = {
       const formData = new FormData();
       formData.append("path", this.browser.currentPath);
 
+      // large files go in resumable chunks, small ones in a single form post
+      const chunked = [];
+      let small = 0;
       for (let i = 0; i < files.length; i++) {
         const ext = files[i].name.split(".").pop().toLowerCase();
         if (!["zip", "tar", "gz", "rar", "7z"].includes(ext)) {
-          if (files[i].size > 100 * 1024 * 1024) {
-            // 100MB
+          if (files[i].size > this.maxFileSize) {
+            // only archives may exceed 100MB
             alert(
               `File ${files[i].name} exceeds the maximum allowed size of 100MB.`
             );
             continue;
           }
         }
-        formData.append("files[]", files[i]);
+        if (files[i].size > this.uploadChunkSize) {
+          chunked.push(files[i]);
+        } else {
+          formData.append("files[]", files[i]);
+          small++;
+        }
+      }
+
+      const failed = [];
+      for (const file of chunked) {
+        try {
+          await this.uploadFileChunked(file);
+        } catch (error) {
+          failed.push({ name: file.name, error: error.message });
+        }
+      }
+
+      if (!small) {
+        await this.fetchFiles(this.browser.currentPath);
+        this.reportFailedUploads(failed);
+        return;
       }
 
       // Proceed with upload after validation
@@ -167,32 +195,80 @@ const fileBrowserModalProxy = {
         body: formData,
       });
 
-      if (response.ok) {
-        const data = await response.json();
-        // Update the file list with new data
-        this.browser.entries = data.data.entries.map((entry) => ({
-          ...entry,
-          uploadStatus: data.failed.includes(entry.name) ? "failed" : "success",
-        }));
-        this.browser.currentPath = data.data.current_path;
-        this.browser.parentPath = data.data.parent_path;
-
-        // Show success message
-        if (data.failed && data.failed.length > 0) {
-          const failedFiles = data.failed
-            .map((file) => `${file.name}: ${file.error}`)
-            .join("\n");
-          alert(`Some files failed to upload:\n${failedFiles}`);
-        }
-      } else {
-        alert(data.message);
+      if (!response.ok) {
+        alert(await response.text());
+        this.reportFailedUploads(failed);
+        return;
       }
+
+      // reload the listing page with the current sort and filter
+      const data = await response.json();
+      await this.fetchFiles(this.browser.currentPath);
+
+      failed.push(...(data.failed || []).map((name) => ({ name, error: "upload failed" })));
+      this.reportFailedUploads(failed);
     } catch (error) {
       window.toastFrontendError("Error uploading files: " + error.message, "File Upload Error");
       alert("Error uploading files");
     }
   },
 
+  uploadChunkSize: 8 * 1024 * 1024,
+  maxFileSize: 100 * 1024 * 1024, // 100MB, archives are exempt
+
+  reportFailedUploads(failed) {
+    if (failed.length > 0) {
+      const failedFiles = failed
+        .map((file) => `${file.name}: ${file.error}`)
+        .join("\n");
+      alert(`Some files failed to upload:\n${failedFiles}`);
+    }
+  },
+
+  async uploadFileChunked(file) {
+    const params = new URLSearchParams({
+      path: this.browser.currentPath,
+      filename: file.name,
+      // the server resumes a part file only for the same upload id
+      upload_id: `${file.size}-${file.lastModified}`,
+    });
+    const url = `/upload_work_dir_chunk?${params}`;
+
+    // resume where an interrupted upload of this file stopped
+    const statusResponse = await fetchApi(`${url}&size=${file.size}`);
+    if (!statusResponse.ok) throw new Error(await statusResponse.text());
+    let offset = (await statusResponse.json()).received;
+
+    let retries = 0;
+    while (offset < file.size) {
+      const chunk = file.slice(offset, Math.min(offset + this.uploadChunkSize, file.size));
+      const headers = {
+        "Content-Type": "application/octet-stream",
+        "Content-Range": `bytes ${offset}-${offset + chunk.size - 1}/${file.size}`,
+      };
+      if (window.crypto?.subtle) {
+        // not available on plain http pages other than localhost
+        const digest = await crypto.subtle.digest("SHA-256", await chunk.arrayBuffer());
+        headers["X-Chunk-Sha256"] = Array.from(new Uint8Array(digest))
+          .map((b) => b.toString(16).padStart(2, "0"))
+          .join("");
+      }
+
+      let response;
+      try {
+        response = await fetchApi(url, { method: "POST", headers, body: chunk });
+      } catch (error) {
+        response = null; // network error, retry the chunk
+      }
+      if (response && (response.ok || response.status === 409)) {
+        offset = (await response.json()).received; // 409: server expects another offset
+        retries = 0;
+      } else if (++retries > 3) {
+        throw new Error(response ? await response.text() : "network error");
+      }
+    }
+  },
+
   downloadFile(file) {
     const link = document.createElement("a");
     link.href = `/download_work_dir_file?path=${encodeURIComponent(file.path)}`;